@@ -0,0 +1,199 @@
+# action_log.py - буфер записи действий пользователей (write-behind в user_action_logs / user_actions)
+
+import collections
+import json
+import logging
+import threading
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from config import ACTION_LOG_MAX_QUEUE, ACTION_LOG_BATCH_SIZE, ACTION_LOG_FLUSH_MS, ACTION_LOG_OVERFLOW
+from database import db
+
+# Таблица -> колонки вставки (created_at - время действия, а не записи в базу)
+ACTION_LOG_TABLES = {
+    "user_action_logs": ("user_id", "action", "action_data", "created_at"),
+    "user_actions": ("user_id", "action_type", "action_data", "created_at"),
+}
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEW = "drop_new"
+
+
+class ActionLogBuffer:
+    """Буфер действий пользователей в памяти процесса.
+
+    Обработчики только кладут запись в очередь (без обращения к базе).
+    Фоновый поток раз в flush_interval секунд или при накоплении batch_size
+    записей вставляет их одним execute_values на таблицу. Очередь ограничена
+    max_size записями; при переполнении отбрасывается самая старая запись
+    (drop_oldest) или новая (drop_new). Если пачку отвергла сама база из-за
+    данных, пачка делится пополам до плохих строк и отбрасываются только они.
+    При сбое соединения пачка повторяется max_attempts раз, затем отбрасывается.
+    """
+
+    def __init__(self, db, max_size=10000, batch_size=500, flush_interval=1.0,
+                 overflow=DROP_OLDEST, max_attempts=3):
+        self.db = db
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.max_attempts = max_attempts
+
+        self._queue = collections.deque()  # (table, row, attempts)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'queued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'flushes': 0}
+
+    def log(self, user_id: int, action: str, action_data=None) -> bool:
+        """Действие для user_action_logs (выбор подписки, оплата и т.п.)"""
+        return self._put("user_action_logs", (user_id, action, self._dump(action_data), datetime.now()))
+
+    def log_user_action(self, user_id: int, action_type: str, action_data=None) -> bool:
+        """Действие для user_actions (JSONB action_data)"""
+        return self._put("user_actions", (user_id, action_type, self._dump(action_data), datetime.now()))
+
+    @staticmethod
+    def _dump(action_data):
+        if action_data is None or isinstance(action_data, str):
+            return action_data
+        return json.dumps(action_data, ensure_ascii=False, default=str)
+
+    def _put(self, table: str, row: tuple) -> bool:
+        """Кладет запись в очередь; False, если она отброшена из-за переполнения"""
+        with self._lock:
+            if len(self._queue) >= self.max_size:
+                self._stats['dropped'] += 1
+                if self._stats['dropped'] % 1000 == 1:
+                    logging.warning(f"⚠️ Action log queue is full ({self.overflow}), "
+                                    f"{self._stats['dropped']} entries dropped so far")
+                if self.overflow == DROP_NEW:
+                    return False
+                self._queue.popleft()
+            self._queue.append((table, row, 0))
+            self._stats['queued'] += 1
+            if len(self._queue) >= self.batch_size:
+                self._wakeup.set()
+        return True
+
+    def _take_batch(self):
+        with self._lock:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _requeue(self, entries):
+        """Возвращает неудачную пачку в начало очереди (пока есть место и попытки)"""
+        with self._lock:
+            for table, row, attempts in reversed(entries):
+                if attempts + 1 >= self.max_attempts or len(self._queue) >= self.max_size:
+                    self._stats['failed'] += 1
+                    continue
+                self._queue.appendleft((table, row, attempts + 1))
+
+    def _write(self, entries):
+        rows_by_table = collections.defaultdict(list)
+        for table, row, _ in entries:
+            rows_by_table[table].append(row)
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            for table, rows in rows_by_table.items():
+                columns = ", ".join(ACTION_LOG_TABLES[table])
+                execute_values(cursor, f"INSERT INTO {table} ({columns}) VALUES %s", rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _write_entries(self, entries):
+        """Записывает пачку; возвращает записи, не записанные из-за сбоя базы"""
+        try:
+            self._write(entries)
+            self._stats['written'] += len(entries)
+            return []
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            if len(entries) == 1:
+                table, row, _ = entries[0]
+                logging.error(f"❌ Dropping invalid {table} entry for user {row[0]}: {e}")
+                self._stats['failed'] += 1
+                return []
+            middle = len(entries) // 2
+            unwritten = self._write_entries(entries[:middle])
+            if unwritten:
+                return unwritten + entries[middle:]
+            return self._write_entries(entries[middle:])
+        except Exception as e:
+            logging.error(f"❌ Error writing {len(entries)} action log entries: {e}")
+            return entries
+
+    def flush(self) -> int:
+        """Записывает все накопленные действия; возвращает количество записанных"""
+        with self._flush_lock:
+            written_before = self._stats['written']
+            while True:
+                entries = self._take_batch()
+                if not entries:
+                    break
+                unwritten = self._write_entries(entries)
+                self._stats['flushes'] += 1
+                if unwritten:
+                    self._requeue(unwritten)
+                    break
+            return self._stats['written'] - written_before
+
+    def _run(self):
+        logging.info("✅ Action log writer started")
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"❌ Error in action log writer: {e}")
+        logging.info("🛑 Action log writer stopped")
+
+    def start(self):
+        """Запускает фоновую запись"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="action-log", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = 10):
+        """Останавливает фоновую запись и записывает остаток очереди"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+        written = self.flush()
+        if written:
+            logging.info(f"✅ Flushed {written} action log entries on shutdown")
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._queue)
+        stats['writer_alive'] = bool(self._thread and self._thread.is_alive())
+        return stats
+
+
+# Глобальный экземпляр
+action_log = ActionLogBuffer(
+    db,
+    max_size=ACTION_LOG_MAX_QUEUE,
+    batch_size=ACTION_LOG_BATCH_SIZE,
+    flush_interval=ACTION_LOG_FLUSH_MS / 1000,
+    overflow=ACTION_LOG_OVERFLOW
+)
@@ -2,21 +2,37 @@ import logging
 import os
 import time
 import json
-import requests
+import hashlib
 import threading
-from flask import Flask, request, jsonify, redirect, Response, stream_with_context
+from flask import Flask, request, jsonify, redirect, Response, stream_with_context, g, render_template, url_for
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
 
-from config import BOT_TOKEN, PAYPAL_WEBHOOK_ID, SUBSCRIPTION_DURATIONS
+from config import (
+    BOT_TOKEN, PAYPAL_WEBHOOK_ID, PAYPAL_WEBHOOK_VERIFICATION, SUBSCRIPTION_DURATIONS,
+    REMINDER_HOURS, REMINDER_BATCH_SIZE, REMINDER_RATE_LIMIT,
+    BASE_URL, BOT_MODE, PORT, TELEGRAM_WEBHOOK_PATH, TELEGRAM_WEBHOOK_SECRET,
+    WEB_THREADS, WEB_CONNECTION_LIMIT, WEB_CHANNEL_TIMEOUT, WEB_KEEPALIVE_TIMEOUT,
+    PAYMENT_RECONCILE_INTERVAL, CARD_MEDIA_WARMUP, ADMIN_IDS, ADMIN_STATS_REFRESH_INTERVAL,
+    HISTORY_PARTITIONS_AHEAD, HISTORY_RETENTION_MONTHS, HISTORY_RETENTION_ACTION
+)
 import handlers
-from database import db
+from database import db, async_db
 from yookassa_payment import payment_processor  
+from scheduler import BackgroundScheduler
+from broadcast import Broadcaster, SENT, BLOCKED
+from payment_events import payment_queue
+from action_log import action_log
+from hot_queries import (USER_BY_PAYMENT_ID_SQL, USER_BY_EMAIL_SQL, PAYMENT_USER_BY_EMAIL_SQL,
+                         USER_BY_PHONE_SQL, RECENT_SUBSCRIPTION_USERS_SQL)
+from http_client import http_client, async_http_client, get_stats as get_http_stats
+from paypal_webhook import paypal_verifier
+from card_media import card_media
 import logging
 
 import multiprocessing
 import signal
 import sys
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time as dtime
 from telegram import Update
 
 
@@ -64,6 +80,7 @@ class GracefulShutdown:
 
 # Глобальный экземпляр
 shutdown_manager = GracefulShutdown()
+scheduler = BackgroundScheduler(shutdown_manager.shutdown_event)
 # Настройка логирования
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -73,6 +90,35 @@ logger = logging.getLogger(__name__)
 
 # Создаем Flask приложение
 app = Flask(__name__)
+# Статика (CSS/JS плеера) адресуется с хэшем содержимого, поэтому кэшируется надолго
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 365 * 24 * 3600
+
+_static_versions = {}
+
+@app.template_global()
+def static_url(filename):
+    """URL статического файла с версией по хэшу содержимого (сброс кэша при изменении)"""
+    version = _static_versions.get(filename)
+    if version is None:
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            version = hashlib.sha256(f.read()).hexdigest()[:12]
+        _static_versions[filename] = version
+    return url_for('static', filename=filename, v=version)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def log_request_timing(response):
+    """Access-лог с временем обработки запроса"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        duration_ms = (time.perf_counter() - started) * 1000
+        # Шаблон маршрута вместо пути, чтобы хэши видео ссылок не попадали в логи
+        route = request.url_rule.rule if request.url_rule else request.path
+        logger.info(f"🌐 {request.method} {route} {response.status_code} {duration_ms:.1f}ms")
+    return response
 
 @app.route('/')
 def home():
@@ -97,8 +143,13 @@ def payment_callback():
         # Проверяем тип события
         event_type = event_json.get('type')
         if event_type == 'notification':
-            # Обрабатываем уведомление о платеже
-            return handle_payment_notification(event_json)
+            # Ставим уведомление в очередь, обработка - в payment_queue (dispatch_payment_event)
+            payment_object = event_json.get('object', {})
+            idempotency_key = f"yookassa:{payment_object.get('id')}:{payment_object.get('status') or event_json.get('event')}"
+            if not payment_object.get('id'):
+                idempotency_key = f"yookassa:{hashlib.sha256(request.get_data()).hexdigest()}"
+            payment_queue.enqueue('yookassa', event_json.get('event'), idempotency_key, event_json)
+            return jsonify({"status": "success"}), 200
         elif event_type == 'payment.waiting_for_capture':
             # Платеж ожидает подтверждения
             logger.info("⏳ Payment waiting for capture")
@@ -120,343 +171,43 @@ def secure_video_player(link_hash):
         
         if not link_data:
             logging.error(f"❌ Link not found: {link_hash}")
-            return """
-            <html>
-                <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                    <h2>❌ Ссылка недействительна</h2>
-                    <p>Вернитесь в бота для получения новой ссылки.</p>
-                    <a href="https://t.me/MetaphorCardsSeaBot">Вернуться в бота</a>
-                </body>
-            </html>
-            """, 404
+            return render_template(
+                'video_link_error.html',
+                title="Ссылка недействительна",
+                message="Вернитесь в бота для получения новой ссылки."
+            ), 404
         
         user_id = link_data['user_id']
         platform = link_data['platform']
         has_subscription = link_data['has_subscription']
         
         # Для бесплатных пользователей активируем доступ при первом открытии
+        # (повторные загрузки страницы не идут в базу)
         if not has_subscription:
             try:
-                # Создаем video_system напрямую
-                from secure_video import SecureVideoSystem
-                from config import BASE_URL
-                video_system = SecureVideoSystem(BASE_URL, db)
-                if video_system:
-                    video_system.activate_meditation_access(user_id)
+                db.record_video_link_watch(link_hash, user_id)
             except Exception as e:
                 logging.error(f"❌ Error activating meditation access: {e}")
         
         # Проверяем срок действия
         if link_data['expires_at'] and datetime.now() > link_data['expires_at']:
             logging.info(f"❌ Link expired: {link_hash}")
-            db.cleanup_expired_video_links()
-            return """
-            <html>
-                <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-                    <h2>❌ Срок действия ссылки истёк</h2>
-                    <p>Получите новую ссылку в боте.</p>
-                    <a href="https://t.me/MetaphorCardsSeaBot">Вернуться в бота</a>
-                </body>
-            </html>
-            """, 403
-        
-        video_url = link_data['video_url']
+            return render_template(
+                'video_link_error.html',
+                title="Срок действия ссылки истёк",
+                message="Получите новую ссылку в боте."
+            ), 403
         
         # Для YouTube используем оригинальный подход со сдвигом
         # Для RUTUBE используем обычное отображение с усиленным скрытием элементов
-        is_youtube = platform == "youtube"
-        
-        if is_youtube:
-            iframe_style = "position: absolute; top: -60px; left: 0; width: 100%; height: calc(100% + 120px); border: none;"
-        else:
-            iframe_style = "position: absolute; top: 0; left: 0; width: 100%; height: 100%; border: none;"
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="ru">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Медитация «Дары Моря»</title>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    justify-content: center;
-                }}
-                .container {{
-                    background: white;
-                    border-radius: 15px;
-                    padding: 30px;
-                    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-                    max-width: 800px;
-                    width: 90%;
-                    text-align: center;
-                }}
-                h1 {{
-                    color: #333;
-                    margin-bottom: 20px;
-                }}
-                .video-wrapper {{
-                    position: relative;
-                    width: 100%;
-                    margin: 20px 0;
-                    overflow: hidden;
-                    border-radius: 10px;
-                    background: #000;
-                }}
-                .video-container {{
-                    position: relative;
-                    width: 100%;
-                    height: 0;
-                    padding-bottom: 56.25%;
-                    background: #000;
-                    overflow: hidden;
-                }}
-                .video-mask {{
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    width: 100%;
-                    height: 100%;
-                    pointer-events: none;
-                    z-index: 100;
-                    background: linear-gradient(to bottom, rgba(0,0,0,0.9) 0%, transparent 80px, transparent calc(100% - 80px), rgba(0,0,0,0.9) 100%);
-                }}
-                .btn {{
-                    background: #667eea;
-                    color: white;
-                    padding: 12px 30px;
-                    text-decoration: none;
-                    border-radius: 25px;
-                    font-weight: bold;
-                    margin: 10px;
-                    display: inline-block;
-                }}
-                .platform-badge {{
-                    background: #667eea;
-                    color: white;
-                    padding: 5px 15px;
-                    border-radius: 20px;
-                    font-size: 14px;
-                    margin-bottom: 15px;
-                    display: inline-block;
-                }}
-                
-                /* Стили для скрытия элементов RUTUBE */
-                .rutube-overlay {{
-                    position: absolute;
-                    top: 0;
-                    left: 0;
-                    width: 100%;
-                    height: 100%;
-                    z-index: 50;
-                    pointer-events: none;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>🐚 Медитация «Дары Моря»</h1>
-                <div class="platform-badge">{platform.upper()}</div>
-                
-                <div class="video-wrapper">
-                    <div class="video-container">
-                        <iframe src="{video_url}" 
-                            style="{iframe_style}"
-                            frameborder="0" 
-                            allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture" 
-                            allowfullscreen
-                            id="video-player">
-                        </iframe>
-                        <div class="video-mask"></div>
-                        <div class="rutube-overlay"></div>
-                    </div>
-                </div>
-                <div style="margin-top: 20px;">
-                    <a href="https://t.me/MetaphorCardsSeaBot" class="btn">Вернуться в бота</a>
-                </div>
-            </div>
-            
-            <script>
-            // Скрываем элементы YouTube
-            function hideYouTubeElements() {{
-                const style = document.createElement('style');
-                style.textContent = `
-                    .ytp-chrome-top,
-                    .ytp-title-link,
-                    .ytp-title-channel,
-                    .ytp-share-button,
-                    .ytp-copylink-button,
-                    .ytp-show-cards-title,
-                    .ytp-pause-overlay,
-                    .ytp-youtube-button,     
-                    .ytp-button.ytp-youtube-button {{  
-                        display: none !important;
-                        opacity: 0 !important;
-                        visibility: hidden !important;
-                    }}
-                    .ytp-watermark {{
-                        display: none !important;
-                        opacity: 0 !important;
-                        visibility: hidden !important;
-                    }}
-                    
-                    .ytp-chrome-top {{
-                        height: 0 !important;
-                        min-height: 0 !important;
-                        padding: 0 !important;
-                    }}
-                `;
-                document.head.appendChild(style);
-            }}
-            
-            // Усиленное скрытие элементов RUTUBE
-            function hideRutubeElements() {{
-                // Добавляем стили для полного скрытия
-                const style = document.createElement('style');
-                style.textContent = `
-                    /* Скрываем ВСЕ возможные элементы RUTUBE */
-                    [class*="control"],
-                    [class*="panel"],
-                    [class*="button"],
-                    [class*="logo"],
-                    [class*="watermark"],
-                    [class*="header"],
-                    [class*="footer"],
-                    [class*="toolbar"],
-                    [class*="menu"],
-                    [id*="control"],
-                    [id*="panel"],
-                    [id*="button"],
-                    [id*="logo"],
-                    .video-controls,
-                    .player-controls,
-                    .controls-panel,
-                    .top-panel,
-                    .bottom-panel,
-                    .rutube-player__controls,
-                    .video-controls__panel,
-                    .logo,
-                    .rutube-logo,
-                    .player-logo,
-                    .watermark {{
-                        display: none !important;
-                        opacity: 0 !important;
-                        visibility: hidden !important;
-                        pointer-events: none !important;
-                    }}
-                    
-                    /* Скрываем overlay элементы */
-                    .video-page__control-panel,
-                    .video-controls,
-                    .video-page__header,
-                    .video-page__footer {{
-                        display: none !important;
-                    }}
-                    
-                    /* Делаем iframe на весь экран */
-                    body, html {{
-                        margin: 0 !important;
-                        padding: 0 !important;
-                        overflow: hidden !important;
-                    }}
-                    
-                    .video-container, .video-wrapper {{
-                        border: none !important;
-                        outline: none !important;
-                    }}
-                `;
-                document.head.appendChild(style);
-                
-                // Агрессивное скрытие через JavaScript
-                function aggressivelyHideRutube() {{
-                    // Скрываем все элементы с определенными классами/ID
-                    const selectors = [
-                        '[class*="control"]', '[class*="panel"]', '[class*="button"]',
-                        '[class*="logo"]', '[class*="watermark"]', '[class*="header"]',
-                        '[class*="footer"]', '[class*="toolbar"]', '[class*="menu"]',
-                        '[id*="control"]', '[id*="panel"]', '[id*="button"]', '[id*="logo"]',
-                        '.video-controls', '.player-controls', '.controls-panel',
-                        '.top-panel', '.bottom-panel', '.rutube-player__controls',
-                        '.video-controls__panel', '.logo', '.rutube-logo', '.player-logo',
-                        '.watermark', '.video-page__control-panel', '.video-page__header',
-                        '.video-page__footer'
-                    ];
-                    
-                    selectors.forEach(selector => {{
-                        const elements = document.querySelectorAll(selector);
-                        elements.forEach(el => {{
-                            if (el) {{
-                                el.style.display = 'none';
-                                el.style.opacity = '0';
-                                el.style.visibility = 'hidden';
-                                el.style.pointerEvents = 'none';
-                                el.remove(); // Полностью удаляем элемент
-                            }}
-                        }});
-                    }});
-                    
-                    // Скрываем элементы внутри iframe
-                    const iframe = document.getElementById('video-player');
-                    if (iframe && iframe.contentDocument) {{
-                        selectors.forEach(selector => {{
-                            const elements = iframe.contentDocument.querySelectorAll(selector);
-                            elements.forEach(el => {{
-                                if (el) {{
-                                    el.style.display = 'none';
-                                    el.style.opacity = '0';
-                                    el.style.visibility = 'hidden';
-                                    el.style.pointerEvents = 'none';
-                                }}
-                            }});
-                        }});
-                    }}
-                }}
-                
-                // Запускаем агрессивное скрытие несколько раз
-                aggressivelyHideRutube();
-                setTimeout(aggressivelyHideRutube, 1000);
-                setTimeout(aggressivelyHideRutube, 3000);
-                setInterval(aggressivelyHideRutube, 5000);
-            }}
-            
-            // Определяем платформу и применяем скрипт
-            function initVideoPlayer() {{
-                const iframe = document.getElementById('video-player');
-                if (!iframe) return;
-                
-                const iframeSrc = iframe.src;
-                
-                if (iframeSrc.includes('youtube')) {{
-                    setTimeout(hideYouTubeElements, 2000);
-                    setInterval(hideYouTubeElements, 5000);
-                }} else if (iframeSrc.includes('rutube')) {{
-                    setTimeout(hideRutubeElements, 1000);
-                    setInterval(hideRutubeElements, 3000);
-                }}
-            }}
-            
-            // Запускаем при загрузке
-            document.getElementById('video-player').addEventListener('load', initVideoPlayer);
-            setTimeout(initVideoPlayer, 1000);
-            
-            // Скрываем при любом взаимодействии
-            document.addEventListener('click', initVideoPlayer);
-            document.addEventListener('mousemove', initVideoPlayer);
-            document.addEventListener('touchstart', initVideoPlayer);
-            </script>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        response = Response(render_template(
+            'secure_video.html',
+            platform=platform,
+            video_url=link_data['video_url']
+        ))
+        # Страница персональная - не кэшируем; CSS/JS отдаются из /static с долгим кэшем
+        response.headers['Cache-Control'] = 'private, no-store'
+        return response
         
     except Exception as e:
         logging.error(f"❌ Error in secure video: {e}")
@@ -492,13 +243,11 @@ def paypal_webhook():
         logging.info(f"📨 Verified PayPal webhook: {event_json.get('event_type')}")
         
         event_type = event_json.get('event_type')
-        resource = event_json.get('resource', {})
         
-        # Обрабатываем ТОЛЬКО подтвержденные платежи
-        if event_type == 'PAYMENT.CAPTURE.COMPLETED':
-            return handle_paypal_payment_completed(resource)
-        elif event_type == 'CHECKOUT.ORDER.COMPLETED':
-            return handle_paypal_order_completed(resource)
+        # Обрабатываем ТОЛЬКО подтвержденные платежи (через очередь payment_queue)
+        if event_type in ['PAYMENT.CAPTURE.COMPLETED', 'CHECKOUT.ORDER.COMPLETED']:
+            payment_queue.enqueue('paypal', event_type, paypal_event_key('paypal', event_json), event_json)
+            return jsonify({"status": "success"}), 200
         
         # Для других событий просто подтверждаем получение
         logging.info(f"🔧 Unhandled but verified PayPal event: {event_type}")
@@ -529,6 +278,12 @@ def health_detailed():
         cursor.execute('SELECT 1')
         health_data["components"]["database"] = "healthy"
         conn.close()
+        health_data["database_pool"] = db.get_pool_stats()
+        health_data["entitlement_cache"] = db.entitlements.get_stats()
+        health_data["scheduler"] = scheduler.get_stats()
+        health_data["payment_events"] = payment_queue.get_stats()
+        health_data["action_log"] = action_log.get_stats()
+        health_data["http_clients"] = get_http_stats()
     except Exception as e:
         health_data["components"]["database"] = f"unhealthy: {str(e)}"
         health_data["status"] = "degraded"
@@ -536,9 +291,8 @@ def health_detailed():
     # Проверка бота (косвенная)
     try:
         # Попытка получить информацию о боте
-        import requests
         bot_url = f"https://api.telegram.org/bot{BOT_TOKEN}/getMe"
-        response = requests.get(bot_url, timeout=10)
+        response = http_client.get(bot_url)
         if response.status_code == 200:
             health_data["components"]["telegram_bot"] = "healthy"
         else:
@@ -577,13 +331,13 @@ def paypal_deck_webhook():
         
         # Проверяем тип события
         event_type = event_json.get('event_type')
-        resource = event_json.get('resource', {})
         
         logger.info(f"🔧 PayPal deck webhook event: {event_type}")
         
-        # Обрабатываем события покупки колоды
+        # Обрабатываем события покупки колоды (через очередь payment_queue)
         if event_type in ['PAYMENT.CAPTURE.COMPLETED', 'CHECKOUT.ORDER.COMPLETED']:
-            return handle_paypal_deck_payment_completed(resource)
+            payment_queue.enqueue('paypal_deck', event_type, paypal_event_key('paypal_deck', event_json), event_json)
+            return jsonify({"status": "success"}), 200
         
         logger.info(f"🔧 Unhandled PayPal deck webhook event: {event_type}")
         return jsonify({"status": "success"}), 200
@@ -592,6 +346,54 @@ def paypal_deck_webhook():
         logger.error(f"❌ Error in PayPal deck webhook: {e}")
         return jsonify({"status": "error"}), 500
 
+def paypal_event_key(provider: str, event_json: dict) -> str:
+    """Ключ идемпотентности вебхука PayPal: id события, иначе хэш тела запроса"""
+    event_id = event_json.get('id')
+    if event_id:
+        return f"{provider}:{event_id}"
+    return f"{provider}:{hashlib.sha256(request.get_data()).hexdigest()}"
+
+def payment_event_key(provider: str, payload: dict):
+    """Ключ платежа провайдера в processed_payments (один на платеж, а не на событие вебхука)"""
+    if provider == 'yookassa':
+        payment_id = payload.get('object', {}).get('id')
+        return f"yookassa:{payment_id}" if payment_id else None
+    
+    # Захват ссылается на свой заказ, поэтому PAYMENT.CAPTURE.COMPLETED и
+    # CHECKOUT.ORDER.COMPLETED одного платежа PayPal дают один ключ
+    resource = payload.get('resource', {})
+    order_id = resource.get('supplementary_data', {}).get('related_ids', {}).get('order_id')
+    payment_id = order_id or resource.get('id')
+    return f"paypal:{payment_id}" if payment_id else None
+
+def dispatch_payment_event(provider: str, event_type: str, payload: dict) -> bool:
+    """Обрабатывает событие из очереди payment_events; False - повторить позже.
+    
+    Событие по уже обработанному платежу (повтор после ошибки, requeue_stale,
+    второе событие PayPal того же заказа) пропускается: активация записывает
+    платеж в processed_payments в своей транзакции.
+    """
+    payment_key = payment_event_key(provider, payload)
+    if payment_key and db.is_payment_processed(payment_key):
+        logging.info(f"ℹ️ Payment {payment_key} already processed, {provider} {event_type} skipped")
+        return True
+    
+    with app.app_context():
+        if provider == 'yookassa':
+            result = handle_payment_notification(payload, payment_key)
+        elif provider == 'paypal' and event_type == 'PAYMENT.CAPTURE.COMPLETED':
+            result = handle_paypal_payment_completed(payload.get('resource', {}), payment_key)
+        elif provider == 'paypal' and event_type == 'CHECKOUT.ORDER.COMPLETED':
+            result = handle_paypal_order_completed(payload.get('resource', {}), payment_key)
+        elif provider == 'paypal_deck':
+            result = handle_paypal_deck_payment_completed(payload.get('resource', {}), payment_key)
+        else:
+            logging.warning(f"⚠️ Unknown payment event: {provider} {event_type}")
+            return True
+    
+    status_code = result[1] if isinstance(result, tuple) else result.status_code
+    return status_code < 500
+
 @app.route('/paypal_webhook_test', methods=['GET', 'POST'])
 def paypal_webhook_test():
     """Тестовый endpoint для проверки доступности"""
@@ -609,7 +411,7 @@ def paypal_webhook_test():
         }
         return jsonify(test_data), 200
 
-def handle_paypal_deck_payment_completed(resource):
+def handle_paypal_deck_payment_completed(resource, payment_key=None):
     """Обрабатывает завершенный платеж за колоду"""
     try:
         purchase_units = resource.get('purchase_units', [])
@@ -631,7 +433,7 @@ def handle_paypal_deck_payment_completed(resource):
             if user_id:
                 # Активируем покупку колоды
                 from paypal_payment import paypal_processor
-                if paypal_processor.activate_paypal_deck_purchase(user_id):
+                if paypal_processor.activate_paypal_deck_purchase(user_id, payment_key):
                     logger.info(f"✅ PayPal deck purchase activated via webhook for user {user_id}")
                     
                     # Обновляем статус платежа в базе
@@ -749,7 +551,7 @@ def send_deck_files_async(user_id: int):
     thread.daemon = True
     thread.start()
 
-def handle_paypal_payment_completed(resource):
+def handle_paypal_payment_completed(resource, payment_key=None):
     """Обрабатывает подтвержденный платеж PayPal (captured)"""
     try:
         custom_id = resource.get('custom_id')
@@ -797,7 +599,7 @@ def handle_paypal_payment_completed(resource):
             # Определяем тип продукта по сумме
             if amount == "80.00" and currency == "ILS":  # Колода
                 from paypal_payment import paypal_processor
-                if paypal_processor.activate_paypal_deck_purchase(user_id):
+                if paypal_processor.activate_paypal_deck_purchase(user_id, payment_key):
                     logging.info(f"✅ PayPal deck purchase activated via webhook for user {user_id}")
                     
                     # Обновляем статус в pending_payments
@@ -818,7 +620,8 @@ def handle_paypal_payment_completed(resource):
                     success = db.create_subscription(
                         user_id, 
                         subscription_type, 
-                        SUBSCRIPTION_DURATIONS[subscription_type]
+                        SUBSCRIPTION_DURATIONS[subscription_type],
+                        payment_key=payment_key
                     )
                     
                     if success:
@@ -880,7 +683,7 @@ def update_pending_payment_status(user_id, amount, payment_method, status):
     except Exception as e:
         logging.error(f"❌ Error updating pending payment status: {e}")
 
-def handle_paypal_order_completed(resource):
+def handle_paypal_order_completed(resource, payment_key=None):
     """Обрабатывает завершенный заказ PayPal - ДОПОЛНЕННАЯ ВЕРСИЯ"""
     try:
         order_id = resource.get('id')
@@ -901,7 +704,7 @@ def handle_paypal_order_completed(resource):
         
         if payment_info:
             # Активируем через существующий механизм
-            if paypal_processor.activate_subscription(payment_id):
+            if paypal_processor.activate_subscription(payment_id, payment_key):
                 logging.info(f"✅ PayPal subscription activated via pending payment for user {payment_info['user_id']}")
                 return jsonify({"status": "success"}), 200
         
@@ -912,7 +715,7 @@ def handle_paypal_order_completed(resource):
             # Проверяем тип продукта по сумме
             if amount == "80.00":  # Колода
                 # Активируем покупку колоды
-                if paypal_processor.activate_paypal_deck_purchase(user_id):
+                if paypal_processor.activate_paypal_deck_purchase(user_id, payment_key):
                     logging.info(f"✅ PayPal deck purchase activated via order completed for user {user_id}")
                     # Отправляем файлы асинхронно
                     send_deck_files_async(user_id)
@@ -925,7 +728,8 @@ def handle_paypal_order_completed(resource):
                     success = db.create_subscription(
                         user_id, 
                         subscription_type, 
-                        SUBSCRIPTION_DURATIONS[subscription_type]
+                        SUBSCRIPTION_DURATIONS[subscription_type],
+                        payment_key=payment_key
                     )
                     
                     if success:
@@ -985,15 +789,25 @@ def find_user_from_paypal_payment(resource):
             user_id = int(custom_id.replace('user_', ''))
             return user_id
         
-        # Ищем по email плательщика
+        # Ищем по индексу ожидаемых платежей (ID заказа, email, сумма)
         payer = resource.get('payer', {})
         email = payer.get('email_address')
+        related_ids = resource.get('supplementary_data', {}).get('related_ids', {})
+        
+        user_id = db.find_payment_user(
+            'paypal',
+            provider_payment_id=related_ids.get('order_id') or resource.get('id'),
+            email=email,
+            amount=purchase_unit.get('amount', {}).get('value')
+        )
+        if user_id:
+            return user_id
         
         if email:
             # Ищем пользователя по email в базе
             conn = db.get_connection()
             cursor = conn.cursor()
-            cursor.execute('SELECT user_id FROM users WHERE email = %s LIMIT 1', (email,))
+            cursor.execute('SELECT user_id FROM users WHERE LOWER(email) = LOWER(%s) LIMIT 1', (email,))
             result = cursor.fetchone()
             conn.close()
             
@@ -1057,6 +871,15 @@ def verify_paypal_webhook(request):
             logging.error("❌ Missing PayPal webhook verification headers")
             return False
         
+        # Локальная проверка подписи по сертификату PayPal (без запроса к API)
+        if PAYPAL_WEBHOOK_VERIFICATION != 'remote':
+            verified = paypal_verifier.verify(request.headers, request.get_data())
+            if verified is not None:
+                if verified:
+                    logging.info("✅ PayPal webhook signature verified locally")
+                return verified
+            logging.info("ℹ️ Local PayPal verification unavailable, using verification API")
+        
         # Получаем access token для PayPal API
         access_token = paypal_processor.get_access_token()
         if not access_token:
@@ -1084,7 +907,7 @@ def verify_paypal_webhook(request):
             "webhook_event": json.loads(webhook_event)  # Преобразуем обратно в JSON
         }
         
-        response = requests.post(verification_url, json=payload, headers=headers, timeout=30)
+        response = http_client.post(verification_url, json=payload, headers=headers, idempotent=True)
         
         if response.status_code == 200:
             result = response.json()
@@ -1151,11 +974,7 @@ def start_health_monitoring():
                 time.sleep(300)  # Каждые 5 минут
                 
                 # Проверка соединения с Telegram
-                import requests
-                response = requests.get(
-                    f"https://api.telegram.org/bot{BOT_TOKEN}/getMe",
-                    timeout=10
-                )
+                response = http_client.get(f"https://api.telegram.org/bot{BOT_TOKEN}/getMe")
                 
                 if response.status_code != 200:
                     logger.warning("⚠️ Telegram API connectivity issue detected")
@@ -1286,20 +1105,6 @@ def find_recent_subscription_user_by_time(payment_time):
         conn = db.get_connection()
         cursor = conn.cursor()
         
-        # Создаем таблицу для логов действий если её нет
-        try:
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_action_logs (
-                    id SERIAL PRIMARY KEY,
-                    user_id BIGINT,
-                    action TEXT,
-                    action_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-        except:
-            pass  # Таблица уже существует
-        
         # Ищем действия за последние 10 минут до платежа
         time_before_payment = payment_time - timedelta(minutes=10)
         
@@ -1327,30 +1132,26 @@ def find_recent_subscription_user_by_time(payment_time):
         logger.error(f"❌ Error finding user by time: {e}")
         return None
 
-def send_admin_notification_successful(user_id: int, amount: str, currency: str, product_type: str, 
-                                      payment_id: str, email: str, payment_system: str):
-    """Отправляет уведомление об успешном платеже"""
-    try:
-        import requests
-        from config import BOT_TOKEN
-        
-        # Определяем название продукта
-        product_name = "Подписка" if product_type == "subscription" else "Колода"
-        
-        # Определяем тип подписки по сумме если это подписка
-        subscription_info = ""
-        if product_type == "subscription":
-            sub_type = determine_subscription_type(amount)
-            subscription_names = {
-                "month": "1 месяц",
-                "3months": "3 месяца", 
-                "6months": "6 месяцев",
-                "year": "1 год"
-            }
-            if sub_type in subscription_names:
-                subscription_info = f"\n💎 Тип: {subscription_names[sub_type]}"
-        
-        admin_message = f"""
+def admin_payment_successful_text(user_id: int, amount: str, currency: str, product_type: str, 
+                                  payment_id: str, email: str, payment_system: str) -> str:
+    """Текст уведомления администратора об успешном платеже"""
+    # Определяем название продукта
+    product_name = "Подписка" if product_type == "subscription" else "Колода"
+    
+    # Определяем тип подписки по сумме если это подписка
+    subscription_info = ""
+    if product_type == "subscription":
+        sub_type = determine_subscription_type(amount)
+        subscription_names = {
+            "month": "1 месяц",
+            "3months": "3 месяца", 
+            "6months": "6 месяцев",
+            "year": "1 год"
+        }
+        if sub_type in subscription_names:
+            subscription_info = f"\n💎 Тип: {subscription_names[sub_type]}"
+    
+    return f"""
 ✅ УСПЕШНЫЙ ПЛАТЕЖ {payment_system.upper()}
 
 🎉 *{product_name} приобретена!*
@@ -1364,6 +1165,15 @@ def send_admin_notification_successful(user_id: int, amount: str, currency: str,
 
 Платеж обработан автоматически! 🎊
 """
+
+def send_admin_notification_successful(user_id: int, amount: str, currency: str, product_type: str, 
+                                      payment_id: str, email: str, payment_system: str):
+    """Отправляет уведомление об успешном платеже"""
+    try:
+        from config import BOT_TOKEN
+        
+        admin_message = admin_payment_successful_text(user_id, amount, currency, product_type,
+                                                      payment_id, email, payment_system)
         
         telegram_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
         payload = {
@@ -1372,7 +1182,7 @@ def send_admin_notification_successful(user_id: int, amount: str, currency: str,
             "parse_mode": "Markdown"
         }
         
-        response = requests.post(telegram_url, json=payload, timeout=10)
+        response = http_client.post(telegram_url, json=payload)
         
         if response.status_code == 200:
             logger.info(f"✅ Admin notification sent for {product_type} payment {payment_id}")
@@ -1382,16 +1192,12 @@ def send_admin_notification_successful(user_id: int, amount: str, currency: str,
     except Exception as e:
         logger.error(f"❌ Error sending admin notification: {e}")
 
-def send_admin_notification_failed(user_id: int, amount: str, currency: str, product_type: str, 
-                                  payment_id: str, reason: str):
-    """Отправляет уведомление о неудачном платеже"""
-    try:
-        import requests
-        from config import BOT_TOKEN
-        
-        product_name = "Подписка" if product_type == "subscription" else "Колода"
-        
-        admin_message = f"""
+def admin_payment_failed_text(user_id: int, amount: str, currency: str, product_type: str, 
+                              payment_id: str, reason: str) -> str:
+    """Текст уведомления администратора о неудачном платеже"""
+    product_name = "Подписка" if product_type == "subscription" else "Колода"
+    
+    return f"""
 ❌ НЕУДАЧНЫЙ ПЛАТЕЖ
 
 🚨 *{product_name} не активирована!*
@@ -1405,6 +1211,14 @@ def send_admin_notification_failed(user_id: int, amount: str, currency: str, pro
 
 Требуется проверка! ⚠️
 """
+
+def send_admin_notification_failed(user_id: int, amount: str, currency: str, product_type: str, 
+                                  payment_id: str, reason: str):
+    """Отправляет уведомление о неудачном платеже"""
+    try:
+        from config import BOT_TOKEN
+        
+        admin_message = admin_payment_failed_text(user_id, amount, currency, product_type, payment_id, reason)
         
         telegram_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
         payload = {
@@ -1413,7 +1227,7 @@ def send_admin_notification_failed(user_id: int, amount: str, currency: str, pro
             "parse_mode": "Markdown"
         }
         
-        response = requests.post(telegram_url, json=payload, timeout=10)
+        response = http_client.post(telegram_url, json=payload)
         
         if response.status_code == 200:
             logger.info(f"✅ Admin failure notification sent for payment {payment_id}")
@@ -1423,7 +1237,8 @@ def send_admin_notification_failed(user_id: int, amount: str, currency: str, pro
     except Exception as e:
         logger.error(f"❌ Error sending failure notification: {e}")
 
-def activate_deck_purchase_from_webhook(user_id: int, payment_id: str, amount: str, currency: str) -> bool:
+def activate_deck_purchase_from_webhook(user_id: int, payment_id: str, amount: str, currency: str,
+                                        payment_key: str = None) -> bool:
     """Активирует покупку колоды из вебхука"""
     try:
         from database import db
@@ -1441,7 +1256,7 @@ def activate_deck_purchase_from_webhook(user_id: int, payment_id: str, amount: s
             return False
         
         # Активируем покупку колоды
-        success = db.record_deck_purchase(user_id, payment_id)
+        success = db.record_deck_purchase(user_id, payment_id, payment_key=payment_key)
         
         if success:
             logger.info(f"✅ Deck purchase activated for user {user_id}")
@@ -1458,7 +1273,7 @@ def activate_deck_purchase_from_webhook(user_id: int, payment_id: str, amount: s
         logger.error(f"❌ Error activating deck purchase: {e}")
         return False
 
-def handle_payment_notification(event_data):
+def handle_payment_notification(event_data, payment_key=None):
     """Обрабатывает уведомление о платеже"""
     try:
         payment_object = event_data.get('object', {})
@@ -1481,7 +1296,7 @@ def handle_payment_notification(event_data):
         logger.info(f"📦 Product type detected: {product_type}")
 
         # ✅ УЛУЧШЕННЫЙ ПОИСК ПОЛЬЗОВАТЕЛЯ
-        user_id = find_user_for_payment(metadata, amount_value)
+        user_id = find_user_for_payment(metadata, amount_value, payment_id=payment_id)
         
         if user_id:
             user_id = int(user_id)
@@ -1492,7 +1307,8 @@ def handle_payment_notification(event_data):
                 # Обработка в зависимости от типа продукта
                 if product_type == "deck":
                     # Обработка покупки колоды
-                    success = activate_deck_purchase_from_webhook(user_id, payment_id, amount_value, currency)
+                    success = activate_deck_purchase_from_webhook(user_id, payment_id, amount_value, currency,
+                                                                  payment_key)
                     
                     if success:
                         logger.info(f"🎉 Deck purchase activated for user {user_id}")
@@ -1511,7 +1327,8 @@ def handle_payment_notification(event_data):
                     # Обработка подписки
                     subscription_type = determine_subscription_type(amount_value)
                     
-                    success = activate_subscription_from_webhook(user_id, subscription_type, payment_id, payment_id)
+                    success = activate_subscription_from_webhook(user_id, subscription_type, payment_id, payment_id,
+                                                                 payment_key)
 
                     if success:
                         logger.info(f"🎉 Subscription activated for user {user_id}, type: {subscription_type}")
@@ -1619,16 +1436,12 @@ def save_successful_payment_to_db(user_id: int, subscription_type: str, yookassa
     except Exception as e:
         logger.error(f"❌ Error saving payment to DB: {e}")
 
-def notify_admin_about_unknown_payment_sync(payment_id: str, amount: str, email: str, phone: str, 
-                                           product_type: str = "unknown", currency: str = "RUB"):
-    """Уведомляет администратора о неидентифицированном платеже"""
-    try:
-        import requests
-        from config import BOT_TOKEN
-        
-        product_name = "Подписка" if product_type == "subscription" else "Колода" if product_type == "deck" else "Неизвестно"
-        
-        message_text = f"""
+def admin_unknown_payment_text(payment_id: str, amount: str, email: str, phone: str, 
+                               product_type: str = "unknown", currency: str = "RUB") -> str:
+    """Текст уведомления администратора о неидентифицированном платеже"""
+    product_name = "Подписка" if product_type == "subscription" else "Колода" if product_type == "deck" else "Неизвестно"
+    
+    return f"""
 ⚠️ *НЕИДЕНТИФИЦИРОВАННЫЙ ПЛАТЕЖ*
 
 🚨 Требуется ручная обработка!
@@ -1647,6 +1460,14 @@ def notify_admin_about_unknown_payment_sync(payment_id: str, amount: str, email:
 
 *Пользователь не идентифицирован, требуется ручная обработка!*
 """
+
+def notify_admin_about_unknown_payment_sync(payment_id: str, amount: str, email: str, phone: str, 
+                                           product_type: str = "unknown", currency: str = "RUB"):
+    """Уведомляет администратора о неидентифицированном платеже"""
+    try:
+        from config import BOT_TOKEN
+        
+        message_text = admin_unknown_payment_text(payment_id, amount, email, phone, product_type, currency)
         
         telegram_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
         payload = {
@@ -1655,7 +1476,7 @@ def notify_admin_about_unknown_payment_sync(payment_id: str, amount: str, email:
             "parse_mode": "Markdown"
         }
         
-        response = requests.post(telegram_url, json=payload, timeout=10)
+        response = http_client.post(telegram_url, json=payload)
         
         if response.status_code == 200:
             logger.info(f"✅ Unknown payment notification sent to admin")
@@ -1790,12 +1611,7 @@ def find_user_by_payment_id(yookassa_payment_id: str):
         conn = db.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT user_id FROM payments 
-            WHERE yoomoney_payment_id = %s 
-            OR payment_id = %s
-            LIMIT 1
-        ''', (yookassa_payment_id, yookassa_payment_id))
+        cursor.execute(USER_BY_PAYMENT_ID_SQL, (yookassa_payment_id, yookassa_payment_id))
         
         result = cursor.fetchone()
         conn.close()
@@ -1875,8 +1691,8 @@ def find_user_by_email(email: str):
         conn = db.get_connection()
         cursor = conn.cursor()
 
-        # Ищем в таблице users
-        cursor.execute('SELECT user_id FROM users WHERE email = %s LIMIT 1', (email,))
+        # Ищем в таблице users (индекс idx_users_email_lower)
+        cursor.execute(USER_BY_EMAIL_SQL, (email,))
         result = cursor.fetchone()
 
         if not result:
@@ -1886,12 +1702,7 @@ def find_user_by_email(email: str):
 
         if not result:
             # Ищем в таблице платежей по историческим данным
-            cursor.execute('''
-                SELECT user_id FROM payments 
-                WHERE customer_email = %s 
-                ORDER BY created_at DESC 
-                LIMIT 1
-            ''', (email,))
+            cursor.execute(PAYMENT_USER_BY_EMAIL_SQL, (email,))
             result = cursor.fetchone()
 
         conn.close()
@@ -1917,14 +1728,18 @@ def find_user_by_phone(phone: str):
         # Очищаем номер от лишних символов
         clean_phone = ''.join(filter(str.isdigit, phone))
 
-        # Ищем в пользователях (если есть поле phone)
-        cursor.execute('''
-            SELECT user_id FROM users 
-            WHERE phone = %s OR phone LIKE %s 
-            LIMIT 1
-        ''', (phone, f'%{clean_phone}%'))
-
+        # Сначала точное совпадение (индекс idx_users_phone), затем по цифрам номера
+        cursor.execute(USER_BY_PHONE_SQL, (phone,))
         result = cursor.fetchone()
+
+        if not result:
+            cursor.execute('''
+                SELECT user_id FROM users 
+                WHERE phone LIKE %s 
+                LIMIT 1
+            ''', (f'%{clean_phone}%',))
+            result = cursor.fetchone()
+
         conn.close()
 
         if result:
@@ -1941,17 +1756,6 @@ def find_recent_subscription_user(amount: str):
         conn = db.get_connection()
         cursor = conn.cursor()
 
-        # Создаем временную таблицу для хранения действий пользователей
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_actions (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT,
-                action_type TEXT,
-                action_data JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
         # Ищем пользователей, которые недавно нажимали на кнопки подписки
         cursor.execute('''
             SELECT user_id FROM user_actions 
@@ -1991,20 +1795,6 @@ def save_unknown_payment_for_review(payment_object):
         conn = db.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS unknown_payments (
-                id SERIAL PRIMARY KEY,
-                payment_id TEXT NOT NULL,
-                amount DECIMAL,
-                customer_email TEXT,
-                customer_phone TEXT,
-                payment_data JSONB,
-                payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT,
-                processed BOOLEAN DEFAULT FALSE
-            )
-        ''')
-
         payment_id = payment_object.get('id')
         amount = payment_object.get('amount', {}).get('value')
         metadata = payment_object.get('metadata', {})
@@ -2028,13 +1818,27 @@ def save_unknown_payment_for_review(payment_object):
     except Exception as e:
         logger.error(f"❌ Error saving unknown payment: {e}")
 
-def find_user_for_payment(metadata, amount, payment_time=None):
+def find_user_for_payment(metadata, amount, payment_time=None, payment_id=None):
     """Улучшенный поиск пользователя для платежа"""
     try:
         if payment_time is None:
             payment_time = datetime.now()
         
         email = metadata.get('custEmail')
+        
+        # Один запрос по индексу ожидаемых платежей (payment_correlations)
+        user_id = db.find_payment_user(
+            'yookassa',
+            provider_payment_id=payment_id,
+            internal_payment_id=metadata.get('payment_id'),
+            email=email,
+            phone=metadata.get('phone') or metadata.get('custPhone'),
+            amount=amount
+        )
+        if user_id:
+            return user_id
+        
+        # Ниже - поиск для платежей, созданных до появления payment_correlations
 
         # СПОСОБ 0: Ищем в pending_payments по сумме и времени
         user_id = find_user_from_pending_payments(email, amount)
@@ -2106,16 +1910,7 @@ def find_recent_subscription_users(payment_time, minutes=10):
         
         time_before = payment_time - timedelta(minutes=minutes)
         
-        # ИСПРАВЛЕННЫЙ ЗАПРОС
-        cursor.execute('''
-            SELECT DISTINCT user_id, MAX(created_at) as last_action 
-            FROM user_action_logs 
-            WHERE action IN ('subscription_clicked', 'subscription_selected', 'payment_attempt')
-            AND created_at >= %s
-            GROUP BY user_id
-            ORDER BY last_action DESC 
-            LIMIT 5
-        ''', (time_before,))
+        cursor.execute(RECENT_SUBSCRIPTION_USERS_SQL, (time_before,))
         
         results = [row[0] for row in cursor.fetchall()]
         conn.close()
@@ -2317,7 +2112,8 @@ def notify_admin_about_unknown_payment(payment_id: str, amount: str, email: str,
     except Exception as e:
         logger.error(f"❌ Error notifying admin: {e}")
 
-def activate_subscription_from_webhook(user_id, subscription_type, yookassa_payment_id, internal_payment_id):
+def activate_subscription_from_webhook(user_id, subscription_type, yookassa_payment_id, internal_payment_id,
+                                       payment_key=None):
     """Активирует подписку из вебхука"""
     try:
         from database import db
@@ -2327,7 +2123,8 @@ def activate_subscription_from_webhook(user_id, subscription_type, yookassa_paym
         success = db.create_subscription(
             user_id, 
             subscription_type, 
-            SUBSCRIPTION_DURATIONS[subscription_type]
+            SUBSCRIPTION_DURATIONS[subscription_type],
+            payment_key=payment_key
         )
 
         if success:
@@ -2372,15 +2169,11 @@ def ping_self():
     """Пингует собственный health endpoint"""
     service_url = os.environ.get('RENDER_EXTERNAL_URL', 'https://metaphor-bot.onrender.com')
     
-    while True:
-        try:
-            response = requests.get(f"{service_url}/health", timeout=10)
-            logger.info(f"✅ Self-ping successful: {response.status_code}")
-        except Exception as e:
-            logger.error(f"❌ Self-ping failed: {e}")
-        
-        # Ждем 10 минут (600 секунд)
-        time.sleep(600)
+    try:
+        response = http_client.get(f"{service_url}/health")
+        logger.info(f"✅ Self-ping successful: {response.status_code}")
+    except Exception as e:
+        logger.error(f"❌ Self-ping failed: {e}")
 
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Обработчик ошибок"""
@@ -2425,6 +2218,7 @@ def setup_handlers(application):
     application.add_handler(CommandHandler("todaymessages", handlers.view_today_messages))
     application.add_handler(CommandHandler("updatecards", handlers.update_cards_descriptions))
     application.add_handler(CommandHandler("force_update_cards", handlers.force_update_cards))
+    application.add_handler(CommandHandler("warm_card_media", handlers.warm_card_media))
     application.add_handler(CommandHandler("getfileid", handlers.get_file_id))
     application.add_handler(CommandHandler("getallfiles", handlers.get_all_file_ids))
     application.add_handler(CommandHandler("meditation", handlers.meditation_command))
@@ -2488,51 +2282,146 @@ def setup_handlers(application):
     ))
 
 def cleanup_video_links():
-    """Периодическая очистка просроченных видео ссылок"""
-    while not shutdown_manager.shutdown_event.is_set():
-        try:
-            time.sleep(3600)  # Каждый час
-            if not shutdown_manager.shutdown_event.is_set():
-                cleaned_count = db.cleanup_expired_video_links()
-                if cleaned_count > 0:
-                    logger.info(f"✅ Periodically cleaned {cleaned_count} expired video links")
-        except Exception as e:
-            logger.error(f"❌ Error in periodic video links cleanup: {e}")
-
-def start_payment_monitoring():
-    """Запускает автоматический мониторинг платежей"""
-    while True:
-        try:
-            # Мониторинг ЮKassa платежей
-            payment_processor.check_all_pending_payments()
-            
-            # Мониторинг PayPal платежей
-            try:
-                from paypal_payment import paypal_processor
-                # Подписки
-                activated_subs = paypal_processor.check_paypal_static_payments()
-                # Колоды
-                activated_decks = paypal_processor.check_paypal_deck_payments()
-                
-                if activated_subs > 0 or activated_decks > 0:
-                    logging.info(f"✅ PayPal monitor: activated {activated_subs} subscriptions, {activated_decks} deck purchases")
-                    
-            except Exception as e:
-                logging.error(f"❌ Error in PayPal payment monitoring: {e}")
-            
-        except Exception as e:
-            logging.error(f"❌ Error in payment monitoring: {e}")
+    """Очистка просроченных видео ссылок"""
+    cleaned_count = db.cleanup_expired_video_links()
+    if cleaned_count > 0:
+        logger.info(f"✅ Periodically cleaned {cleaned_count} expired video links")
+
+def reconcile_payments():
+    """Сверка платежей: ловит пропущенные вебхуки и зависшие события очереди"""
+    payment_queue.requeue_stale()
+    
+    # Мониторинг ЮKassa платежей
+    payment_processor.check_all_pending_payments()
+    
+    # Мониторинг PayPal платежей
+    try:
+        from paypal_payment import paypal_processor
+        # Подписки
+        activated_subs = paypal_processor.check_paypal_static_payments()
+        # Колоды
+        activated_decks = paypal_processor.check_paypal_deck_payments()
         
-        # Проверяем каждые 30 секунд
-        for _ in range(30):
-            if shutdown_manager.shutdown_event.is_set():
-                break
-            time.sleep(1)
+        if activated_subs > 0 or activated_decks > 0:
+            logging.info(f"✅ PayPal monitor: activated {activated_subs} subscriptions, {activated_decks} deck purchases")
+            
+    except Exception as e:
+        logging.error(f"❌ Error in PayPal payment monitoring: {e}")
+
+def refresh_paypal_token():
+    """Заранее обновляет токен PayPal, чтобы вебхуки и платежи не ждали /v1/oauth2/token"""
+    from paypal_payment import paypal_processor
+    paypal_processor.refresh_access_token()
+
+def maintain_history_partitions():
+    """Создает секции таблиц истории на будущие месяцы и убирает старые"""
+    db.maintain_history_partitions(
+        months_ahead=HISTORY_PARTITIONS_AHEAD,
+        retention_months=HISTORY_RETENTION_MONTHS,
+        retention_action=HISTORY_RETENTION_ACTION
+    )
+
+async def send_reminders_job(context: ContextTypes.DEFAULT_TYPE):
+    """Плановая рассылка напоминаний"""
+    logging.info(f"⏰ Time for reminders: {datetime.now().strftime('%H:%M')}")
+    await send_reminders(context.bot)
+
+async def card_media_warmup_job(context: ContextTypes.DEFAULT_TYPE):
+    """Загружает в Telegram картинки карт, для которых еще нет file_id"""
+    await card_media.warm_up(context.bot, ADMIN_IDS[0])
+
+async def resume_reminders_job(context: ContextTypes.DEFAULT_TYPE):
+    """Продолжает рассылку, прерванную падением или перезапуском"""
+    run_key = await async_db.get_unfinished_broadcast_run("card_reminder:")
+    if run_key:
+        await send_reminders(context.bot, run_key)
+
+def setup_scheduler(application):
+    """Регистрирует фоновые задачи в JobQueue приложения"""
+    job_queue = application.job_queue
+    
+    scheduler.run_repeating(job_queue, "payment_reconciliation", reconcile_payments, interval=PAYMENT_RECONCILE_INTERVAL, first=60, jitter=30)
+    scheduler.run_repeating(job_queue, "self_ping", ping_self, interval=600, first=60, jitter=30)
+    scheduler.run_repeating(job_queue, "video_links_cleanup", cleanup_video_links, interval=3600, jitter=60)
+    scheduler.run_repeating(job_queue, "expired_subscriptions", check_expired_subscriptions, interval=300, jitter=15)
+    scheduler.run_repeating(job_queue, "paypal_token_refresh", refresh_paypal_token, interval=300, first=30, jitter=30)
+    scheduler.run_repeating(job_queue, "admin_stats_refresh", db.refresh_admin_stats, interval=ADMIN_STATS_REFRESH_INTERVAL, first=120, jitter=60)
+    scheduler.run_repeating(job_queue, "history_partitions", maintain_history_partitions, interval=86400, first=300, jitter=600)
+    
+    # Напоминания (по умолчанию в 10:00 и 18:00) по времени сервера
+    local_tz = datetime.now().astimezone().tzinfo
+    reminder_times = [dtime(hour=hour, tzinfo=local_tz) for hour in REMINDER_HOURS]
+    scheduler.run_daily(job_queue, "reminders", send_reminders_job, reminder_times)
+    scheduler.run_once(job_queue, "reminders_resume", resume_reminders_job, when=60)
+    
+    # Предварительная загрузка картинок карт (file_id) - по желанию
+    if CARD_MEDIA_WARMUP and ADMIN_IDS:
+        scheduler.run_once(job_queue, "card_media_warmup", card_media_warmup_job, when=120)
+
+async def on_application_start(application):
+    """Запускает обработчики очередей после инициализации базы (run_bot) -
+    на новой базе их таблицы появляются только после миграций"""
+    payment_queue.start()
+    action_log.start()
+
+async def on_application_stop(application):
+    """Останавливает фоновые задачи вместе с ботом"""
+    shutdown_manager.shutdown_event.set()
+    await scheduler.wait_for_running()
+    await async_http_client.close()
+    
+    # Записываем накопленные действия пользователей (не в обработчике сигнала:
+    # там нельзя брать блокировки буфера и ходить в базу)
+    try:
+        await async_db.run(action_log.flush)
+    except Exception as e:
+        logger.error(f"❌ Error flushing action log on stop: {e}")
+
+ALLOWED_UPDATES = ['message', 'callback_query']
+
+def build_application():
+    """Создает приложение бота с обработчиками и фоновыми задачами"""
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .post_init(on_application_start)
+        .post_stop(on_application_stop)
+        .build()
+    )
+    application.add_error_handler(enhanced_error_handler)
+    
+    # Добавляем обработчики
+    setup_handlers(application)
+    
+    # Фоновые задачи
+    setup_scheduler(application)
+    return application
+
+def run_webhook(application):
+    """Обслуживает вебхук Telegram и маршруты Flask одним ASGI сервером"""
+    import webhook_server
+    
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(webhook_server.serve(
+        application,
+        app,
+        host='0.0.0.0',
+        port=PORT,
+        webhook_url=f"{BASE_URL}{TELEGRAM_WEBHOOK_PATH}",
+        webhook_path=TELEGRAM_WEBHOOK_PATH,
+        secret_token=TELEGRAM_WEBHOOK_SECRET,
+        allowed_updates=ALLOWED_UPDATES,
+        wsgi_workers=WEB_THREADS,
+        limit_concurrency=WEB_CONNECTION_LIMIT,
+        timeout_keep_alive=WEB_KEEPALIVE_TIMEOUT
+    ))
 
 def run_bot():
     """Запускает бота в основном потоке"""
     max_retries = 3
     retry_delay = 30
+    webhook_failed = False
     
     for attempt in range(max_retries):
         # Проверяем флаг shutdown перед каждой попыткой
@@ -2552,13 +2441,25 @@ def run_bot():
             logger.info("🔄 Initializing database...")
             db.init_database()
             db.update_existing_users_limits()
+            db.get_pool().warm_up()
+            db.card_catalog.load()
+            card_media.load()
             
             # Создаем приложение
-            application = Application.builder().token(BOT_TOKEN).build()
-            application.add_error_handler(enhanced_error_handler)
+            application = build_application()
             
-            # Добавляем обработчики
-            setup_handlers(application)
+            if BOT_MODE == "webhook" and not webhook_failed:
+                try:
+                    logger.info("🚀 Starting bot in webhook mode (SINGLE INSTANCE)...")
+                    run_webhook(application)
+                    logger.info("✅ Bot stopped normally")
+                    break
+                except Exception as e:
+                    # Запасной вариант - polling и отдельный Flask сервер
+                    logger.error(f"❌ Webhook mode failed, falling back to polling: {e}")
+                    webhook_failed = True
+                    start_flask_thread()
+                    application = build_application()
             
             logger.info("🚀 Starting bot polling (SINGLE INSTANCE)...")
             
@@ -2567,7 +2468,7 @@ def run_bot():
                 poll_interval=3.0,
                 timeout=20,
                 drop_pending_updates=True,
-                allowed_updates=['message', 'callback_query'],
+                allowed_updates=ALLOWED_UPDATES,
                 bootstrap_retries=0,
                 close_loop=False
             )
@@ -2597,14 +2498,42 @@ def run_bot():
                     raise
 
 def run_flask_server():
-    """Запускает Flask сервер"""
+    """Запускает Flask на production WSGI сервере (waitress)"""
     try:
-        port = int(os.environ.get("PORT", 10000))
-        logger.info(f"🚀 Starting Flask server on port {port}")
-        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False)
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("⚠️ waitress is not installed, using Flask development server")
+            logger.info(f"🚀 Starting Flask server on port {PORT}")
+            app.run(host='0.0.0.0', port=PORT, debug=False, use_reloader=False, threaded=True)
+            return
+        
+        logger.info(f"🚀 Starting waitress server on port {PORT} ({WEB_THREADS} threads)")
+        serve(
+            app,
+            host='0.0.0.0',
+            port=PORT,
+            threads=WEB_THREADS,
+            connection_limit=WEB_CONNECTION_LIMIT,
+            channel_timeout=WEB_CHANNEL_TIMEOUT,
+            trusted_proxy='*',
+            trusted_proxy_headers='x-forwarded-for x-forwarded-proto',
+            clear_untrusted_proxy_headers=True,
+            ident='metaphor-bot'
+        )
     except Exception as e:
         logger.error(f"❌ Flask server crashed: {e}")
 
+def start_flask_thread():
+    """Запускает Flask в отдельном потоке (режим polling)"""
+    flask_thread = threading.Thread(target=run_flask_server, daemon=True)
+    flask_thread.start()
+    logger.info("✅ Flask server started in thread")
+    
+    # Даем Flask время на запуск
+    time.sleep(3)
+    return flask_thread
+
 def signal_handler(signum, frame):
     """Обработчик сигналов для graceful shutdown"""
     logger.info("🛑 Received shutdown signal. Stopping bot gracefully...")
@@ -2632,75 +2561,29 @@ def monitor_resources():
             logger.error(f"❌ Resource monitoring error: {e}")
             time.sleep(300)
 
-def check_expired_subscriptions_periodically():
-    """Периодически проверяет и обновляет истекшие подписки"""
-    while not shutdown_manager.shutdown_event.is_set():
-        try:
-            # Проверяем каждые 5 минут
-            time.sleep(300)
-            
-            if not shutdown_manager.shutdown_event.is_set():
-                expired_count = db.check_and_update_expired_subscriptions()
-                if expired_count > 0:
-                    logger.info(f"✅ Periodically updated {expired_count} expired subscriptions")
-                    
-        except Exception as e:
-            logger.error(f"❌ Error in expired subscriptions check: {e}")
+def check_expired_subscriptions():
+    """Проверяет и обновляет истекшие подписки"""
+    expired_count = db.check_and_update_expired_subscriptions()
+    if expired_count > 0:
+        logger.info(f"✅ Periodically updated {expired_count} expired subscriptions")
 
-async def send_reminders():
-    """Отправляет напоминания пользователям, которые давно не брали карты (АСИНХРОННАЯ версия)"""
-    try:
-        bot = Bot(token=BOT_TOKEN)
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Получаем текущую дату
-        today = date.today()
-        week_ago = today - timedelta(days=7)
-        
-        # Ищем пользователей, которые не брали карты более 7 дней
-        # И у которых последнее напоминание было более 7 дней назад или вообще не было
-        cursor.execute('''
-            SELECT u.user_id, u.first_name, u.username, u.last_daily_card_date 
-            FROM users u
-            WHERE (u.last_daily_card_date IS NULL OR u.last_daily_card_date < %s)
-            AND u.user_id NOT IN (
-                -- Исключаем пользователей, которым уже отправляли напоминание в последние 7 дней
-                SELECT user_id FROM user_reminders 
-                WHERE reminder_type = 'card_reminder' 
-                AND reminder_date >= %s - INTERVAL '7 days'
-            )
-            AND u.user_id NOT IN (
-                -- Исключаем пользователей, которые заблокировали бота (опционально)
-                SELECT user_id FROM user_action_logs 
-                WHERE action = 'bot_blocked' 
-                AND created_at >= %s - INTERVAL '30 days'
-            )
-            -- Ограничиваем количество, чтобы не перегружать
-            LIMIT 50
-        ''', (week_ago, today, today))
-        
-        users_to_remind = cursor.fetchall()
-        
-        reminded_count = 0
-        
-        for user_id, first_name, username, last_date in users_to_remind:
-            try:
-                user_name = f"{first_name}" if first_name else username or "Дорогой пользователь"
-                
-                if last_date is None:
-                    # Для пользователей, которые никогда не брали карты
-                    message = f"""
+def build_reminder_message(first_name, username, last_date, today):
+    """Текст напоминания о карте дня"""
+    user_name = f"{first_name}" if first_name else username or "Дорогой пользователь"
+    
+    if last_date is None:
+        # Для пользователей, которые никогда не брали карты
+        return f"""
 {user_name}, Вы еще не пробовали карты дня! 🎴
 
 Каждый день вы можете получить уникальную карту с подсказкой от Вселенной 🌊
 
 Начните свой день с карты дня — она поможет увидеть новые возможности и ресурсы! 💫
 """
-                else:
-                    # Для пользователей, которые давно не брали карты
-                    days_passed = (today - last_date).days
-                    message = f"""
+    
+    # Для пользователей, которые давно не брали карты
+    days_passed = (today - last_date).days
+    return f"""
 {user_name}, Вы давно не брали карту дня! 🎴
 
 Прошло уже {days_passed} дней с вашей последней карты. 
@@ -2713,57 +2596,83 @@ async def send_reminders():
 
 Вернитесь к практике самопознания! 💫
 """
-                
-                # АСИНХРОННЫЙ вызов send_message
-                await bot.send_message(
-                    chat_id=user_id,
-                    text=message,
-                    parse_mode='Markdown'
-                )
-                
-                # Записываем факт отправки напоминания СЕГОДНЯ
-                cursor.execute('''
-                    INSERT INTO user_reminders (user_id, reminder_date, reminder_type)
-                    VALUES (%s, %s, 'card_reminder')
-                    ON CONFLICT (user_id, reminder_date, reminder_type) 
-                    DO NOTHING
-                ''', (user_id, today))
-                
-                reminded_count += 1
-                
-                # Небольшая пауза между сообщениями
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                # Если не удалось отправить (пользователь заблокировал бота и т.д.)
-                error_msg = str(e).lower()
-                
-                if 'forbidden' in error_msg or 'blocked' in error_msg or 'bot was blocked' in error_msg:
-                    # Пользователь заблокировал бота - записываем в логи
-                    logging.info(f"⚠️ User {user_id} blocked the bot")
-                    
-                    try:
-                        cursor.execute('''
-                            INSERT INTO user_action_logs (user_id, action, action_data)
-                            VALUES (%s, 'bot_blocked', %s)
-                        ''', (user_id, json.dumps({'date': today.isoformat()})))
-                    except:
-                        pass
-                    
-                    # Пропускаем этого пользователя в будущем
-                    cursor.execute('''
-                        INSERT INTO user_reminders (user_id, reminder_date, reminder_type)
-                        VALUES (%s, %s, 'bot_blocked')
-                        ON CONFLICT (user_id, reminder_date, reminder_type) 
-                        DO NOTHING
-                    ''', (user_id, today))
-                
-                else:
-                    logging.error(f"❌ Error sending reminder to user {user_id}: {e}")
-                continue
+
+async def send_reminders(bot=None, run_key=None):
+    """Отправляет напоминания пользователям, которые давно не брали карты.
+    
+    Пользователи читаются страницами по user_id, пачка отправляется параллельно
+    с ограничением скорости, результат пачки и прогресс сохраняются одной транзакцией.
+    Незавершенная рассылка с тем же run_key продолжается с последнего пользователя.
+    Одну рассылку одновременно ведет только одно задание (advisory lock по run_key)."""
+    run_key = run_key or f"card_reminder:{datetime.now().strftime('%Y-%m-%d:%H')}"
+    try:
+        lock = await async_db.try_lock_broadcast_run(run_key)
+    except Exception as e:
+        logging.error(f"❌ Error in send_reminders: {e}")
+        return
+    if lock is None:
+        logging.info(f"ℹ️ Reminders {run_key} are already being sent by another job")
+        return
+    
+    try:
+        await _send_reminders_run(bot, run_key)
+    finally:
+        await async_db.release_broadcast_run_lock(lock, run_key)
+
+async def _send_reminders_run(bot, run_key):
+    """Рассылка напоминаний run_key (вызывается под блокировкой рассылки)"""
+    try:
+        bot = bot or Bot(token=BOT_TOKEN)
         
-        conn.commit()
-        conn.close()
+        # Получаем текущую дату
+        today = date.today()
+        week_ago = today - timedelta(days=7)
+        
+        run = await async_db.start_broadcast_run(run_key)
+        if not run:
+            return
+        run_id, last_user_id, status = run
+        if status == 'finished':
+            logging.info(f"ℹ️ Reminders {run_key} already sent")
+            return
+        if last_user_id:
+            logging.info(f"🔄 Resuming reminders {run_key} after user {last_user_id}")
+        
+        broadcaster = Broadcaster(bot, global_rate=REMINDER_RATE_LIMIT)
+        
+        while True:
+            batch = await async_db.get_reminder_candidates_page(
+                week_ago, today, last_user_id, REMINDER_BATCH_SIZE
+            )
+            if not batch:
+                break
+            
+            messages = [
+                (user_id, build_reminder_message(first_name, username, last_date, today))
+                for user_id, first_name, username, last_date in batch
+            ]
+            results = await broadcaster.send_batch(messages, parse_mode='Markdown')
+            
+            sent = [user_id for user_id, result in results.items() if result == SENT]
+            blocked = [user_id for user_id, result in results.items() if result == BLOCKED]
+            failed_count = len(results) - len(sent) - len(blocked)
+            if blocked:
+                logging.info(f"⚠️ {len(blocked)} users blocked the bot")
+            
+            # Без сохраненного прогресса продолжение рассылки отправит пачку повторно
+            for attempt in range(3):
+                if await async_db.record_broadcast_batch(
+                    run_id, batch[-1][0], today, sent, blocked, failed_count
+                ):
+                    break
+                await asyncio.sleep(2 ** attempt)
+            else:
+                logging.error(f"❌ Reminders {run_key} stopped: progress after user {batch[-1][0]} was not saved")
+                return
+            last_user_id = batch[-1][0]
+        
+        totals = await async_db.finish_broadcast_run(run_id)
+        reminded_count, blocked_count, failed_count = totals or (0, 0, 0)
         
         # Отправляем отчет администратору (асинхронно)
         try:
@@ -2771,6 +2680,8 @@ async def send_reminders():
 📊 Отчет по напоминаниям
 
 ✅ Отправлено напоминаний: {reminded_count}
+🚫 Заблокировали бота: {blocked_count}
+❌ Ошибок отправки: {failed_count}
 ⏰ Время отправки: {datetime.now().strftime('%d.%m.%Y %H:%M')}
 📅 Дата: {today.strftime('%d.%m.%Y')}
 
@@ -2789,52 +2700,6 @@ async def send_reminders():
     except Exception as e:
         logging.error(f"❌ Error in send_reminders: {e}")
 
-def start_simple_reminders():
-    """Простой планировщик напоминаний без внешних зависимостей"""
-    import threading
-    import time
-    from datetime import datetime
-    
-    def reminder_loop():
-        while not shutdown_manager.shutdown_event.is_set():
-            try:
-                now = datetime.now()
-                
-                # Проверяем время (10:00 или 18:00)
-                if now.hour in [10, 18] and now.minute == 0:
-                    logging.info(f"⏰ Time for reminders: {now.hour}:00")
-                    
-                    # Запускаем асинхронную функцию в отдельном потоке
-                    import asyncio
-                    
-                    def run_async():
-                        try:
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            loop.run_until_complete(send_reminders())
-                            loop.close()
-                        except Exception as e:
-                            logging.error(f"❌ Error in async reminder: {e}")
-                    
-                    # Запускаем в отдельном потоке
-                    thread = threading.Thread(target=run_async, daemon=True)
-                    thread.start()
-                    
-                    # Ждем час, чтобы не отправлять повторно
-                    time.sleep(3600)
-                else:
-                    # Ждем минуту и проверяем снова
-                    time.sleep(60)
-                    
-            except Exception as e:
-                logging.error(f"❌ Error in reminder loop: {e}")
-                time.sleep(300)
-    
-    thread = threading.Thread(target=reminder_loop, daemon=True)
-    thread.start()
-    logging.info("✅ Simple reminder scheduler started")
-    return thread
-
 def main():
     """Основная функция запуска - ТОЛЬКО ОДИН ПРОЦЕСС"""
     # Регистрируем обработчики сигналов
@@ -2844,37 +2709,16 @@ def main():
     logger.info("🚀 Starting Metaphor Bot (SINGLE INSTANCE)...")
     
     try:
-        # Запускаем Flask в отдельном потоке
-        flask_thread = threading.Thread(target=run_flask_server, daemon=True)
-        flask_thread.start()
-        logger.info("✅ Flask server started in thread")
-        
-        # Даем Flask время на запуск
-        time.sleep(3)
-        
-        # Запускаем мониторинг платежей в отдельном потоке
-        payment_thread = threading.Thread(target=start_payment_monitoring, daemon=True)
-        payment_thread.start()
-        logger.info("✅ Payment monitoring started")
-        
-        # Запускаем самопинг в отдельном потоке
-        ping_thread = threading.Thread(target=ping_self, daemon=True)
-        ping_thread.start()
-        logger.info("✅ Self-ping started")
-        
-        # Запускаем очистку видео ссылок в отдельном потоке
-        cleanup_thread = threading.Thread(target=cleanup_video_links, daemon=True)
-        cleanup_thread.start()
-        logger.info("✅ Video links cleanup started")
-        
-        # Запускаем проверку истекших подписок
-        expired_check_thread = threading.Thread(target=check_expired_subscriptions_periodically, daemon=True)
-        expired_check_thread.start()
-        logger.info("✅ Expired subscriptions checker started")
-
-        # Запускаем планировщик напоминаний
-        reminder_thread = start_simple_reminders()
-        logger.info("✅ Reminder scheduler started")
+        # Обработчик очереди платежных событий (вебхуки только ставят события в очередь);
+        # очередь и буфер действий запускаются после миграций (on_application_start)
+        payment_queue.set_handler(dispatch_payment_event)
+        
+        # В режиме webhook Flask обслуживается тем же ASGI сервером, что и бот
+        if BOT_MODE != "webhook":
+            start_flask_thread()
+        
+        # Сверка платежей, самопинг, очистка ссылок, истекшие подписки и
+        # напоминания выполняются планировщиком внутри приложения бота (setup_scheduler)
 
         # Запускаем бота в ОСНОВНОМ потоке
         logger.info("✅ Starting bot in main thread...")
@@ -2883,6 +2727,10 @@ def main():
     except Exception as e:
         logger.error(f"💥 Error in main: {e}")
     finally:
+        payment_queue.stop()
+        action_log.stop()
+        async_db.shutdown()
+        db.close_pool()
         logger.info("🛑 Bot application stopped")
 
 if __name__ == '__main__':
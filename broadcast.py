@@ -0,0 +1,117 @@
+# broadcast.py - массовая рассылка сообщений с соблюдением лимитов Telegram
+
+import asyncio
+import logging
+import time
+
+from telegram.error import BadRequest, Forbidden, RetryAfter, TimedOut, NetworkError
+
+SENT = "sent"
+BLOCKED = "blocked"
+FAILED = "failed"
+
+
+class TokenBucket:
+    """Ограничитель скорости: не более rate операций в секунду (с запасом capacity)"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Приостанавливает выдачу токенов (после RetryAfter от Telegram)"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Broadcaster:
+    """Параллельная отправка сообщений.
+
+    - общий лимит global_rate сообщений в секунду (у Telegram ~30/с на бота)
+    - не чаще одного сообщения в per_chat_interval секунд в один чат
+    - при RetryAfter вся рассылка ждет указанное время и повторяет отправку
+    - при TimedOut сообщение считается отправленным: Telegram мог его уже доставить,
+      повтор дал бы пользователю дубль
+    """
+
+    def __init__(self, bot, global_rate: float = 25, per_chat_interval: float = 1.0,
+                 concurrency: int = 20, max_retries: int = 3):
+        self.bot = bot
+        self.bucket = TokenBucket(global_rate)
+        self.per_chat_interval = per_chat_interval
+        self.max_retries = max_retries
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._last_sent = {}  # chat_id -> время последней отправки
+
+    async def _wait_for_chat(self, chat_id):
+        last = self._last_sent.get(chat_id)
+        if last is not None:
+            delay = last + self.per_chat_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._last_sent[chat_id] = time.monotonic()
+
+    async def send(self, chat_id: int, text: str, **kwargs) -> str:
+        """Отправляет одно сообщение; возвращает SENT, BLOCKED или FAILED"""
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._wait_for_chat(chat_id)
+                await self.bucket.acquire()
+                try:
+                    await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                    return SENT
+                except RetryAfter as e:
+                    retry_after = e.retry_after
+                    if hasattr(retry_after, 'total_seconds'):
+                        retry_after = retry_after.total_seconds()
+                    logging.warning(f"⚠️ Flood control: retry after {retry_after}s")
+                    self.bucket.pause(retry_after)
+                except Forbidden:
+                    return BLOCKED
+                except BadRequest as e:
+                    if 'chat not found' in str(e).lower():
+                        return BLOCKED
+                    logging.error(f"❌ Error sending message to {chat_id}: {e}")
+                    return FAILED
+                except TimedOut as e:
+                    # Запрос ушел, ответ не получен - не повторяем
+                    logging.warning(f"⚠️ Timed out sending to {chat_id}, not retrying: {e}")
+                    return SENT
+                except NetworkError as e:
+                    # Запрос не дошел до Telegram - повтор безопасен
+                    logging.warning(f"⚠️ Network error sending to {chat_id} (attempt {attempt + 1}): {e}")
+                    await asyncio.sleep(2 ** attempt)
+                except Exception as e:
+                    logging.error(f"❌ Error sending message to {chat_id}: {e}")
+                    return FAILED
+            return FAILED
+
+    async def send_batch(self, messages, **kwargs) -> dict:
+        """Отправляет пачку [(chat_id, text)] параллельно; возвращает {chat_id: результат}"""
+        chat_ids = [chat_id for chat_id, _ in messages]
+        results = await asyncio.gather(
+            *(self.send(chat_id, text, **kwargs) for chat_id, text in messages)
+        )
+        # Старые отметки больше не ограничивают отправку - не держим их в памяти
+        expired = time.monotonic() - self.per_chat_interval
+        self._last_sent = {chat_id: sent for chat_id, sent in self._last_sent.items() if sent > expired}
+        return dict(zip(chat_ids, results))
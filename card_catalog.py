@@ -0,0 +1,96 @@
+# card_catalog.py - колода карт в памяти процесса
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+
+RESTRICTION = "restriction"  # карты-ограничения (1-88)
+OPPORTUNITY = "opportunity"  # карты-возможности (89-176)
+
+# Данные колоды (тексты посланий) - читаются только когда нужны
+CARDS_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cards.json")
+CARDS_DATA_VERSION = 1
+
+
+def load_cards_data(path: str = CARDS_DATA_PATH):
+    """Читает колоду из файла: [(card_id, card_name, image_url, description_text)].
+
+    Результат не кэшируется - файл нужен только при синхронизации карт
+    и когда таблица cards недоступна.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != CARDS_DATA_VERSION:
+        raise ValueError(f"Unsupported cards data version: {data.get('version')}")
+    return [tuple(card) for card in data["cards"]]
+
+
+def cards_data_hash(path: str = CARDS_DATA_PATH) -> str:
+    """Хэш содержимого файла колоды (для пропуска синхронизации без изменений)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_card_category(card_id: int) -> str:
+    """Определяет категорию карты по её номеру"""
+    return RESTRICTION if 1 <= card_id <= 88 else OPPORTUNITY
+
+
+class CardCatalog:
+    """Колода карт, загруженная один раз и проиндексированная по card_id и категории.
+
+    Карты хранятся в том же виде, что и строки таблицы cards:
+    (card_id, card_name, image_url, description_text).
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = threading.Lock()
+        # (все карты, индекс по card_id, индекс по категории) - заменяется целиком
+        self._state = None
+
+    def _get_state(self):
+        state = self._state
+        if state is None:
+            with self._lock:
+                if self._state is None:
+                    cards = [tuple(card) for card in self._loader()]
+                    by_category = {RESTRICTION: [], OPPORTUNITY: []}
+                    for card in cards:
+                        by_category[get_card_category(card[0])].append(card)
+                    self._state = (cards, {card[0]: card for card in cards}, by_category)
+                    logging.info(f"✅ Card catalog loaded: {len(cards)} cards")
+                state = self._state
+        return state
+
+    def load(self):
+        """Загружает колоду (повторно - только после invalidate)"""
+        self._get_state()
+
+    def invalidate(self):
+        """Сбрасывает колоду, чтобы при следующем обращении она загрузилась заново"""
+        with self._lock:
+            self._state = None
+        logging.info("🔄 Card catalog invalidated")
+
+    def get(self, card_id: int):
+        """Возвращает карту по номеру"""
+        return self._get_state()[1].get(card_id)
+
+    def random_card(self, category=None):
+        """Случайная карта из всей колоды или из категории"""
+        cards, _, by_category = self._get_state()
+        if category is not None:
+            cards = by_category.get(category, [])
+        if not cards:
+            return None
+        return random.choice(cards)
+
+    def __len__(self):
+        return len(self._get_state()[0])
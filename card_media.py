@@ -0,0 +1,137 @@
+# card_media.py - file_id картинок карт в Telegram (без повторной загрузки с ibb.co)
+
+import asyncio
+import logging
+import threading
+
+from telegram.error import BadRequest
+
+from database import db, async_db
+
+
+class CardMediaCache:
+    """Кэш file_id картинок карт.
+
+    Первый раз картинка отправляется по URL, Telegram скачивает ее сам и
+    возвращает file_id. Он сохраняется в таблице card_media (ключ - image_url,
+    поэтому новая картинка у карты получит новый file_id), и дальше карта
+    отправляется по file_id - без обращения Telegram к внешнему хосту.
+    Telegram может вернуть для того же файла другой file_id, поэтому файл
+    сравнивается по file_unique_id.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        # image_url -> (file_id, file_unique_id), загружается при первом обращении
+        self._file_ids = None
+        self._lock = threading.Lock()
+
+    def _get_file_ids(self):
+        if self._file_ids is None:
+            with self._lock:
+                if self._file_ids is None:
+                    self._file_ids = self.db.get_card_media()
+                    logging.info(f"✅ Card media cache loaded: {len(self._file_ids)} file_ids")
+        return self._file_ids
+
+    def load(self):
+        """Загружает известные file_id (при запуске, чтобы не ждать в обработчике)"""
+        try:
+            self._get_file_ids()
+        except Exception as e:
+            logging.error(f"❌ Error loading card media cache: {e}")
+
+    def get_photo(self, image_url: str):
+        """Возвращает file_id картинки, если он известен, иначе сам URL"""
+        try:
+            cached = self._get_file_ids().get(image_url)
+            return cached[0] if cached else image_url
+        except Exception as e:
+            logging.error(f"❌ Error loading card media cache: {e}")
+            return image_url
+
+    async def remember(self, image_url: str, message):
+        """Запоминает file_id из отправленного сообщения с фото"""
+        if not message or not message.photo:
+            return
+        photo = message.photo[-1]  # самый большой размер
+        try:
+            file_ids = self._get_file_ids()
+            cached = file_ids.get(image_url)
+            if cached and cached[1] == photo.file_unique_id:
+                return
+            file_ids[image_url] = (photo.file_id, photo.file_unique_id)
+            await async_db.save_card_media(image_url, photo.file_id, photo.file_unique_id)
+        except Exception as e:
+            logging.error(f"❌ Error saving card media for {image_url}: {e}")
+
+    def forget(self, image_url: str):
+        if self._file_ids is not None:
+            self._file_ids.pop(image_url, None)
+
+    async def reply_photo(self, message, image_url: str, **kwargs):
+        """message.reply_photo по file_id (если известен) с запоминанием нового file_id"""
+        photo = self.get_photo(image_url)
+        try:
+            sent = await message.reply_photo(photo=photo, **kwargs)
+        except BadRequest as e:
+            if photo == image_url:
+                raise
+            # file_id стал недействительным - отправляем по URL и запоминаем заново
+            logging.warning(f"⚠️ Cached file_id rejected for {image_url}: {e}")
+            self.forget(image_url)
+            sent = await message.reply_photo(photo=image_url, **kwargs)
+        await self.remember(image_url, sent)
+        return sent
+
+    async def reply_media_group(self, message, items, **kwargs):
+        """Альбом из [(image_url, caption)] с file_id вместо URL, где они известны"""
+        from telegram import InputMediaPhoto
+
+        photos = [self.get_photo(url) for url, _ in items]
+        media = [InputMediaPhoto(media=photo, caption=caption) for photo, (_, caption) in zip(photos, items)]
+        try:
+            sent = await message.reply_media_group(media=media, **kwargs)
+        except BadRequest as e:
+            if all(photo == url for photo, (url, _) in zip(photos, items)):
+                raise
+            # Какой file_id недействителен, Telegram не сообщает - весь альбом по URL
+            logging.warning(f"⚠️ Cached file_id rejected in media group: {e}")
+            for url, _ in items:
+                self.forget(url)
+            media = [InputMediaPhoto(media=url, caption=caption) for url, caption in items]
+            sent = await message.reply_media_group(media=media, **kwargs)
+        for (image_url, _), sent_message in zip(items, sent):
+            await self.remember(image_url, sent_message)
+        return sent
+
+    async def warm_up(self, bot, chat_id: int, delay: float = 1.0):
+        """Загружает в Telegram картинки всех карт, для которых еще нет file_id.
+
+        Каждая картинка отправляется в chat_id (администратору) и сразу удаляется.
+        Возвращает (загружено, ошибок).
+        """
+        file_ids = self._get_file_ids()
+        image_urls = []
+        for card in await async_db.get_cards_data():
+            if card[2] not in file_ids and card[2] not in image_urls:
+                image_urls.append(card[2])
+
+        uploaded, failed = 0, 0
+        for image_url in image_urls:
+            try:
+                sent = await bot.send_photo(chat_id=chat_id, photo=image_url, disable_notification=True)
+                await self.remember(image_url, sent)
+                await sent.delete()
+                uploaded += 1
+            except Exception as e:
+                failed += 1
+                logging.error(f"❌ Error uploading card image {image_url}: {e}")
+            await asyncio.sleep(delay)
+
+        logging.info(f"✅ Card media warm-up: {uploaded} uploaded, {failed} failed")
+        return uploaded, failed
+
+
+# Глобальный экземпляр
+card_media = CardMediaCache(db)
@@ -12,6 +12,64 @@ DAILY_CARD_LIMIT_FREE = 1
 DAILY_CARD_LIMIT_PREMIUM = 5
 BASE_URL = os.environ.get('RENDER_EXTERNAL_URL', 'https://metaphor-bot.onrender.com')
 
+# Режим получения обновлений: "polling" или "webhook" (один ASGI сервер для бота и Flask)
+BOT_MODE = os.environ.get("BOT_MODE", "polling").lower()
+PORT = int(os.environ.get("PORT", "10000"))
+TELEGRAM_WEBHOOK_PATH = os.environ.get("TELEGRAM_WEBHOOK_PATH", "/telegram")
+TELEGRAM_WEBHOOK_SECRET = os.environ.get("TELEGRAM_WEBHOOK_SECRET", "")
+
+# HTTP сервер для маршрутов Flask (waitress в режиме polling, uvicorn в режиме webhook)
+WEB_THREADS = int(os.environ.get("WEB_THREADS", "8"))  # потоков для обработки запросов
+WEB_CONNECTION_LIMIT = int(os.environ.get("WEB_CONNECTION_LIMIT", "100"))  # одновременных соединений
+WEB_CHANNEL_TIMEOUT = int(os.environ.get("WEB_CHANNEL_TIMEOUT", "30"))  # секунд бездействия до закрытия соединения
+WEB_KEEPALIVE_TIMEOUT = int(os.environ.get("WEB_KEEPALIVE_TIMEOUT", "5"))  # секунд keep-alive
+
+# Пул соединений с PostgreSQL (общий для бота, Flask и фоновых потоков)
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))  # секунд ожидания свободного соединения
+DB_POOL_MAX_LIFETIME = int(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))  # пересоздавать соединения старше N секунд
+DB_POOL_HEALTHCHECK_IDLE = int(os.environ.get("DB_POOL_HEALTHCHECK_IDLE", "30"))  # проверять SELECT 1 после N секунд простоя
+
+# Кэш прав пользователя (подписка, карты и послания за сегодня)
+ENTITLEMENT_CACHE_TTL = int(os.environ.get("ENTITLEMENT_CACHE_TTL", "300"))  # секунд
+ENTITLEMENT_CACHE_MAX_SIZE = int(os.environ.get("ENTITLEMENT_CACHE_MAX_SIZE", "10000"))  # пользователей в памяти
+
+# Кэш видео ссылок для страницы /secure-video
+VIDEO_LINK_CACHE_TTL = int(os.environ.get("VIDEO_LINK_CACHE_TTL", "60"))  # секунд
+VIDEO_LINK_CACHE_SIZE = int(os.environ.get("VIDEO_LINK_CACHE_SIZE", "5000"))  # ссылок в памяти
+
+# Загружать картинки всех карт в Telegram после запуска (file_id вместо ссылок ibb.co)
+CARD_MEDIA_WARMUP = os.environ.get("CARD_MEDIA_WARMUP", "false").lower() == "true"
+
+# Время рассылки напоминаний (часы по времени сервера)
+REMINDER_HOURS = [int(hour) for hour in os.environ.get("REMINDER_HOURS", "10,18").split(",")]
+REMINDER_BATCH_SIZE = int(os.environ.get("REMINDER_BATCH_SIZE", "500"))  # пользователей за одну пачку
+REMINDER_RATE_LIMIT = float(os.environ.get("REMINDER_RATE_LIMIT", "25"))  # сообщений в секунду (лимит Telegram ~30)
+
+# HTTP клиент для ЮKassa, PayPal и Telegram API (общие keep-alive соединения)
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))  # секунд на установку соединения
+HTTP_READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "15"))  # секунд ожидания ответа
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "10"))  # соединений на хост
+HTTP_RETRIES = int(os.environ.get("HTTP_RETRIES", "3"))  # повторов идемпотентных запросов
+
+# Сверка платежей на случай пропущенных вебхуков (основная активация - очередь payment_events)
+PAYMENT_RECONCILE_INTERVAL = int(os.environ.get("PAYMENT_RECONCILE_INTERVAL", "600"))  # секунд
+
+# Пересчет статистики для /stats и /users (материализованные представления)
+ADMIN_STATS_REFRESH_INTERVAL = int(os.environ.get("ADMIN_STATS_REFRESH_INTERVAL", "600"))  # секунд
+
+# Помесячные секции таблиц истории (user_cards, user_messages, user_action_logs, user_reminders, user_meditations)
+HISTORY_PARTITIONS_AHEAD = int(os.environ.get("HISTORY_PARTITIONS_AHEAD", "3"))  # месяцев вперед
+HISTORY_RETENTION_MONTHS = int(os.environ.get("HISTORY_RETENTION_MONTHS", "0"))  # 0 - хранить всю историю
+HISTORY_RETENTION_ACTION = os.environ.get("HISTORY_RETENTION_ACTION", "detach")  # "detach" (в схему history_archive) или "drop"
+
+# Буфер записи действий пользователей (user_action_logs, user_actions)
+ACTION_LOG_MAX_QUEUE = int(os.environ.get("ACTION_LOG_MAX_QUEUE", "10000"))  # записей в памяти
+ACTION_LOG_BATCH_SIZE = int(os.environ.get("ACTION_LOG_BATCH_SIZE", "500"))  # записей в одной вставке
+ACTION_LOG_FLUSH_MS = int(os.environ.get("ACTION_LOG_FLUSH_MS", "1000"))  # период записи, мс
+ACTION_LOG_OVERFLOW = os.environ.get("ACTION_LOG_OVERFLOW", "drop_oldest")  # "drop_oldest" или "drop_new"
+
 # Настройки ЮKassa
 YOOKASSA_SHOP_ID = os.environ.get("YOOKASSA_SHOP_ID", "")
 YOOKASSA_SECRET_KEY = os.environ.get("YOOKASSA_SECRET_KEY", "")
@@ -20,6 +78,9 @@ YOOKASSA_SECRET_KEY = os.environ.get("YOOKASSA_SECRET_KEY", "")
 PAYPAL_CLIENT_ID = os.environ.get("PAYPAL_CLIENT_ID", "")
 PAYPAL_CLIENT_SECRET = os.environ.get("PAYPAL_CLIENT_SECRET", "")
 PAYPAL_WEBHOOK_ID = os.environ.get("PAYPAL_WEBHOOK_ID", "")
+# Проверка подписи вебхуков: "local" (сертификат PayPal, API - запасной вариант) или "remote" (только API)
+PAYPAL_WEBHOOK_VERIFICATION = os.environ.get("PAYPAL_WEBHOOK_VERIFICATION", "local").lower()
+PAYPAL_CERT_CACHE_TTL = int(os.environ.get("PAYPAL_CERT_CACHE_TTL", "86400"))  # секунд
 
 # Ссылки для оплаты
 PAYMENT_LINKS = {
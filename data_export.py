@@ -0,0 +1,152 @@
+# data_export.py - потоковый экспорт таблиц в CSV (gzip) для администратора
+
+import csv
+import gzip
+import io
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+
+# Таблица -> колонка даты для фильтра по периоду
+EXPORT_TABLES = {
+    "users": "registered_date",
+    "user_cards": "drawn_date",
+    "user_messages": "drawn_date",
+    "payments": "created_at",
+    "subscriptions": "start_date",
+    "user_action_logs": "created_at",
+}
+
+# Лимит Telegram на отправку файла ботом - 50 МБ, оставляем запас на неполный блок gzip
+MAX_PART_SIZE = 45 * 1024 * 1024
+
+
+class _GzipCsvParts:
+    """Пишет строки CSV в gzip-файлы во временном каталоге, начиная новую часть
+    (с заголовком) при достижении max_part_size сжатых байт"""
+
+    def __init__(self, directory, name, header, max_part_size=MAX_PART_SIZE):
+        self.directory = directory
+        self.name = name
+        self.header = header
+        self.max_part_size = max_part_size
+        self.paths = []
+        self.rows = 0
+        self._raw = None
+        self._text = None
+        self._writer = None
+
+    def _open_part(self):
+        self.close()
+        path = os.path.join(self.directory, f"{self.name}_part{len(self.paths) + 1}.csv.gz")
+        self._raw = open(path, "wb")
+        self._text = io.TextIOWrapper(gzip.GzipFile(fileobj=self._raw, mode="wb"), encoding="utf-8", newline="")
+        self._writer = csv.writer(self._text)
+        self._writer.writerow(self.header)
+        self.paths.append(path)
+
+    def writerow(self, row):
+        # Размер сжатых данных известен только после сброса блоков - лимит приблизительный
+        if self._writer is None or self._raw.tell() >= self.max_part_size:
+            self._open_part()
+        self._writer.writerow(row)
+        self.rows += 1
+
+    def close(self):
+        if self._text is not None:
+            self._text.close()
+            self._raw.close()
+            self._text = self._raw = self._writer = None
+
+
+def export_table(db, table: str, directory: str, date_from=None, date_to=None,
+                 batch_size: int = 2000, max_part_size: int = MAX_PART_SIZE):
+    """Выгружает таблицу серверным курсором в gzip CSV (память не зависит от размера таблицы).
+
+    Период - с date_from по date_to включительно.
+    Возвращает (список файлов, количество строк).
+    """
+    date_column = EXPORT_TABLES[table]
+    conditions, params = [], []
+    if date_from:
+        conditions.append(f"{date_column} >= %s")
+        params.append(date_from)
+    if date_to:
+        # date_to включительно: колонки бывают и датами, и временем
+        conditions.append(f"{date_column} < %s")
+        params.append(date_to + timedelta(days=1))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    conn = db.get_connection()
+    try:
+        # Именованный курсор читает строки с сервера порциями по batch_size
+        cursor = conn.cursor(name=f"export_{table}")
+        cursor.itersize = batch_size
+        cursor.execute(f"SELECT * FROM {table} {where} ORDER BY {date_column}", params)
+
+        parts = None
+        try:
+            for row in cursor:
+                if parts is None:
+                    header = [column[0] for column in cursor.description]
+                    parts = _GzipCsvParts(directory, table, header, max_part_size)
+                parts.writerow(row)
+        finally:
+            if parts is not None:
+                parts.close()
+        cursor.close()
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if parts is None:
+        return [], 0
+    logging.info(f"✅ Exported {parts.rows} rows from {table} into {len(parts.paths)} file(s)")
+    return parts.paths, parts.rows
+
+
+def export_tables(db, tables, date_from=None, date_to=None):
+    """Выгружает несколько таблиц в новый временный каталог.
+
+    Возвращает (каталог, [(таблица, файлы, строк)]); после успешной выгрузки каталог
+    удаляет вызывающий код, при ошибке он удаляется здесь.
+    """
+    directory = tempfile.mkdtemp(prefix="export_")
+    completed = False
+    try:
+        results = []
+        for table in tables:
+            paths, rows = export_table(db, table, directory, date_from, date_to)
+            results.append((table, paths, rows))
+        completed = True
+        return directory, results
+    finally:
+        if not completed:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def parse_export_args(args):
+    """Разбирает аргументы /export: [таблица|all] [с YYYY-MM-DD] [по YYYY-MM-DD] (по - включительно).
+
+    Возвращает (таблицы, date_from, date_to); ValueError при неверных аргументах.
+    """
+    args = list(args or [])
+    tables = ["users"]
+    if args and not args[0][:1].isdigit():
+        name = args.pop(0).lower()
+        if name == "all":
+            tables = list(EXPORT_TABLES)
+        elif name in EXPORT_TABLES:
+            tables = [name]
+        else:
+            raise ValueError(f"Неизвестная таблица: {name}")
+
+    dates = [datetime.strptime(arg, "%Y-%m-%d") for arg in args[:2]]
+    date_from = dates[0] if len(dates) > 0 else None
+    date_to = dates[1] if len(dates) > 1 else None
+    return tables, date_from, date_to
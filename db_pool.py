@@ -0,0 +1,249 @@
+# db_pool.py - пул соединений с PostgreSQL
+
+import logging
+import threading
+import time
+from collections import deque
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.pool import PoolError
+
+
+class PoolTimeout(PoolError):
+    """Не удалось получить соединение из пула за отведённое время"""
+
+
+class PooledConnection:
+    """Обёртка над соединением psycopg2, которая при close() возвращает его в пул.
+
+    Все остальные атрибуты (cursor, commit, rollback, autocommit...) проксируются
+    на настоящее соединение, поэтому существующий код вида
+    conn = db.get_connection() ... conn.close() работает без изменений.
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._conn = raw_conn
+
+    def __getattr__(self, name):
+        conn = self.__dict__.get('_conn')
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already closed")
+        return getattr(conn, name)
+
+    @property
+    def closed(self):
+        conn = self._conn
+        return 1 if conn is None else conn.closed
+
+    def close(self):
+        """Возвращает соединение в пул (повторный вызов безопасен)"""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Семантика как у psycopg2: commit при успехе, rollback при ошибке
+        if self._conn is not None:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        return False
+
+    def __del__(self):
+        # Страховка от утечек, если кто-то забыл вызвать close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Ограниченный потокобезопасный пул соединений.
+
+    - проверка соединения при выдаче (если оно простаивало дольше healthcheck_idle)
+    - пересоздание соединений старше max_lifetime
+    - метрики использования (get_stats)
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=10.0,
+                 max_lifetime=1800, healthcheck_idle=30):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.healthcheck_idle = healthcheck_idle
+
+        self._lock = threading.Condition()
+        self._idle = deque()      # (conn, created_at, last_used_at)
+        self._created_at = {}     # id(conn) -> время создания
+        self._in_use = 0
+        self._closed = False
+
+        self._stats = {
+            'checkouts': 0,
+            'created': 0,
+            'reused': 0,
+            'recycled': 0,
+            'healthcheck_failures': 0,
+            'discarded': 0,
+            'timeouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def _open(self):
+        conn = self._connect()
+        self._created_at[id(conn)] = time.monotonic()
+        with self._lock:
+            self._stats['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, conn):
+        created = self._created_at.get(id(conn), 0)
+        return self.max_lifetime and time.monotonic() - created > self.max_lifetime
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck_idle:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def getconn(self):
+        """Выдаёт соединение из пула, при необходимости создавая новое"""
+        started = time.monotonic()
+        deadline = started + self.timeout
+
+        while True:
+            candidate = None
+            with self._lock:
+                if self._closed:
+                    raise PoolError("connection pool is closed")
+
+                while not self._idle and self._in_use >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"Timed out waiting for a database connection ({self.max_size} in use)"
+                        )
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                self._in_use += 1
+                waited = time.monotonic() - started
+                self._stats['checkouts'] += 1
+                self._stats['wait_time_total'] += waited
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], waited)
+
+            try:
+                if candidate is None:
+                    return self._open()
+
+                conn, last_used = candidate
+                if self._is_expired(conn):
+                    with self._lock:
+                        self._stats['recycled'] += 1
+                    self._discard(conn)
+                    return self._open()
+
+                if not self._is_healthy(conn, last_used):
+                    logging.warning("⚠️ Pooled database connection failed health check, reconnecting")
+                    with self._lock:
+                        self._stats['healthcheck_failures'] += 1
+                    self._discard(conn)
+                    return self._open()
+
+                with self._lock:
+                    self._stats['reused'] += 1
+                return conn
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                    self._lock.notify()
+                raise
+
+    def release(self, conn):
+        """Возвращает соединение в пул"""
+        reusable = not conn.closed and not self._closed
+        if reusable:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+            except Exception:
+                reusable = False
+
+        if reusable and self._is_expired(conn):
+            reusable = False
+            with self._lock:
+                self._stats['recycled'] += 1
+
+        if not reusable:
+            with self._lock:
+                self._stats['discarded'] += 1
+            self._discard(conn)
+
+        with self._lock:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+
+    def connection(self):
+        """Соединение-обёртка, которое возвращается в пул при close()"""
+        return PooledConnection(self, self.getconn())
+
+    def warm_up(self):
+        """Заранее открывает min_size соединений"""
+        opened = []
+        try:
+            for _ in range(max(0, self.min_size - len(self._idle))):
+                opened.append(self.getconn())
+        finally:
+            for conn in opened:
+                self.release(conn)
+
+    def close_all(self):
+        """Закрывает все простаивающие соединения и запрещает выдачу новых"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def get_stats(self):
+        """Возвращает метрики пула"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_use'] = self._in_use
+            stats['idle'] = len(self._idle)
+            stats['max_size'] = self.max_size
+        checkouts = stats['checkouts'] or 1
+        stats['wait_time_avg'] = stats['wait_time_total'] / checkouts
+        return stats
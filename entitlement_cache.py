@@ -0,0 +1,116 @@
+# entitlement_cache.py - кэш прав пользователя (подписка и дневные лимиты)
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+
+def parse_premium_until(value):
+    """Приводит premium_until к datetime (в старых записях встречаются строки)"""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.max.time())
+    if isinstance(value, str):
+        for fmt, length in (('%Y-%m-%d %H:%M:%S', 19), ('%Y-%m-%d', 10)):
+            try:
+                return datetime.strptime(value[:length], fmt)
+            except ValueError:
+                continue
+    return None
+
+
+class Entitlement:
+    """Права пользователя на конкретный день"""
+
+    __slots__ = ('is_premium', 'premium_until', 'daily_cards_limit', 'last_daily_card_date',
+                 'cards_today', 'messages_today', 'messages_total', 'day')
+
+    def __init__(self, is_premium, premium_until, daily_cards_limit, last_daily_card_date,
+                 cards_today, messages_today, messages_total, day):
+        self.is_premium = bool(is_premium)
+        self.premium_until = parse_premium_until(premium_until)
+        self.daily_cards_limit = daily_cards_limit or 1
+        self.last_daily_card_date = last_daily_card_date
+        self.cards_today = cards_today
+        self.messages_today = messages_today
+        self.messages_total = messages_total
+        self.day = day
+
+    def has_active_subscription(self) -> bool:
+        """Подписка действует до конца дня premium_until включительно"""
+        return bool(self.is_premium and self.premium_until
+                    and self.premium_until.date() >= date.today())
+
+    def is_expired(self) -> bool:
+        """Подписка помечена активной, но срок уже прошёл - нужно обновить базу"""
+        return bool(self.is_premium and self.premium_until
+                    and self.premium_until < datetime.now())
+
+
+class EntitlementCache:
+    """Потокобезопасный кэш Entitlement по user_id.
+
+    Запись живёт ttl секунд и не переживает смену дня; при изменении подписки
+    или лимитов её нужно сбросить через invalidate()/clear(). Записей не больше
+    max_size: при переполнении вытесняется та, к которой дольше всех не обращались.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (expires_at, Entitlement), от старых обращений к новым
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, entitlement = entry
+                if expires_at > time.monotonic() and entitlement.day == date.today():
+                    self._entries.move_to_end(user_id)
+                    self._hits += 1
+                    return entitlement
+                del self._entries[user_id]
+            self._misses += 1
+            return None
+
+    def put(self, user_id: int, entitlement: Entitlement, ttl: float):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, entitlement)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def record_card(self, user_id: int, day: date):
+        """Учитывает выданную карту, не перечитывая базу"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1].day == day:
+                entry[1].cards_today += 1
+                entry[1].last_daily_card_date = day
+
+    def record_message(self, user_id: int, day: date):
+        """Учитывает выданное послание, не перечитывая базу"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1].day == day:
+                entry[1].messages_today += 1
+                entry[1].messages_total += 1
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self._hits,
+                    'misses': self._misses, 'evictions': self._evictions}
@@ -1,17 +1,16 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackQueryHandler
-from database import db 
+from database import db, async_db
+from card_media import card_media
+from action_log import action_log
 from config import ADMIN_IDS
 import logging
 import keyboard
-import csv
-import io
 from datetime import datetime, date
 from yookassa_payment import payment_processor
 from config import PAYMENT_LINKS, SUBSCRIPTION_PRICES, SUBSCRIPTION_NAMES, PAYPAL_PRICES, PAYPAL_LINKS
 import uuid
-import json
-from bot import send_admin_notification_successful, send_admin_notification_failed, notify_admin_about_unknown_payment_sync, send_reminders, start_simple_reminders
+from bot import admin_payment_successful_text, admin_payment_failed_text, admin_unknown_payment_text, send_reminders
 
 recent_payments = {}
 
@@ -38,7 +37,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
                  f"Username=@{user.username}, LastName={user.last_name}")
     
     # Регистрируем пользователя с обработкой None значений
-    db.get_or_create_user(
+    await async_db.get_or_create_user(
         user_id=user.id,
         username=user.username or "",  # Если username None - используем пустую строку
         first_name=user.first_name or "",  # Если first_name None
@@ -158,7 +157,7 @@ async def daily_card(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработчик команды /daily с новой структурой"""
     user = update.effective_user
     
-    can_take, reason = db.can_take_daily_card(user.id)
+    can_take, reason = await async_db.can_take_daily_card(user.id)
     
     if not can_take:
         await update.message.reply_text(f"❌ {reason}")
@@ -547,7 +546,7 @@ async def show_daily_intro_from_button(query, context: ContextTypes.DEFAULT_TYPE
     user = query.from_user
     
     # ✅ Проверяем лимит СРАЗУ при нажатии "Карта дня" в меню
-    can_take, reason = db.can_take_daily_card(user.id)
+    can_take, reason = await async_db.can_take_daily_card(user.id)
     if not can_take:
         await query.message.reply_text(f"❌ {reason}")
         return
@@ -614,11 +613,11 @@ async def show_daily_message(query, context: ContextTypes.DEFAULT_TYPE):
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Проверяем лимит посланий
-    can_take, reason = db.can_take_daily_message(user.id)
+    can_take, reason = await async_db.can_take_daily_message(user.id)
     
     if not can_take:
         # Показываем статистику и информацию о лимитах
-        stats = db.get_user_message_stats(user.id)
+        stats = await async_db.get_user_message_stats(user.id)
         if stats:
             if stats['has_subscription']:
                 limit_text = f"❌ {reason}\n\n📊 Сегодня: {stats['today_count']}/5 посланий"
@@ -641,7 +640,7 @@ async def show_daily_message(query, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # ✅ ПОЛУЧАЕМ ОПИСАНИЕ ПОСЛЕДНЕЙ КАРТЫ ПОЛЬЗОВАТЕЛЯ
-    card_description = db.get_last_user_card_description(user.id)
+    card_description = await async_db.get_last_user_card_description(user.id)
     
     if not card_description:
         await query.message.reply_text(
@@ -652,20 +651,10 @@ async def show_daily_message(query, context: ContextTypes.DEFAULT_TYPE):
     
     # ✅ ЗАПИСЫВАЕМ ФАКТ ПОЛУЧЕНИЯ ПОСЛАНИЯ
     # Используем ID последней карты как message_id
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT card_id FROM user_cards 
-        WHERE user_id = %s 
-        ORDER BY drawn_date DESC 
-        LIMIT 1
-    ''', (user.id,))
-    last_card_result = cursor.fetchone()
-    conn.close()
-    
-    if last_card_result:
-        last_card_id = last_card_result[0]
-        success = db.record_user_message(user.id, last_card_id)
+    last_card_id = await async_db.get_last_user_card_id(user.id)
+    
+    if last_card_id:
+        success = await async_db.record_user_message(user.id, last_card_id)
         if not success:
             logging.error(f"❌ Failed to record message for user {user.id}")
     
@@ -680,7 +669,7 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработчик команды /profile"""
     user = update.effective_user
     
-    stats = db.get_user_stats(user.id)
+    stats = await async_db.get_user_stats(user.id)
     
     if not stats:
         await update.message.reply_text("❌ Не удалось загрузить статистику")
@@ -688,7 +677,7 @@ async def profile(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     limit, is_premium, total_cards, reg_date, subscription_end = stats
     
-    subscription = db.get_user_subscription(user.id)
+    subscription = await async_db.get_user_subscription(user.id)
     has_resources_access = subscription and subscription[1] and subscription[1].date() >= date.today()
 
     # Формируем текст о подписке
@@ -716,7 +705,7 @@ async def show_profile_from_button(query, context: ContextTypes.DEFAULT_TYPE):
     """Показывает профиль из кнопки меню"""
     user = query.from_user
     
-    stats = db.get_user_stats(user.id)
+    stats = await async_db.get_user_stats(user.id)
     
     if not stats:
         await query.message.reply_text("❌ Не удалось загрузить статистику")
@@ -724,7 +713,7 @@ async def show_profile_from_button(query, context: ContextTypes.DEFAULT_TYPE):
     
     limit, is_premium, total_cards, reg_date, subscription_end = stats
     
-    subscription = db.get_user_subscription(user.id)
+    subscription = await async_db.get_user_subscription(user.id)
     has_resources_access = subscription and subscription[1] and subscription[1].date() >= date.today()
     
     # Формируем текст о подписке
@@ -804,9 +793,9 @@ async def show_daily_card(query, context: ContextTypes.DEFAULT_TYPE):
     """Показывает карту дня с текстом ограничения/возможности в одном сообщении"""
     user = query.from_user
     
-    # ✅ Дополнительная проверка лимита
-    can_take, reason = db.can_take_daily_card(user.id)
-    if not can_take:
+    # ✅ Проверка лимита, выбор карты и запись в историю - одной транзакцией
+    card, remaining, reason = await async_db.draw_daily_card(user.id)
+    if not card:
         await query.message.reply_text(f"❌ {reason}")
         return
     
@@ -815,12 +804,6 @@ async def show_daily_card(query, context: ContextTypes.DEFAULT_TYPE):
     loading_message = await query.message.reply_text("🔄 Загружаем вашу карту дня...")
     
     try:
-        # Получаем случайную карту
-        card = db.get_random_card()
-        if not card:
-            await loading_message.edit_text("⚠️ Ошибка при получении карты.")
-            return
-        
         card_id, card_name, image_url, description = card
         
         # Сохраняем карту в контексте для вопросов
@@ -831,9 +814,6 @@ async def show_daily_card(query, context: ContextTypes.DEFAULT_TYPE):
             'description': description
         }
         
-        # Записываем карту пользователю
-        db.record_user_card(user.id, card_id)
-        
         # ✅ Определяем тип карты (Ограничение или Возможность)
         card_type = "Ограничение" if 1 <= card_id <= 88 else "Возможность"
         
@@ -870,8 +850,8 @@ async def show_daily_card(query, context: ContextTypes.DEFAULT_TYPE):
             # ✅ Отправляем карту с текстом и кнопками в одном сообщении
             caption = f"{card_text}"
             
-            await query.message.reply_photo(
-                photo=image_url,
+            await card_media.reply_photo(
+                query.message, image_url,
                 caption=caption,
                 reply_markup=keyboard.get_card_display_keyboard(),
                 parse_mode='Markdown'
@@ -926,56 +906,10 @@ async def reset_my_limit(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        from datetime import date
-        import logging
-        
         logging.info(f"🔄 Resetme command by admin {user.id}")
         
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # ✅ ПРОВЕРЯЕМ СТРУКТУРУ ТАБЛИЦЫ
-        cursor.execute("""
-            SELECT column_name, data_type 
-            FROM information_schema.columns 
-            WHERE table_name = 'user_cards' 
-            AND table_schema = 'public'
-        """)
-        columns = cursor.fetchall()
-        logging.info(f"📋 user_cards columns: {columns}")
-        
-        # ✅ ПОЛНОСТЬЮ СБРАСЫВАЕМ ИСТОРИЮ КАРТ ЗА СЕГОДНЯ
-        today = date.today()
-        logging.info(f"📅 Today date: {today}")
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM user_cards 
-            WHERE user_id = %s AND DATE(drawn_date) = %s
-        ''', (user.id, today))
-        
-        cards_before = cursor.fetchone()[0]
-        logging.info(f"📊 Cards before reset: {cards_before}")
-        
-        cursor.execute('''
-            DELETE FROM user_cards 
-            WHERE user_id = %s AND DATE(drawn_date) = %s
-        ''', (user.id, today))
-        
-        deleted_cards = cursor.rowcount
-        logging.info(f"🗑️ Deleted cards: {deleted_cards}")
-        
-        # ✅ СБРАСЫВАЕМ ДАТУ ПОСЛЕДНЕЙ КАРТЫ
-        cursor.execute('''
-            UPDATE users 
-            SET last_daily_card_date = NULL 
-            WHERE user_id = %s
-        ''', (user.id,))
-        
-        updated_users = cursor.rowcount
-        logging.info(f"👤 Updated users: {updated_users}")
-        
-        conn.commit()
-        conn.close()
+        # ✅ ПОЛНОСТЬЮ СБРАСЫВАЕМ ИСТОРИЮ КАРТ ЗА СЕГОДНЯ И ДАТУ ПОСЛЕДНЕЙ КАРТЫ
+        deleted_cards = await async_db.reset_today_cards(user.id)
         
         await update.message.reply_text(
             f"✅ Ваши лимиты полностью сброшены!\n"
@@ -996,18 +930,8 @@ async def reset_simple(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # ✅ ПРОСТО СБРАСЫВАЕМ ДАТУ БЕЗ УДАЛЕНИЯ КАРТ
-        cursor.execute('''
-            UPDATE users 
-            SET last_daily_card_date = NULL 
-            WHERE user_id = %s
-        ''', (user.id,))
-        
-        conn.commit()
-        conn.close()
+        await async_db.reset_last_card_date(user.id)
         
         await update.message.reply_text("✅ Дата последней карты сброшена!")
         
@@ -1019,39 +943,18 @@ async def debug_db(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Проверяем таблицы в PostgreSQL - ИСПРАВЛЕНО
-        cursor.execute('''
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        ''')
-        tables = [table[0] for table in cursor.fetchall()]
-        
-        # Проверяем пользователя - ИСПРАВЛЕНО для PostgreSQL
-        cursor.execute('SELECT * FROM users WHERE user_id = %s', (user.id,))
-        user_data = cursor.fetchone()
-        
-        # Проверяем карты - ИСПРАВЛЕНО для PostgreSQL
-        cursor.execute('SELECT COUNT(*) FROM user_cards WHERE user_id = %s', (user.id,))
-        user_cards_count = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM cards')
-        total_cards_count = cursor.fetchone()[0]
+        info = await async_db.get_debug_info(user.id)
         
         debug_text = f"""
 🔍 Отладочная информация:
 
-📋 Таблицы в базе: {tables}
-👤 Ваши данные: {'✅ Есть' if user_data else '❌ Нет'}
-🎴 Ваших карт в истории: {user_cards_count}
-🃏 Всего карт в колоде: {total_cards_count}
+📋 Таблицы в базе: {info['tables']}
+👤 Ваши данные: {'✅ Есть' if info['has_user'] else '❌ Нет'}
+🎴 Ваших карт в истории: {info['user_cards_count']}
+🃏 Всего карт в колоде: {info['total_cards_count']}
         """
         
         await update.message.reply_text(debug_text)
-        conn.close()
         
     except Exception as e:
         await update.message.reply_text(f"❌ Ошибка отладки: {e}")
@@ -1062,7 +965,7 @@ async def history(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     try:
-        history = db.get_user_card_history(user.id, limit=88)
+        history = await async_db.get_user_card_history(user.id, limit=88)
         
         if not history:
             await update.message.reply_text(
@@ -1118,7 +1021,7 @@ async def history_album(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     try:
-        history = db.get_user_card_history(user.id, limit=5)  # Ограничиваем для альбома
+        history = await async_db.get_user_card_history(user.id, limit=5)  # Ограничиваем для альбома
         
         if not history:
             await update.message.reply_text(
@@ -1127,9 +1030,7 @@ async def history_album(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return
         
-        from telegram import InputMediaPhoto
-        
-        # Создаем медиагруппу
+        # Создаем медиагруппу (картинки по file_id, если уже загружены в Telegram)
         media_group = []
         
         for i, (card_id, card_name, image_url, description, drawn_date) in enumerate(history, 1):
@@ -1140,15 +1041,10 @@ async def history_album(update: Update, context: ContextTypes.DEFAULT_TYPE):
             
             caption = f"#{i} {card_name} - {date_str}"
             
-            media_group.append(
-                InputMediaPhoto(
-                    media=image_url,
-                    caption=caption
-                )
-            )
+            media_group.append((image_url, caption))
         
         # Отправляем альбом
-        await update.message.reply_media_group(media=media_group)
+        await card_media.reply_media_group(update.message, media_group)
         
         # Отправляем дополнительное текстовое сообщение
         
@@ -1163,7 +1059,7 @@ async def simple_history_with_images(update: Update, context: ContextTypes.DEFAU
     user = update.effective_user
     
     try:
-        history = db.get_user_card_history(user.id, limit=5)
+        history = await async_db.get_user_card_history(user.id, limit=5)
         
         if not history:
             await update.message.reply_text(
@@ -1195,8 +1091,8 @@ async def simple_history_with_images(update: Update, context: ContextTypes.DEFAU
             caption = f"#{i} **{card_name}** - {date_str}"
             
             try:
-                await update.message.reply_photo(
-                    photo=image_url,
+                await card_media.reply_photo(
+                    update.message, image_url,
                     caption=caption,
                     parse_mode='Markdown'
                 )
@@ -1212,7 +1108,7 @@ async def simple_history_with_images(update: Update, context: ContextTypes.DEFAU
         await update.message.reply_text("⚠️ Ошибка при загрузке истории")
 
 async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Статистика для администратора"""
+    """Статистика для администратора (из mv_admin_stats, обновляется по расписанию)"""
     user = update.effective_user
     
     # Проверяем, является ли пользователь администратором
@@ -1221,57 +1117,24 @@ async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Общая статистика
-        cursor.execute('SELECT COUNT(*) FROM users')
-        total_users = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM user_cards')
-        total_cards_issued = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM cards')
-        total_cards_in_deck = cursor.fetchone()[0]
-        
-        # Активные пользователи (брали карты за последние 7 дней)
-        cursor.execute('''
-            SELECT COUNT(DISTINCT user_id) 
-            FROM user_cards 
-            WHERE drawn_date >= CURRENT_DATE - INTERVAL '7 days'
-        ''')
-        active_users = cursor.fetchone()[0]
-        
-        # Новые пользователи за последние 7 дней
-        cursor.execute('''
-            SELECT COUNT(*) 
-            FROM users 
-            WHERE registered_date >= CURRENT_DATE - INTERVAL '7 days'
-        ''')
-        new_users = cursor.fetchone()[0]
-        
-        # Топ пользователей по количеству карт
-        cursor.execute('''
-            SELECT u.user_id, u.first_name, u.username, COUNT(uc.id) as card_count
-            FROM users u
-            JOIN user_cards uc ON u.user_id = uc.user_id
-            GROUP BY u.user_id, u.first_name, u.username
-            ORDER BY card_count DESC
-            LIMIT 10
-        ''')
-        top_users = cursor.fetchall()
+        stats, top_users = await async_db.get_admin_stats()
+        if not stats:
+            await update.message.reply_text("⏳ Статистика еще не рассчитана, попробуйте позже")
+            return
+        
+        refreshed_at = stats['refreshed_at'].strftime("%d.%m.%Y %H:%M") if stats['refreshed_at'] else "неизвестно"
         
         stats_text = f"""
 📊 Статистика бота
 
 👥 Пользователи:
-• Всего пользователей: {total_users}
-• Активных (7 дней): {active_users}
-• Новых (7 дней): {new_users}
+• Всего пользователей: {stats['total_users']}
+• Активных (7 дней): {stats['active_users']}
+• Новых (7 дней): {stats['new_users']}
 
 🎴 Карты:
-• Всего карт в колоде: {total_cards_in_deck}
-• Всего выдано карт: {total_cards_issued}
+• Всего карт в колоде: {stats['total_cards_in_deck']}
+• Всего выдано карт: {stats['total_cards_issued']}
 
 🏆 Топ пользователей:
 """
@@ -1280,47 +1143,48 @@ async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
             username_display = f"@{username}" if username else first_name
             stats_text += f"{i}. {username_display} - {card_count} карт\n"
         
-        await update.message.reply_text(stats_text, parse_mode='Markdown')
+        stats_text += f"\n🕐 Обновлено: {refreshed_at}"
         
-        conn.close()
+        await update.message.reply_text(stats_text, parse_mode='Markdown')
         
     except Exception as e:
         logging.error(f"❌ Error getting admin stats: {e}")
         await update.message.reply_text("❌ Ошибка при получении статистики")
 
 
+USERS_PAGE_SIZE = 20
+
+
 async def admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Список всех пользователей"""
+    """Список пользователей по страницам: /users [ID последнего пользователя предыдущей страницы]"""
     user = update.effective_user
     
     if user.id not in ADMIN_IDS:
         await update.message.reply_text("❌ У вас нет прав для этой команды")
         return
     
+    after_user_id = None
+    if context.args:
+        try:
+            after_user_id = int(context.args[0])
+        except ValueError:
+            await update.message.reply_text("❌ Использование: /users [ID пользователя]")
+            return
+    
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Получаем всех пользователей с количеством карт
-        cursor.execute('''
-            SELECT u.user_id, u.username, u.first_name, u.registered_date, 
-                   COUNT(uc.id) as card_count,
-                   MAX(uc.drawn_date) as last_activity
-            FROM users u
-            LEFT JOIN user_cards uc ON u.user_id = uc.user_id
-            GROUP BY u.user_id, u.username, u.first_name, u.registered_date
-            ORDER BY u.registered_date DESC
-        ''')
-        
-        users = cursor.fetchall()
+        users = await async_db.get_admin_users_page(after_user_id, limit=USERS_PAGE_SIZE)
         
         if not users:
-            await update.message.reply_text("📝 Пользователей пока нет")
+            text = "📝 Больше пользователей нет" if after_user_id else "📝 Пользователей пока нет"
+            await update.message.reply_text(text)
             return
         
-        users_text = f"👥 **Все пользователи ({len(users)}):**\n\n"
+        stats, _ = await async_db.get_admin_stats()
+        total_users = stats['total_users'] if stats else "?"
         
-        for i, (user_id, username, first_name, reg_date, card_count, last_activity) in enumerate(users[:20], 1):
+        users_text = f"👥 **Все пользователи ({total_users}):**\n\n"
+        
+        for i, (user_id, username, first_name, reg_date, card_count, last_activity) in enumerate(users, 1):
             username_display = f"@{username}" if username else first_name
             reg_date_str = reg_date.strftime("%d.%m.%Y") if reg_date else "неизвестно"
             last_activity_str = last_activity.strftime("%d.%m.%Y") if last_activity else "нет активности"
@@ -1331,62 +1195,69 @@ async def admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
             users_text += f"   Регистрация: {reg_date_str}\n"
             users_text += f"   Последняя активность: {last_activity_str}\n\n"
         
-        if len(users) > 20:
-            users_text += f"\n... и еще {len(users) - 20} пользователей"
+        if len(users) == USERS_PAGE_SIZE:
+            users_text += f"\n➡️ Следующая страница: /users {users[-1][0]}"
         
         await update.message.reply_text(users_text, parse_mode='Markdown')
         
-        conn.close()
-        
     except Exception as e:
         logging.error(f"❌ Error getting users list: {e}")
         await update.message.reply_text("❌ Ошибка при получении списка пользователей")
 
 
 async def export_data(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Экспорт данных в CSV"""
+    """Экспорт данных в CSV: /export [таблица|all] [с YYYY-MM-DD] [по YYYY-MM-DD]"""
     user = update.effective_user
     
     if user.id not in ADMIN_IDS:
         await update.message.reply_text("❌ У вас нет прав для этой команды")
         return
     
+    from data_export import EXPORT_TABLES, export_tables, parse_export_args
+    import os
+    import shutil
+    
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Экспорт пользователей
-        cursor.execute('''
-            SELECT user_id, username, first_name, last_name, registered_date
-            FROM users 
-            ORDER BY registered_date
-        ''')
-        users_data = cursor.fetchall()
-        
-        # Создаем CSV в памяти
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Заголовки
-        writer.writerow(['User ID', 'Username', 'First Name', 'Last Name', 'Registered Date'])
-        
-        # Данные
-        for row in users_data:
-            writer.writerow(row)
-        
-        # Отправляем файл
-        output.seek(0)
-        await update.message.reply_document(
-            document=io.BytesIO(output.getvalue().encode()),
-            filename="users_export.csv",
-            caption="📊 Экспорт пользователей"
+        tables, date_from, date_to = parse_export_args(context.args)
+    except ValueError as e:
+        await update.message.reply_text(
+            f"❌ {e}\n\n"
+            f"Использование: /export [таблица|all] [с YYYY-MM-DD] [по YYYY-MM-DD]\n"
+            f"Обе даты включительно.\n"
+            f"Таблицы: {', '.join(EXPORT_TABLES)}"
         )
+        return
+    
+    directory = None
+    try:
+        await update.message.reply_text(f"⏳ Экспорт: {', '.join(tables)}...")
+        
+        # Выгрузка идет в пуле потоков БД, строки пишутся сразу в gzip-файлы
+        directory, results = await async_db.run(export_tables, db, tables, date_from, date_to)
         
-        conn.close()
+        for table, paths, rows in results:
+            if not paths:
+                await update.message.reply_text(f"📭 {table}: нет данных за выбранный период")
+                continue
+            
+            for part, path in enumerate(paths, 1):
+                caption = f"📊 Экспорт {table}: {rows} строк"
+                if len(paths) > 1:
+                    caption += f" (часть {part}/{len(paths)})"
+                
+                with open(path, 'rb') as f:
+                    await update.message.reply_document(
+                        document=f,
+                        filename=os.path.basename(path),
+                        caption=caption
+                    )
         
     except Exception as e:
         logging.error(f"❌ Error exporting data: {e}")
         await update.message.reply_text("❌ Ошибка при экспорте данных")
+    finally:
+        if directory:
+            shutil.rmtree(directory, ignore_errors=True)
 
 async def add_cards(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Добавляет недостающие карты в базу"""
@@ -1398,7 +1269,7 @@ async def add_cards(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        added_count = db.add_missing_cards()
+        added_count = await async_db.add_missing_cards()
         await update.message.reply_text(f"✅ Добавлено {added_count} новых карт в колоду")
         
     except Exception as e:
@@ -1506,7 +1377,7 @@ async def show_history_from_button(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     try:
-        history = db.get_user_card_history(user.id, limit=20)
+        history = await async_db.get_user_card_history(user.id, limit=20)
         
         if not history:
             # Отправляем новое сообщение
@@ -1556,15 +1427,13 @@ async def show_history_pics_from_button(query, context: ContextTypes.DEFAULT_TYP
     user = query.from_user
     
     try:
-        history = db.get_user_card_history(user.id, limit=5)
+        history = await async_db.get_user_card_history(user.id, limit=5)
         
         if not history:
             await query.message.reply_text("📝 У вас пока нет истории карт.")
             return
         
-        from telegram import InputMediaPhoto
-        
-        # Создаем медиагруппу
+        # Создаем медиагруппу (картинки по file_id, если уже загружены в Telegram)
         media_group = []
         
         for i, (card_id, card_name, image_url, description, drawn_date) in enumerate(history, 1):
@@ -1575,15 +1444,10 @@ async def show_history_pics_from_button(query, context: ContextTypes.DEFAULT_TYP
             
             caption = f"#{i} {card_name} - {date_str}"
             
-            media_group.append(
-                InputMediaPhoto(
-                    media=image_url,
-                    caption=caption
-                )
-            )
+            media_group.append((image_url, caption))
         
         # Отправляем альбом
-        await query.message.reply_media_group(media=media_group)
+        await card_media.reply_media_group(query.message, media_group)
         
         # Отправляем сообщение с кнопкой "Вернуться в меню"
         await query.message.reply_text(
@@ -1862,7 +1726,7 @@ async def handle_payment_command(update: Update, context: ContextTypes.DEFAULT_T
         payment_label = args[0].replace('payment_', '')
         
         # Проверяем статус подписки
-        subscription = db.get_user_subscription(user.id)
+        subscription = await async_db.get_user_subscription(user.id)
         
         if subscription:
             success_text = """
@@ -1940,7 +1804,7 @@ async def message_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Показывает статус посланий пользователя с кнопками подписки"""
     user = update.effective_user
     
-    stats = db.get_user_message_stats(user.id)
+    stats = await async_db.get_user_message_stats(user.id)
     if not stats:
         await update.message.reply_text("❌ Не удалось получить статистику посланий")
         return
@@ -1992,54 +1856,30 @@ async def debug_messages(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Получаем информацию о пользователе
-        cursor.execute('''
-            SELECT user_id, is_premium, premium_until 
-            FROM users 
-            WHERE user_id = %s
-        ''', (user.id,))
-        user_data = cursor.fetchone()
-        
-        # Получаем историю посланий
-        cursor.execute('''
-            SELECT um.drawn_date, dm.message_text 
-            FROM user_messages um
-            LEFT JOIN daily_messages dm ON um.message_id = dm.message_id
-            WHERE um.user_id = %s 
-            ORDER BY um.drawn_date DESC 
-            LIMIT 5
-        ''', (user.id,))
-        message_history = cursor.fetchall()
-        
-        # Проверяем количество посланий в базе
-        cursor.execute('SELECT COUNT(*) FROM daily_messages')
-        total_messages = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM user_messages WHERE user_id = %s', (user.id,))
-        user_messages_count = cursor.fetchone()[0]
+        # Премиум-статус, история и счетчики посланий
+        info = await async_db.get_message_debug_info(user.id)
+        user_data = info['user_data']
         
         # Проверяем лимит
-        can_take, reason = db.can_take_daily_message(user.id)
+        can_take, reason = await async_db.can_take_daily_message(user.id)
         
         debug_text = f"""
 🔍 Отладка лимитов посланий
 
 👤 Пользователь: {user.id}
-💎 Премиум: {user_data[1] if user_data else 'N/A'}
-📅 Premium until: {user_data[2] if user_data else 'N/A'}
+💎 Премиум: {user_data[0] if user_data else 'N/A'}
+📅 Premium until: {user_data[1] if user_data else 'N/A'}
 ✅ Можно взять: {can_take}
 📝 Причина: {reason}
 
 📊 Статистика:
-• Всего посланий в базе: {total_messages}
-• Ваших посланий в истории: {user_messages_count}
+• Всего посланий в базе: {info['total_messages']}
+• Ваших посланий в истории: {info['user_messages_count']}
 
 📋 История ваших посланий:
 """
         
+        message_history = info['message_history']
         for i, (drawn_date, message_text) in enumerate(message_history, 1):
             date_str = drawn_date.strftime("%Y-%m-%d %H:%M") if hasattr(drawn_date, 'strftime') else str(drawn_date)
             debug_text += f"{i}. {date_str} - {message_text[:30]}...\n"
@@ -2048,7 +1888,6 @@ async def debug_messages(update: Update, context: ContextTypes.DEFAULT_TYPE):
             debug_text += "Нет истории посланий"
         
         await update.message.reply_text(debug_text)
-        conn.close()
         
     except Exception as e:
         await update.message.reply_text(f"❌ Ошибка отладки: {e}")
@@ -2062,36 +1901,9 @@ async def init_messages(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Создаем таблицу
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS daily_messages (
-                message_id SERIAL PRIMARY KEY,
-                image_url TEXT NOT NULL,
-                message_text TEXT NOT NULL
-            )
-        ''')
-        
-        # Очищаем таблицу
-        cursor.execute('DELETE FROM daily_messages')
-        
-        # Добавляем тестовые послания
-        daily_messages = [
-            (1, "https://ibb.co/wZd8BTHM", "Послание 1"),
-            (2, "https://ibb.co/PGWbXCyP", "Послание 2")
-        ]
+        created_count = await async_db.init_sample_daily_messages()
         
-        for message_id, image_url, message_text in daily_messages:
-            cursor.execute('''
-                INSERT INTO daily_messages (message_id, image_url, message_text)
-                VALUES (%s, %s, %s)
-            ''', (message_id, image_url, message_text))
-        
-        conn.commit()
-        
-        await update.message.reply_text(f"✅ Создано {len(daily_messages)} тестовых посланий в базе данных")
+        await update.message.reply_text(f"✅ Создано {created_count} тестовых посланий в базе данных")
         
     except Exception as e:
         await update.message.reply_text(f"❌ Ошибка: {e}")
@@ -2106,9 +1918,6 @@ async def reset_message_limit(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем аргументы команды (если указан конкретный пользователь)
         target_user_id = user.id  # по умолчанию сбрасываем себе
         
@@ -2121,11 +1930,7 @@ async def reset_message_limit(update: Update, context: ContextTypes.DEFAULT_TYPE
                 return
         
         # Удаляем историю посланий пользователя
-        cursor.execute('DELETE FROM user_messages WHERE user_id = %s', (target_user_id,))
-        deleted_count = cursor.rowcount
-        
-        conn.commit()
-        conn.close()
+        deleted_count = await async_db.reset_user_message_history(target_user_id)
         
         if target_user_id == user.id:
             await update.message.reply_text(f"✅ Ваш лимит посланий сброшен! Удалено {deleted_count} записей.")
@@ -2147,45 +1952,17 @@ async def handle_subscription_selection(update: Update, context: ContextTypes.DE
         
         logging.info(f"🔄 Subscription selected: {subscription_type} by user {user_id}")
         
-        # ✅ ЛОГИРУЕМ ДЕЙСТВИЕ ПОЛЬЗОВАТЕЛЯ В БАЗУ ДАННЫХ
-        try:
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            # Создаем таблицу если её нет
-            try:
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS user_action_logs (
-                        id SERIAL PRIMARY KEY,
-                        user_id BIGINT,
-                        action TEXT,
-                        action_data TEXT,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-            except:
-                pass  # Таблица уже существует
-            
-            # Сохраняем user_id и subscription_type для поиска
-            action_data = {
-                'subscription_type': subscription_type,
-                'user_id': user_id,
-                'username': query.from_user.username,
-                'first_name': query.from_user.first_name,
-                'timestamp': datetime.now().isoformat(),
-                'amount': SUBSCRIPTION_PRICES.get(subscription_type, 0)
-            }
-            
-            cursor.execute('''
-                INSERT INTO user_action_logs (user_id, action, action_data)
-                VALUES (%s, %s, %s)
-            ''', (user_id, 'subscription_selected', json.dumps(action_data)))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"✅ User action logged for {user_id}: {subscription_type}")
-        except Exception as log_error:
-            logging.error(f"❌ Error logging user action: {log_error}")
+        # ✅ ЛОГИРУЕМ ДЕЙСТВИЕ ПОЛЬЗОВАТЕЛЯ (запись в базу - фоном, см. action_log.py)
+        # Сохраняем user_id и subscription_type для поиска
+        action_data = {
+            'subscription_type': subscription_type,
+            'user_id': user_id,
+            'username': query.from_user.username,
+            'first_name': query.from_user.first_name,
+            'timestamp': datetime.now().isoformat(),
+            'amount': SUBSCRIPTION_PRICES.get(subscription_type, 0)
+        }
+        action_log.log(user_id, 'subscription_selected', action_data)
         
         if subscription_type not in SUBSCRIPTION_PRICES:
             await query.message.reply_text(
@@ -2218,30 +1995,10 @@ async def handle_subscription_selection(update: Update, context: ContextTypes.DE
 
         # Также сохраняем в базу для надежности
         try:
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pending_payments (
-                    id SERIAL PRIMARY KEY,
-                    payment_key TEXT UNIQUE,
-                    user_id BIGINT,
-                    subscription_type TEXT,
-                    amount DECIMAL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    status TEXT DEFAULT 'pending'
-                )
-            ''')
+            await async_db.save_pending_payment(payment_key, user_id, subscription_type, price)
             
-            cursor.execute('''
-                INSERT INTO pending_payments (payment_key, user_id, subscription_type, amount)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (payment_key) DO NOTHING
-            ''', (payment_key, user_id, subscription_type, price))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"✅ Pending payment saved: {payment_key} for user {user_id}")
+            # Ожидаемый платеж по статической ссылке: сопоставляется по email/сумме
+            await async_db.save_payment_correlation(user_id, 'yookassa', amount=price, internal_payment_id=payment_key)
         except Exception as e:
             logging.error(f"❌ Error saving pending payment: {e}")
 
@@ -2282,33 +2039,8 @@ async def handle_subscription_selection(update: Update, context: ContextTypes.DE
         )
 
 def save_user_action(user_id: int, action_type: str, action_data: dict):
-    """Сохраняет действие пользователя для идентификации"""
-    try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Создаем таблицу если не существует
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_actions (
-                id SERIAL PRIMARY KEY,
-                user_id BIGINT,
-                action_type TEXT,
-                action_data JSONB,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            INSERT INTO user_actions (user_id, action_type, action_data)
-            VALUES (%s, %s, %s)
-        ''', (user_id, action_type, json.dumps(action_data)))
-        
-        conn.commit()
-        conn.close()
-        logging.info(f"✅ User action saved: {action_type} for user {user_id}")
-        
-    except Exception as e:
-        logging.error(f"❌ Error saving user action: {e}")
+    """Сохраняет действие пользователя для идентификации (запись в базу - фоном)"""
+    action_log.log_user_action(user_id, action_type, action_data)
 
 async def handle_payment_check(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Проверяет статус оплаты"""
@@ -2321,7 +2053,7 @@ async def handle_payment_check(update: Update, context: ContextTypes.DEFAULT_TYP
     subscription_type = context.user_data.get('subscription_type')
     
     # ✅ СНАЧАЛА ПРОВЕРЯЕМ БАЗУ ДАННЫХ
-    payment_info = payment_processor.find_user_payment(user_id)
+    payment_info = await async_db.run(payment_processor.find_user_payment, user_id)
     if payment_info and payment_info['status'] == 'success':
         # Подписка уже активирована
         success_text = f"""
@@ -2351,11 +2083,11 @@ async def handle_payment_check(update: Update, context: ContextTypes.DEFAULT_TYP
         return
     
     # Проверяем статус платежа через API
-    payment_status = payment_processor.check_payment_status(payment_id)
+    payment_status = await async_db.run(payment_processor.check_payment_status, payment_id)
     
     if payment_status is True:
         # Платеж подтвержден, активируем подписку
-        if payment_processor.activate_subscription(payment_id):
+        if await async_db.run(payment_processor.activate_subscription, payment_id):
             success_text = f"""
 ✅ Оплата подтверждена!
 
@@ -2402,7 +2134,7 @@ async def handle_start_with_payment(update: Update, context: ContextTypes.DEFAUL
     # Обработка успешной оплаты через ЮKassa
     if args[0] == 'payment_success':
         # Проверяем, есть ли у пользователя активная подписка
-        subscription = db.get_user_subscription(user.id)
+        subscription = await async_db.get_user_subscription(user.id)
         
         if subscription:
             subscription_type, end_date = subscription
@@ -2445,7 +2177,7 @@ async def handle_start_with_payment(update: Update, context: ContextTypes.DEFAUL
         payment_id = args[0].replace('paypal_success_', '')
         
         # Проверяем статус подписки
-        subscription = db.get_user_subscription(user.id)
+        subscription = await async_db.get_user_subscription(user.id)
         
         if subscription:
             subscription_type, end_date = subscription
@@ -2480,12 +2212,12 @@ async def handle_start_with_payment(update: Update, context: ContextTypes.DEFAUL
             # Проверяем статус PayPal платежа напрямую
             try:
                 from paypal_payment import paypal_processor
-                payment_status = paypal_processor.check_payment_status(payment_id)
+                payment_status = await async_db.run(paypal_processor.check_payment_status, payment_id)
                 
                 if payment_status is True:
                     # Активируем подписку
-                    if paypal_processor.activate_subscription(payment_id):
-                        subscription = db.get_user_subscription(user.id)
+                    if await async_db.run(paypal_processor.activate_subscription, payment_id):
+                        subscription = await async_db.get_user_subscription(user.id)
                         if subscription:
                             subscription_type, end_date = subscription
                             
@@ -2539,7 +2271,7 @@ async def handle_start_with_payment(update: Update, context: ContextTypes.DEFAUL
     # Обработка успешной оплаты колоды (оставляем для полноты, но это отдельная функция)
     elif args[0] == 'deck_purchase_success':
         # Проверяем, есть ли у пользователя покупка колоды
-        if db.has_purchased_deck(user.id):
+        if await async_db.has_purchased_deck(user.id):
             await send_deck_files(update, context, user.id)
         else:
             await update.message.reply_text(
@@ -2561,7 +2293,7 @@ async def update_database(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Добавляем недостающие колонки
-        db.add_payment_id_column()
+        await async_db.add_payment_id_column()
         await update.message.reply_text("✅ База данных обновлена! Добавлена колонка payment_id")
         
     except Exception as e:
@@ -2572,24 +2304,10 @@ async def check_subscription_status(update: Update, context: ContextTypes.DEFAUL
     user = update.effective_user
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT u.daily_cards_limit, u.is_premium, u.premium_until,
-                   COUNT(uc.id) as today_cards,
-                   (SELECT COUNT(*) FROM user_cards WHERE user_id = %s AND DATE(drawn_date) = CURRENT_DATE) as today_count
-            FROM users u
-            LEFT JOIN user_cards uc ON u.user_id = uc.user_id AND DATE(uc.drawn_date) = CURRENT_DATE
-            WHERE u.user_id = %s
-            GROUP BY u.user_id, u.daily_cards_limit, u.is_premium, u.premium_until
-        ''', (user.id, user.id))
-        
-        result = cursor.fetchone()
-        conn.close()
+        result = await async_db.get_subscription_status(user.id)
         
         if result:
-            limit, is_premium, premium_until, today_cards, today_count = result
+            limit, is_premium, premium_until, today_count = result
             
             status_text = f"""
 📊 Статус вашей подписки:
@@ -2618,32 +2336,11 @@ async def fix_limit(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         from config import DAILY_CARD_LIMIT_PREMIUM
         
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Проверяем, есть ли активная подписка
-        cursor.execute('''
-            SELECT is_premium, premium_until 
-            FROM users 
-            WHERE user_id = %s AND is_premium = TRUE AND premium_until >= CURRENT_DATE
-        ''', (user.id,))
-        
-        result = cursor.fetchone()
-        
-        if result:
-            # Обновляем лимит
-            cursor.execute('''
-                UPDATE users 
-                SET daily_cards_limit = %s 
-                WHERE user_id = %s
-            ''', (DAILY_CARD_LIMIT_PREMIUM, user.id))
-            
-            conn.commit()
+        # Обновляем лимит, если есть активная подписка
+        if await async_db.fix_premium_card_limit(user.id):
             await update.message.reply_text(f"✅ Лимит карт обновлен! Теперь вам доступно {DAILY_CARD_LIMIT_PREMIUM} карт в день.")
         else:
             await update.message.reply_text("❌ У вас нет активной премиум подписки")
-            
-        conn.close()
         
     except Exception as e:
         await update.message.reply_text(f"❌ Ошибка: {e}")
@@ -2717,7 +2414,7 @@ async def reset_my_messages(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Сбрасываем послания текущего пользователя
-        deleted_count = db.reset_user_messages(user.id)
+        deleted_count = await async_db.reset_user_messages(user.id)
         
         await update.message.reply_text(
             f"✅ Ваши послания дня сброшены!\n"
@@ -2749,7 +2446,7 @@ async def reset_user_messages_admin(update: Update, context: ContextTypes.DEFAUL
         target_user_id = int(context.args[0])
         
         # Сбрасываем послания указанного пользователя
-        deleted_count = db.reset_user_messages(target_user_id)
+        deleted_count = await async_db.reset_user_messages(target_user_id)
         
         await update.message.reply_text(
             f"✅ Послания пользователя {target_user_id} сброшены!\n"
@@ -2774,7 +2471,7 @@ async def reset_all_messages(update: Update, context: ContextTypes.DEFAULT_TYPE)
         # ✅ ПОДТВЕРЖДЕНИЕ ОПАСНОЙ ОПЕРАЦИИ
         if context.args and context.args[0] == 'confirm':
             # Сбрасываем ВСЕ послания за сегодня
-            deleted_count = db.reset_all_messages_today()
+            deleted_count = await async_db.reset_all_messages_today()
             
             await update.message.reply_text(
                 f"⚠️ *ВСЕ послания за сегодня сброшены!*\n"
@@ -2814,30 +2511,12 @@ async def view_today_messages(update: Update, context: ContextTypes.DEFAULT_TYPE
             return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # ✅ ПОЛУЧАЕМ СЕГОДНЯШНИЕ ПОСЛАНИЯ ПОЛЬЗОВАТЕЛЯ
         today = date.today()
-        cursor.execute('''
-            SELECT um.drawn_date, dm.message_text
-            FROM user_messages um
-            LEFT JOIN daily_messages dm ON um.message_id = dm.message_id
-            WHERE um.user_id = %s AND DATE(um.drawn_date) = %s
-            ORDER BY um.drawn_date
-        ''', (target_user_id, today))
-        
-        today_messages = cursor.fetchall()
+        today_messages = await async_db.get_user_messages_for_day(target_user_id, today)
         
         # ✅ ПОЛУЧАЕМ ИНФОРМАЦИЮ О ПОЛЬЗОВАТЕЛЕ
-        cursor.execute('''
-            SELECT username, first_name, is_premium
-            FROM users 
-            WHERE user_id = %s
-        ''', (target_user_id,))
-        
-        user_info = cursor.fetchone()
-        conn.close()
+        user_info = await async_db.get_user_brief(target_user_id)
         
         if not user_info:
             await update.message.reply_text("❌ Пользователь не найден")
@@ -2881,12 +2560,16 @@ async def update_cards_descriptions(update: Update, context: ContextTypes.DEFAUL
         return
     
     try:
-        # Принудительно добавляем карты с новыми описаниями
-        added_count = db.add_missing_cards()
+        # Добавляем недостающие карты и обновляем изменившиеся описания одним запросом
+        result = await async_db.sync_cards()
+        if result is None:
+            await update.message.reply_text("❌ Ошибка при обновлении карт")
+            return
         
         await update.message.reply_text(
             f"✅ Описания карт обновлены!\n"
-            f"🃏 Добавлено/обновлено карт: {added_count}"
+            f"🃏 Добавлено: {result['inserted']}, обновлено: {result['updated']}, "
+            f"без изменений: {result['unchanged']}"
         )
         
     except Exception as e:
@@ -2897,7 +2580,7 @@ async def update_cards_descriptions(update: Update, context: ContextTypes.DEFAUL
 async def resources_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Обработчик команды /resources - Архипелаг ресурсов"""
     user = update.effective_user
-    subscription = db.get_user_subscription(user.id)
+    subscription = await async_db.get_user_subscription(user.id)
     has_active_subscription = subscription and subscription[1] and subscription[1].date() >= date.today()
     
     if not has_active_subscription:
@@ -2928,7 +2611,7 @@ async def show_resources_from_button(query, context: ContextTypes.DEFAULT_TYPE):
         user = query.from_user
         
         # ✅ ПРОВЕРЯЕМ ПОДПИСКУ ПОЛЬЗОВАТЕЛЯ
-        subscription = db.get_user_subscription(user.id)
+        subscription = await async_db.get_user_subscription(user.id)
         logging.info(f"🔧 DEBUG: Subscription data: {subscription}")
         
         has_active_subscription = False
@@ -3013,7 +2696,7 @@ async def handle_tide_step1_card(query, context: ContextTypes.DEFAULT_TYPE):
     """Обрабатывает выбор карты-ограничения в Шаге 1"""
     await query.edit_message_reply_markup(reply_markup=None)
     # Получаем случайную карту-ограничение
-    card = db.get_random_restriction_card()
+    card = await async_db.get_random_restriction_card()
     
     if not card:
         await query.message.reply_text(
@@ -3034,8 +2717,8 @@ async def handle_tide_step1_card(query, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Отправляем карту-ограничение
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption=f"🎴 *Карта-ограничение*",
             reply_markup=keyboard.get_tide_step1_reflection_keyboard(),
             parse_mode='Markdown'
@@ -3100,7 +2783,7 @@ async def handle_tide_step2_card(query, context: ContextTypes.DEFAULT_TYPE):
     """Обрабатывает выбор карты-возможности в Шаге 2"""
     await query.edit_message_reply_markup(reply_markup=None)
     # Получаем случайную карту-возможность
-    card = db.get_random_opportunity_card()
+    card = await async_db.get_random_opportunity_card()
     
     if not card:
         await query.message.reply_text(
@@ -3121,8 +2804,8 @@ async def handle_tide_step2_card(query, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         # Отправляем карту-возможность
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption=f"🎴 *Карта-возможность*",
             reply_markup=keyboard.get_tide_step2_reflection_keyboard(),
             parse_mode='Markdown'
@@ -3191,12 +2874,23 @@ async def force_update_cards(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     try:
-        # Принудительно обновляем все карты
-        updated_count = db.force_update_all_cards()
+        # Принудительно обновляем все карты (пропускается, если файл колоды не менялся)
+        result = await async_db.force_update_all_cards()
+        if result is None:
+            await update.message.reply_text("❌ Ошибка при обновлении карт")
+            return
+        
+        if result.get('skipped'):
+            await update.message.reply_text(
+                f"ℹ️ Колода не менялась с прошлой синхронизации\n"
+                f"🃏 Карт в базе: {result['total']}"
+            )
+            return
         
         await update.message.reply_text(
             f"✅ Все карты принудительно обновлены!\n"
-            f"🃏 Обновлено карт: {updated_count}/176"
+            f"🃏 Добавлено: {result['inserted']}, обновлено: {result['updated']}, "
+            f"без изменений: {result['unchanged']} (всего {result['total']})"
         )
         
     except Exception as e:
@@ -3204,6 +2898,29 @@ async def force_update_cards(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await update.message.reply_text(f"❌ Ошибка при обновлении карт: {str(e)}")
 
 
+async def warm_card_media(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Загружает картинки всех карт в Telegram заранее (только для админов)"""
+    user = update.effective_user
+    
+    if user.id not in ADMIN_IDS:
+        await update.message.reply_text("❌ У вас нет прав для этой команды")
+        return
+    
+    await update.message.reply_text("⏳ Загружаю картинки карт в Telegram...")
+    
+    try:
+        uploaded, failed = await card_media.warm_up(context.bot, user.id)
+        
+        await update.message.reply_text(
+            f"✅ Картинки карт загружены!\n"
+            f"🃏 Загружено: {uploaded}, ошибок: {failed}"
+        )
+        
+    except Exception as e:
+        logging.error(f"❌ Error warming card media: {e}")
+        await update.message.reply_text(f"❌ Ошибка при загрузке картинок: {str(e)}")
+
+
 async def handle_storm_calm_technique(query, context: ContextTypes.DEFAULT_TYPE):
     """Начинает технику Шторм и Штиль внутри тебя"""
     technique_text = """
@@ -3232,7 +2949,7 @@ async def handle_storm_calm_step1_card(query, context: ContextTypes.DEFAULT_TYPE
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Получаем случайную карту из всего диапазона (1-176)
-    card = db.get_random_card()
+    card = await async_db.get_random_card()
     
     if not card:
         await query.message.reply_text(
@@ -3253,8 +2970,8 @@ async def handle_storm_calm_step1_card(query, context: ContextTypes.DEFAULT_TYPE
     
     try:
         # Отправляем карту состояния
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption="🎴 *Это карта твоего сегодняшнего моря.*",
             parse_mode='Markdown'
         )
@@ -3288,7 +3005,7 @@ async def handle_storm_calm_step2_lighthouse(query, context: ContextTypes.DEFAUL
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Получаем случайную карту-возможность (89-176)
-    card = db.get_random_opportunity_card()
+    card = await async_db.get_random_opportunity_card()
     
     if not card:
         await query.message.reply_text(
@@ -3309,8 +3026,8 @@ async def handle_storm_calm_step2_lighthouse(query, context: ContextTypes.DEFAUL
     
     try:
         # Отправляем карту-маяк
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption="🕯 *Это твой внутренний Маяк — то, что помогает тебе быть в согласии с собой.*",
             parse_mode='Markdown'
         )
@@ -3400,7 +3117,7 @@ async def handle_three_waves_step1_card(query, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Получаем случайную карту-возможность (89-176)
-    card = db.get_random_opportunity_card()
+    card = await async_db.get_random_opportunity_card()
     
     if not card:
         await query.message.reply_text(
@@ -3421,8 +3138,8 @@ async def handle_three_waves_step1_card(query, context: ContextTypes.DEFAULT_TYP
     
     try:
         # Отправляем карту
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption="🎴 *Первая Волна — Что я чувствую?*",
             parse_mode='Markdown'
         )
@@ -3473,7 +3190,7 @@ async def handle_three_waves_step2_card(query, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Получаем случайную карту-ограничение (1-88)
-    card = db.get_random_restriction_card()
+    card = await async_db.get_random_restriction_card()
     
     if not card:
         await query.message.reply_text(
@@ -3494,8 +3211,8 @@ async def handle_three_waves_step2_card(query, context: ContextTypes.DEFAULT_TYP
     
     try:
         # Отправляем карту
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption="🎴 *Вторая Волна — Почему я это чувствую?*",
             parse_mode='Markdown'
         )
@@ -3544,7 +3261,7 @@ async def handle_three_waves_step3_card(query, context: ContextTypes.DEFAULT_TYP
     await query.edit_message_reply_markup(reply_markup=None)
     
     # Получаем случайную карту-возможность (89-176)
-    card = db.get_random_opportunity_card()
+    card = await async_db.get_random_opportunity_card()
     
     if not card:
         await query.message.reply_text(
@@ -3565,8 +3282,8 @@ async def handle_three_waves_step3_card(query, context: ContextTypes.DEFAULT_TYP
     
     try:
         # Отправляем карту
-        await query.message.reply_photo(
-            photo=image_url,
+        await card_media.reply_photo(
+            query.message, image_url,
             caption="🎴 *Третья Волна — Как я могу с этим быть?*",
             parse_mode='Markdown'
         )
@@ -3616,7 +3333,7 @@ async def buy_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     # Проверяем, покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         # Если уже покупал - сразу отправляем файлы
         await send_deck_files(update, context, user.id)
         return
@@ -3649,7 +3366,7 @@ async def show_buy_from_button(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     # Проверяем, покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         # Если уже покупал - сразу отправляем файлы
         await send_deck_files_to_query(query, context, user.id)
         return
@@ -3681,13 +3398,13 @@ async def handle_buy_deck(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     # Проверяем, покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         # Если уже покупал - сразу отправляем файлы
         await send_deck_files_to_query(query, context, user.id)
         return
     
     # Создаем платеж
-    payment_url, payment_id = payment_processor.create_deck_payment(user.id)
+    payment_url, payment_id = await async_db.run(payment_processor.create_deck_payment, user.id)
     
     if not payment_url:
         await query.message.reply_text(
@@ -3722,7 +3439,7 @@ async def handle_deck_payment_check(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     # Проверяем, не покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         await send_deck_files_to_query(query, context, user.id)
         return
     
@@ -3736,11 +3453,11 @@ async def handle_deck_payment_check(query, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Проверяем статус платежа
-    payment_status = payment_processor.check_payment_status(payment_id)
+    payment_status = await async_db.run(payment_processor.check_payment_status, payment_id)
     
     if payment_status is True:
         # Платеж подтвержден, активируем покупку
-        if payment_processor.activate_deck_purchase(payment_id):
+        if await async_db.run(payment_processor.activate_deck_purchase, payment_id):
             await send_deck_files_to_query(query, context, user.id)
             
             # Очищаем данные о платеже
@@ -3943,7 +3660,7 @@ async def handle_start_with_deck_purchase(update: Update, context: ContextTypes.
     
     if args and args[0] == 'deck_purchase_success':
         # Проверяем, есть ли у пользователя покупка колоды
-        if db.has_purchased_deck(user.id):
+        if await async_db.has_purchased_deck(user.id):
             await send_deck_files(update, context, user.id)
         else:
             await update.message.reply_text(
@@ -3989,7 +3706,7 @@ async def messages_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     # Получаем статистику пользователя для персонализации
-    stats = db.get_user_message_stats(user.id)
+    stats = await async_db.get_user_message_stats(user.id)
     
     if stats:
         if stats['has_subscription']:
@@ -4078,7 +3795,7 @@ async def meditation_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     logging.info(f"🔧 Meditation command called by user {user.id}")
     
     # Проверяем доступ ДО создания видео системы
-    can_watch, reason = db.can_watch_meditation(user.id)
+    can_watch, reason = await async_db.can_watch_meditation(user.id)
     
     if not can_watch:
         await update.message.reply_text(
@@ -4100,7 +3817,7 @@ async def meditation_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     # Получаем информацию о подписке
-    subscription = db.get_user_subscription(user.id)
+    subscription = await async_db.get_user_subscription(user.id)
     has_active_subscription = False
     
     if subscription and subscription[1]:
@@ -4109,8 +3826,8 @@ async def meditation_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             has_active_subscription = sub_end.date() >= datetime.now().date()
     
     # Генерируем отдельные ссылки для YouTube и RUTUBE
-    youtube_link = video_system.generate_secure_link(user.id, "youtube")
-    rutube_link = video_system.generate_secure_link(user.id, "rutube")
+    youtube_link = await async_db.run(video_system.generate_secure_link, user.id, "youtube")
+    rutube_link = await async_db.run(video_system.generate_secure_link, user.id, "rutube")
     
     if not youtube_link or not rutube_link:
         await update.message.reply_text(
@@ -4146,7 +3863,7 @@ async def meditation_button_handler(query, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     # Проверяем доступ ДО создания видео системы
-    can_watch, reason = db.can_watch_meditation(user.id)
+    can_watch, reason = await async_db.can_watch_meditation(user.id)
     
     if not can_watch:
         await query.message.reply_text(
@@ -4169,7 +3886,7 @@ async def meditation_button_handler(query, context: ContextTypes.DEFAULT_TYPE):
     loading_msg = await query.message.reply_text("🔄 Подготавливаем вашу медитацию...")
     
     # Получаем информацию о подписке
-    subscription = db.get_user_subscription(user.id)
+    subscription = await async_db.get_user_subscription(user.id)
     has_active_subscription = False
     
     if subscription and subscription[1]:
@@ -4178,8 +3895,8 @@ async def meditation_button_handler(query, context: ContextTypes.DEFAULT_TYPE):
             has_active_subscription = sub_end.date() >= datetime.now().date()
     
     # Генерируем отдельные ссылки для YouTube и RUTUBE
-    youtube_link = video_system.generate_secure_link(user.id, "youtube")
-    rutube_link = video_system.generate_secure_link(user.id, "rutube")
+    youtube_link = await async_db.run(video_system.generate_secure_link, user.id, "youtube")
+    rutube_link = await async_db.run(video_system.generate_secure_link, user.id, "rutube")
     
     if not youtube_link or not rutube_link:
         await loading_msg.edit_text(
@@ -4217,29 +3934,8 @@ async def fix_video_table(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Делаем expires_at nullable
-        cursor.execute('''
-            ALTER TABLE video_links 
-            ALTER COLUMN expires_at DROP NOT NULL
-        ''')
-        
-        # Обновляем существующие записи, где expires_at NULL
-        cursor.execute('''
-            UPDATE video_links 
-            SET expires_at = NOW() + INTERVAL '1 year'
-            WHERE expires_at IS NULL AND has_subscription = TRUE
-        ''')
-        
-        cursor.execute('''
-            UPDATE video_links 
-            SET expires_at = NOW() + INTERVAL '24 hours'
-            WHERE expires_at IS NULL AND has_subscription = FALSE
-        ''')
-        
-        conn.commit()
+        # Делаем expires_at nullable и проставляем срок существующим записям
+        await async_db.fix_video_links_expiry()
         await update.message.reply_text("✅ Таблица video_links исправлена! Колонка expires_at теперь nullable.")
         
     except Exception as e:
@@ -4255,7 +3951,7 @@ async def update_video_table(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     try:
-        db.update_video_links_table()
+        await async_db.update_video_links_table()
         await update.message.reply_text("✅ Таблица video_links обновлена!")
         
     except Exception as e:
@@ -4271,7 +3967,7 @@ async def fix_video_table(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        db.update_video_links_table()
+        await async_db.update_video_links_table()
         await update.message.reply_text("✅ Таблица video_links обновлена! Колонка base_hash добавлена.")
         
     except Exception as e:
@@ -4287,45 +3983,8 @@ async def recreate_video_table(update: Update, context: ContextTypes.DEFAULT_TYP
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Создаем новую таблицу с правильной структурой
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS video_links_new (
-                link_hash TEXT PRIMARY KEY,
-                user_id BIGINT REFERENCES users(user_id),
-                video_url TEXT NOT NULL,
-                platform TEXT NOT NULL,
-                has_subscription BOOLEAN DEFAULT FALSE,
-                access_started_at TIMESTAMP,
-                expires_at TIMESTAMP,
-                base_hash TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Копируем данные из старой таблицы если она существует
-        cursor.execute('''
-            INSERT INTO video_links_new (link_hash, user_id, video_url, platform, has_subscription, expires_at, created_at)
-            SELECT 
-                link_hash, 
-                user_id,
-                COALESCE(video_url, yandex_link) as video_url,
-                COALESCE(platform, 'youtube') as platform,
-                COALESCE(has_subscription, FALSE) as has_subscription,
-                expires_at,
-                created_at
-            FROM video_links 
-            WHERE link_hash NOT IN (SELECT link_hash FROM video_links_new)
-        ''')
-        
-        # Переименовываем таблицы
-        cursor.execute('DROP TABLE IF EXISTS video_links_old')
-        cursor.execute('ALTER TABLE IF EXISTS video_links RENAME TO video_links_old')
-        cursor.execute('ALTER TABLE video_links_new RENAME TO video_links')
-        
-        conn.commit()
+        # Новая таблица с правильной структурой, данные переносятся из старой
+        await async_db.recreate_video_links_table()
         await update.message.reply_text("✅ Таблица video_links полностью пересоздана с новой структурой!")
         
     except Exception as e:
@@ -4678,12 +4337,27 @@ async def show_paypal_subscription_choice(query, context: ContextTypes.DEFAULT_T
         parse_mode='Markdown'
     )
 
-def send_admin_payment_created_notification(user_id: int, amount: float, subscription_type: str, payment_system: str):
+async def send_admin_telegram_message(text: str) -> bool:
+    """Отправляет сообщение администратору через Bot API (общий async_http_client)"""
+    from http_client import async_http_client
+    from config import BOT_TOKEN
+    
+    telegram_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
+    payload = {
+        "chat_id": 891422895,  # Ваш ID
+        "text": text,
+        "parse_mode": "Markdown"
+    }
+    
+    response = await async_http_client.post(telegram_url, json=payload)
+    if response.status_code != 200:
+        logging.error(f"❌ Failed to send admin notification: {response.status_code}")
+        return False
+    return True
+
+async def send_admin_payment_created_notification(user_id: int, amount: float, subscription_type: str, payment_system: str):
     """Отправляет уведомление администратору о создании платежа"""
     try:
-        import requests
-        from config import BOT_TOKEN
-        
         admin_message = f"""
 🔄 СОЗДАН ПЛАТЕЖ {payment_system.upper()}
 
@@ -4695,19 +4369,8 @@ def send_admin_payment_created_notification(user_id: int, amount: float, subscri
 Ожидание оплаты...
 """
         
-        telegram_url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-        payload = {
-            "chat_id": 891422895,  # Ваш ID
-            "text": admin_message,
-            "parse_mode": "Markdown"
-        }
-        
-        response = requests.post(telegram_url, json=payload, timeout=10)
-        
-        if response.status_code == 200:
+        if await send_admin_telegram_message(admin_message):
             logging.info(f"✅ Admin notification sent for {payment_system} payment creation")
-        else:
-            logging.error(f"❌ Failed to send admin notification: {response.status_code}")
             
     except Exception as e:
         logging.error(f"❌ Error sending admin notification: {e}")
@@ -4735,23 +4398,10 @@ async def handle_paypal_subscription_selection(update: Update, context: ContextT
         duration = SUBSCRIPTION_NAMES[subscription_type]
         
         # ✅ СОХРАНЯЕМ В PENDING_PAYMENTS ДЛЯ PAYPAL
-        try:
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            payment_key = f"paypal_{user_id}_{subscription_type}_{int(datetime.now().timestamp())}"
-            
-            cursor.execute('''
-                INSERT INTO pending_payments (payment_key, user_id, subscription_type, amount, payment_method)
-                VALUES (%s, %s, %s, %s, 'paypal')
-                ON CONFLICT (payment_key) DO NOTHING
-            ''', (payment_key, user_id, subscription_type, float(price)))
-            
-            conn.commit()
-            conn.close()
-            logging.info(f"✅ PayPal pending payment saved: {payment_key} for user {user_id}")
-        except Exception as e:
-            logging.error(f"❌ Error saving PayPal pending payment: {e}")
+        payment_key = f"paypal_{user_id}_{subscription_type}_{int(datetime.now().timestamp())}"
+        await async_db.save_pending_payment(
+            payment_key, user_id, subscription_type, float(price), payment_method='paypal'
+        )
         
         # ✅ СОХРАНЯЕМ В ТАБЛИЦУ PAYMENTS
         try:
@@ -4759,7 +4409,8 @@ async def handle_paypal_subscription_selection(update: Update, context: ContextT
             payment_id = f"paypal_{subscription_type}_{user_id}_{int(datetime.now().timestamp())}"
             
             # Сохраняем с указанием product_type='subscription' и custom_id
-            paypal_processor.save_paypal_payment(
+            await async_db.run(
+                paypal_processor.save_paypal_payment,
                 user_id=user_id,
                 amount=price,
                 payment_id=payment_id,
@@ -4775,7 +4426,7 @@ async def handle_paypal_subscription_selection(update: Update, context: ContextT
         
         # ✅ ОТПРАВЛЯЕМ УВЕДОМЛЕНИЕ АДМИНУ
         try:
-            send_admin_payment_created_notification(user_id, price, subscription_type, "PayPal")
+            await send_admin_payment_created_notification(user_id, price, subscription_type, "PayPal")
         except Exception as e:
             logging.error(f"❌ Error sending admin notification: {e}")
         
@@ -4830,7 +4481,7 @@ async def handle_paypal_payment_check(query, context: ContextTypes.DEFAULT_TYPE)
     user_id = query.from_user.id
     
     # ✅ ЕДИНСТВЕННАЯ ПРОВЕРКА - ЕСТЬ ЛИ АКТИВНАЯ ПОДПИСКА?
-    subscription = db.get_user_subscription(user_id)
+    subscription = await async_db.get_user_subscription(user_id)
     
     if subscription:
         # Подписка есть в базе - значит реальный платеж прошел
@@ -4880,34 +4531,8 @@ async def update_payments_table(update: Update, context: ContextTypes.DEFAULT_TY
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Добавляем недостающие колонки
-        cursor.execute('''
-            DO $$ 
-            BEGIN
-                -- Добавляем payment_method если нет
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='payment_method') THEN
-                    ALTER TABLE payments ADD COLUMN payment_method TEXT DEFAULT 'yookassa';
-                END IF;
-                
-                -- Добавляем product_type если нет
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='product_type') THEN
-                    ALTER TABLE payments ADD COLUMN product_type TEXT DEFAULT 'subscription';
-                END IF;
-                
-                -- Добавляем created_at если нет
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='created_at') THEN
-                    ALTER TABLE payments ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
-                END IF;
-            END $$;
-        ''')
-        
-        conn.commit()
+        await async_db.add_payments_tracking_columns()
         await update.message.reply_text("✅ Таблица payments обновлена! Добавлены колонки payment_method, product_type, created_at")
         
     except Exception as e:
@@ -4970,13 +4595,13 @@ async def manual_subscription(update: Update, context: ContextTypes.DEFAULT_TYPE
             subscription_name = f"{duration_days} дней"
         
         # Получаем информацию о пользователе
-        user_info = db.get_user_info(target_user_id)
+        user_info = await async_db.get_user_info(target_user_id)
         if not user_info:
             await update.message.reply_text(f"❌ Пользователь с ID {target_user_id} не найден")
             return
         
         # Активируем подписку
-        success, message = db.create_manual_subscription(target_user_id, subscription_type, duration_days)
+        success, message = await async_db.create_manual_subscription(target_user_id, subscription_type, duration_days)
         
         if success:
             # Формируем сообщение об успехе
@@ -5055,14 +4680,14 @@ async def user_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     try:
         target_user_id = int(context.args[0])
-        user_data = db.get_user_info(target_user_id)  # Переименуем переменную чтобы не конфликтовать
+        user_data = await async_db.get_user_info(target_user_id)  # Переименуем переменную чтобы не конфликтовать
         
         if not user_data:
             await update.message.reply_text(f"❌ Пользователь с ID {target_user_id} не найден")
             return
         
         # Получаем информацию о подписке
-        subscription = db.get_user_subscription(target_user_id)
+        subscription = await async_db.get_user_subscription(target_user_id)
         
         # Форматируем информацию
         user_display = f"@{user_data['username']}" if user_data['username'] else user_data['first_name'] or f"ID {target_user_id}"
@@ -5110,7 +4735,7 @@ async def show_buy_from_button(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     # Проверяем, покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         # Если уже покупал - сразу отправляем файлы
         await send_deck_files_to_query(query, context, user.id)
         return
@@ -5151,7 +4776,7 @@ async def handle_deck_payment_paypal(query, context: ContextTypes.DEFAULT_TYPE):
     user = query.from_user
     
     # Проверяем, покупал ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         await send_deck_files_to_query(query, context, user.id)
         return
     
@@ -5163,7 +4788,8 @@ async def handle_deck_payment_paypal(query, context: ContextTypes.DEFAULT_TYPE):
     # Сохраняем информацию о платеже в базу ДО оплаты с product_type='deck'
     try:
         from paypal_payment import paypal_processor
-        paypal_processor.save_paypal_payment(
+        await async_db.run(
+            paypal_processor.save_paypal_payment,
             user_id=user.id,
             amount=DECK_PRICE_ILS,
             payment_id=payment_id,
@@ -5222,7 +4848,7 @@ async def handle_paypal_deck_payment_check(query, context: ContextTypes.DEFAULT_
     user = query.from_user
     
     # СНАЧАЛА проверяем, не купил ли пользователь уже колоду
-    if db.has_purchased_deck(user.id):
+    if await async_db.has_purchased_deck(user.id):
         await send_deck_files_to_query(query, context, user.id)
         return
     
@@ -5232,20 +4858,7 @@ async def handle_paypal_deck_payment_check(query, context: ContextTypes.DEFAULT_
     
     # 🔄 АВТОМАТИЧЕСКАЯ АКТИВАЦИЯ ДЛЯ ТЕСТИРОВАНИЯ
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT status, amount FROM payments 
-            WHERE (payment_id = %s OR user_id = %s) 
-            AND product_type = 'deck'
-            AND amount = 80.00
-            ORDER BY created_at DESC 
-            LIMIT 1
-        ''', (payment_id, user.id))
-        
-        result = cursor.fetchone()
-        conn.close()
+        result = await async_db.get_latest_deck_payment(user.id, payment_id)
         
         if result:
             status, amount = result
@@ -5254,10 +4867,10 @@ async def handle_paypal_deck_payment_check(query, context: ContextTypes.DEFAULT_
                 
                 # Активируем покупку
                 from paypal_payment import paypal_processor
-                if paypal_processor.activate_paypal_deck_purchase(user.id):
+                if await async_db.run(paypal_processor.activate_paypal_deck_purchase, user.id):
                     # Обновляем статус платежа (с обработкой ошибки)
                     try:
-                        paypal_processor.update_payment_status(payment_id, 'success')
+                        await async_db.run(paypal_processor.update_payment_status, payment_id, 'success')
                     except Exception as e:
                         logging.error(f"❌ Error updating payment status: {e}")
                         # Продолжаем, даже если не удалось обновить статус
@@ -5300,7 +4913,7 @@ async def update_payments_structure(update: Update, context: ContextTypes.DEFAUL
         return
     
     try:
-        db.update_payments_table_structure()
+        await async_db.update_payments_table_structure()
         await update.message.reply_text("✅ Структура таблицы payments обновлена! subscription_type теперь nullable.")
         
     except Exception as e:
@@ -5311,19 +4924,7 @@ async def view_my_payments(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user = update.effective_user
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT payment_id, product_type, status, amount, currency, created_at 
-            FROM payments 
-            WHERE user_id = %s 
-            ORDER BY created_at DESC 
-            LIMIT 5
-        ''', (user.id,))
-        
-        payments = cursor.fetchall()
-        conn.close()
+        payments = await async_db.get_user_payments(user.id, limit=5)
         
         if not payments:
             await update.message.reply_text("📭 У вас нет активных платежей.")
@@ -5358,32 +4959,8 @@ async def update_database_structure(update: Update, context: ContextTypes.DEFAUL
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Добавляем колонку email если её нет
-        cursor.execute('''
-            DO $$ 
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='users' AND column_name='email') THEN
-                    ALTER TABLE users ADD COLUMN email TEXT;
-                END IF;
-            END $$;
-        ''')
-        
-        # Добавляем колонку customer_email в payments если её нет
-        cursor.execute('''
-            DO $$ 
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='customer_email') THEN
-                    ALTER TABLE payments ADD COLUMN customer_email TEXT;
-                END IF;
-            END $$;
-        ''')
-        
-        conn.commit()
+        # Добавляем колонки email и customer_email, если их нет
+        await async_db.add_email_columns()
         await update.message.reply_text("✅ Структура базы данных обновлена! Добавлены колонки email и customer_email")
         
     except Exception as e:
@@ -5398,25 +4975,7 @@ async def add_phone_column(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            DO $$ 
-            BEGIN
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='users' AND column_name='phone') THEN
-                    ALTER TABLE users ADD COLUMN phone TEXT;
-                END IF;
-                
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='customer_phone') THEN
-                    ALTER TABLE payments ADD COLUMN customer_phone TEXT;
-                END IF;
-            END $$;
-        ''')
-        
-        conn.commit()
+        await async_db.add_phone_columns()
         await update.message.reply_text("✅ Добавлены колонки phone и customer_phone")
         
     except Exception as e:
@@ -5431,7 +4990,7 @@ async def fix_expired_subscriptions(update: Update, context: ContextTypes.DEFAUL
         return
     
     try:
-        expired_count = db.check_and_update_expired_subscriptions()
+        expired_count = await async_db.check_and_update_expired_subscriptions()
         
         if expired_count > 0:
             await update.message.reply_text(f"✅ Обновлено {expired_count} истекших подписок")
@@ -5461,23 +5020,13 @@ async def fix_user_subscription(update: Update, context: ContextTypes.DEFAULT_TY
     
     try:
         # Проверяем и обновляем подписку
-        updated = db.check_user_subscription_expiry(target_user_id)
+        updated = await async_db.check_user_subscription_expiry(target_user_id)
         
         if updated:
             await update.message.reply_text(f"✅ Подписка пользователя {target_user_id} обновлена (истекшая)")
         else:
             # Показываем текущий статус
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT is_premium, premium_until, daily_cards_limit 
-                FROM users 
-                WHERE user_id = %s
-            ''', (target_user_id,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            result = await async_db.get_user_premium_status(target_user_id)
             
             if result:
                 is_premium, premium_until, limit = result
@@ -5504,43 +5053,8 @@ async def add_missing_columns(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Добавляем ВСЕ недостающие колонки
-        cursor.execute('''
-            DO $$ 
-            BEGIN
-                -- В таблице users
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='users' AND column_name='email') THEN
-                    ALTER TABLE users ADD COLUMN email TEXT;
-                END IF;
-                
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='users' AND column_name='phone') THEN
-                    ALTER TABLE users ADD COLUMN phone TEXT;
-                END IF;
-                
-                -- В таблице payments
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='customer_email') THEN
-                    ALTER TABLE payments ADD COLUMN customer_email TEXT;
-                END IF;
-                
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='customer_phone') THEN
-                    ALTER TABLE payments ADD COLUMN customer_phone TEXT;
-                END IF;
-                
-                IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                              WHERE table_name='payments' AND column_name='custom_id') THEN
-                    ALTER TABLE payments ADD COLUMN custom_id TEXT;
-                END IF;
-            END $$;
-        ''')
-        
-        conn.commit()
+        await async_db.add_missing_columns()
         await update.message.reply_text("✅ Добавлены все недостающие колонки в базу!")
         
     except Exception as e:
@@ -5555,19 +5069,8 @@ async def process_unknown_payments(update: Update, context: ContextTypes.DEFAULT
         return
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем необработанные платежи
-        cursor.execute('''
-            SELECT id, payment_id, amount, customer_email, customer_phone, payment_data, payment_date
-            FROM unknown_payments 
-            WHERE processed = FALSE
-            ORDER BY payment_date DESC
-            LIMIT 10
-        ''')
-        
-        payments = cursor.fetchall()
+        payments = await async_db.get_unprocessed_unknown_payments()
         
         if not payments:
             await update.message.reply_text("✅ Нет необработанных платежей")
@@ -5575,7 +5078,7 @@ async def process_unknown_payments(update: Update, context: ContextTypes.DEFAULT
         
         message = "🔄 *Необработанные платежи:*\n\n"
         
-        for i, (record_id, payment_id, amount, email, phone, payment_data_json, payment_date) in enumerate(payments, 1):
+        for i, (record_id, payment_id, amount, email, phone, payment_date) in enumerate(payments, 1):
             message += f"{i}. *ID:* {payment_id}\n"
             message += f"   💰 {amount}₽ | 📧 {email or 'нет'} | 📞 {phone or 'нет'}\n"
             message += f"   📅 {payment_date.strftime('%d.%m.%Y %H:%M')}\n"
@@ -5612,8 +5115,6 @@ async def process_unknown_payments(update: Update, context: ContextTypes.DEFAULT
             
             message = ""  # Сбрасываем для следующего платежа
         
-        conn.close()
-        
     except Exception as e:
         logger.error(f"❌ Error processing unknown payments: {e}")
         await update.message.reply_text(f"❌ Ошибка: {str(e)}")
@@ -5624,30 +5125,16 @@ async def handle_find_by_email(query, context: ContextTypes.DEFAULT_TYPE):
     record_id = query.data.replace("find_by_email_", "")
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем информацию о платеже
-        cursor.execute('''
-            SELECT customer_email FROM unknown_payments WHERE id = %s
-        ''', (record_id,))
-        
-        result = cursor.fetchone()
-        if not result or not result[0]:
+        payment = await async_db.get_unknown_payment(record_id)
+        if not payment or not payment[2]:
             await query.message.reply_text("❌ Email не найден в записи")
             return
         
-        email = result[0]
+        email = payment[2]
         
         # Ищем пользователя по email
-        cursor.execute('''
-            SELECT user_id, username, first_name, last_name 
-            FROM users 
-            WHERE email = %s OR username LIKE %s
-            LIMIT 5
-        ''', (email, f"%{email}%"))
-        
-        users = cursor.fetchall()
+        users = await async_db.search_users_by_email(email)
         
         if users:
             message = f"🔍 *Найдены пользователи по email {email}:*\n\n"
@@ -5682,8 +5169,6 @@ async def handle_find_by_email(query, context: ContextTypes.DEFAULT_TYPE):
                 ])
             )
         
-        conn.close()
-        
     except Exception as e:
         logger.error(f"❌ Error finding by email: {e}")
         await query.message.reply_text(f"❌ Ошибка: {str(e)}")
@@ -5694,33 +5179,16 @@ async def handle_find_by_phone(query, context: ContextTypes.DEFAULT_TYPE):
     record_id = query.data.replace("find_by_phone_", "")
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем информацию о платеже
-        cursor.execute('''
-            SELECT customer_phone FROM unknown_payments WHERE id = %s
-        ''', (record_id,))
-        
-        result = cursor.fetchone()
-        if not result or not result[0]:
+        payment = await async_db.get_unknown_payment(record_id)
+        if not payment or not payment[3]:
             await query.message.reply_text("❌ Телефон не найден в записи")
             return
         
-        phone = result[0]
-        
-        # Очищаем номер от лишних символов
-        clean_phone = ''.join(filter(str.isdigit, phone))
+        phone = payment[3]
         
-        # Ищем пользователя по телефону
-        cursor.execute('''
-            SELECT user_id, username, first_name, last_name, phone
-            FROM users 
-            WHERE phone LIKE %s OR phone LIKE %s
-            LIMIT 5
-        ''', (f"%{clean_phone}%", f"%{phone}%"))
-        
-        users = cursor.fetchall()
+        # Ищем пользователя по телефону (с форматированием и без)
+        users = await async_db.search_users_by_phone(phone)
         
         if users:
             message = f"🔍 *Найдены пользователи по телефону {phone}:*\n\n"
@@ -5755,8 +5223,6 @@ async def handle_find_by_phone(query, context: ContextTypes.DEFAULT_TYPE):
                 ])
             )
         
-        conn.close()
-        
     except Exception as e:
         logger.error(f"❌ Error finding by phone: {e}")
         await query.message.reply_text(f"❌ Ошибка: {str(e)}")
@@ -5767,16 +5233,8 @@ async def handle_process_manually(query, context: ContextTypes.DEFAULT_TYPE):
     record_id = query.data.replace("process_manually_", "")
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем информацию о платеже
-        cursor.execute('''
-            SELECT payment_id, amount, customer_email, customer_phone, payment_date
-            FROM unknown_payments WHERE id = %s
-        ''', (record_id,))
-        
-        result = cursor.fetchone()
+        result = await async_db.get_unknown_payment(record_id)
         if not result:
             await query.message.reply_text("❌ Запись не найдена")
             return
@@ -5816,8 +5274,6 @@ async def handle_process_manually(query, context: ContextTypes.DEFAULT_TYPE):
             reply_markup=InlineKeyboardMarkup(keyboard)
         )
         
-        conn.close()
-        
     except Exception as e:
         logger.error(f"❌ Error starting manual processing: {e}")
         await query.message.reply_text(f"❌ Ошибка: {str(e)}")
@@ -5828,16 +5284,7 @@ async def handle_ignore_payment(query, context: ContextTypes.DEFAULT_TYPE):
     record_id = query.data.replace("ignore_payment_", "")
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE unknown_payments 
-            SET processed = TRUE, status = 'ignored'
-            WHERE id = %s
-        ''', (record_id,))
-        
-        conn.commit()
+        await async_db.mark_unknown_payment_processed(record_id, 'ignored')
         
         await query.message.reply_text(
             f"✅ Платеж {record_id} помечен как игнорируемый",
@@ -5846,8 +5293,6 @@ async def handle_ignore_payment(query, context: ContextTypes.DEFAULT_TYPE):
             ])
         )
         
-        conn.close()
-        
     except Exception as e:
         logger.error(f"❌ Error ignoring payment: {e}")
         await query.message.reply_text(f"❌ Ошибка: {str(e)}")
@@ -5870,11 +5315,7 @@ async def handle_manual_user_id_input(update: Update, context: ContextTypes.DEFA
         amount = float(processing_data['amount'])
         
         # Проверяем существование пользователя
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('SELECT user_id FROM users WHERE user_id = %s', (user_id,))
-        
-        if not cursor.fetchone():
+        if not await async_db.user_exists(user_id):
             await update.message.reply_text(f"❌ Пользователь с ID {user_id} не найден")
             return
         
@@ -5889,18 +5330,11 @@ async def handle_manual_user_id_input(update: Update, context: ContextTypes.DEFA
             return
         
         # Активируем подписку
-        success, message = db.create_manual_subscription(user_id, subscription_type, 30)
+        success, message = await async_db.create_manual_subscription(user_id, subscription_type, 30)
         
         if success:
             # Помечаем платеж как обработанный
-            cursor.execute('''
-                UPDATE unknown_payments 
-                SET processed = TRUE, status = 'manual_processed', processed_by = %s
-                WHERE id = %s
-            ''', (update.effective_user.id, record_id))
-            
-            conn.commit()
-            conn.close()
+            await async_db.mark_unknown_payment_processed(record_id, 'manual_processed', update.effective_user.id)
             
             # Очищаем состояние
             del context.user_data['manual_payment_processing']
@@ -5936,20 +5370,13 @@ async def handle_activate_for_user(query, context: ContextTypes.DEFAULT_TYPE):
     record_id = data_parts[1]
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
         # Получаем информацию о платеже
-        cursor.execute('''
-            SELECT amount FROM unknown_payments WHERE id = %s
-        ''', (record_id,))
-        
-        result = cursor.fetchone()
-        if not result:
+        payment = await async_db.get_unknown_payment(record_id)
+        if not payment:
             await query.message.reply_text("❌ Запись о платеже не найдена")
             return
         
-        amount = float(result[0])
+        amount = float(payment[1])
         
         # Определяем тип подписки
         subscription_type = determine_subscription_type_from_amount(amount)
@@ -5962,17 +5389,11 @@ async def handle_activate_for_user(query, context: ContextTypes.DEFAULT_TYPE):
             return
         
         # Активируем подписку
-        success, message = db.create_manual_subscription(user_id, subscription_type, 30)
+        success, message = await async_db.create_manual_subscription(user_id, subscription_type, 30)
         
         if success:
             # Помечаем платеж как обработанный
-            cursor.execute('''
-                UPDATE unknown_payments 
-                SET processed = TRUE, status = 'auto_processed', processed_by = %s
-                WHERE id = %s
-            ''', (query.from_user.id, record_id))
-            
-            conn.commit()
+            await async_db.mark_unknown_payment_processed(record_id, 'auto_processed', query.from_user.id)
             
             await query.message.reply_text(
                 f"✅ Подписка успешно активирована!\n\n"
@@ -5986,8 +5407,6 @@ async def handle_activate_for_user(query, context: ContextTypes.DEFAULT_TYPE):
             )
         else:
             await query.message.reply_text(f"❌ Ошибка: {message}")
-            
-        conn.close()
         
     except Exception as e:
         logger.error(f"❌ Error activating subscription: {e}")
@@ -6013,36 +5432,7 @@ async def show_unknown_payments(query, context: ContextTypes.DEFAULT_TYPE):
     await query.answer()
     
     try:
-        conn = db.get_connection()
-        cursor = conn.cursor()
-        
-        # Создаем таблицу если её нет
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS unknown_payments (
-                id SERIAL PRIMARY KEY,
-                payment_id TEXT NOT NULL,
-                amount DECIMAL,
-                customer_email TEXT,
-                customer_phone TEXT,
-                payment_data JSONB,
-                payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status TEXT DEFAULT 'pending',
-                processed BOOLEAN DEFAULT FALSE,
-                processed_by BIGINT,
-                processed_at TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            SELECT id, payment_id, amount, customer_email, customer_phone, payment_date
-            FROM unknown_payments 
-            WHERE processed = FALSE
-            ORDER BY payment_date DESC
-            LIMIT 10
-        ''')
-        
-        payments = cursor.fetchall()
-        conn.close()
+        payments = await async_db.get_unprocessed_unknown_payments()
         
         if not payments:
             await query.message.reply_text("✅ Нет необработанных платежей")
@@ -6114,8 +5504,7 @@ async def test_notifications(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     try:
-        import requests
-        from config import BOT_TOKEN
+        import asyncio
         
         test_messages = [
             ("✅ Тест: Успешная подписка ЮKassa", "subscription", "99.00", "RUB", "ЮKassa"),
@@ -6128,15 +5517,15 @@ async def test_notifications(update: Update, context: ContextTypes.DEFAULT_TYPE)
         
         for message, product, amount, currency, system in test_messages:
             if system == "failed":
-                send_admin_notification_failed(891422895, amount, currency, product, "test_id", "Тестовая ошибка")
+                admin_text = admin_payment_failed_text(891422895, amount, currency, product, "test_id", "Тестовая ошибка")
             elif system == "unknown":
-                notify_admin_about_unknown_payment_sync("test_id", amount, "test@example.com", "+123456789", product, currency)
+                admin_text = admin_unknown_payment_text("test_id", amount, "test@example.com", "+123456789", product, currency)
             else:
-                send_admin_notification_successful(891422895, amount, currency, product, "test_id", "test@example.com", system)
+                admin_text = admin_payment_successful_text(891422895, amount, currency, product, "test_id", "test@example.com", system)
             
+            await send_admin_telegram_message(admin_text)
             await update.message.reply_text(f"Отправлено: {message}")
-            import time
-            time.sleep(1)
+            await asyncio.sleep(1)
         
         await update.message.reply_text("✅ Все тестовые уведомления отправлены!")
         
@@ -6159,7 +5548,7 @@ async def test_reminder(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("🔄 Запускаю тестовую отправку напоминаний...")
         
         # Запускаем напоминания
-        result = await send_reminders()
+        result = await send_reminders(context.bot)
         
         await update.message.reply_text("✅ Тестовая отправка напоминаний завершена!")
         
@@ -0,0 +1,128 @@
+# hot_queries.py - SQL горячих запросов: общий для кода бота и query_benchmark.py,
+# чтобы бенчмарк проверял планы именно тех запросов, которые выполняет бот
+
+# DatabaseManager._load_entitlement: (day, user_id)
+ENTITLEMENT_SQL = '''
+    SELECT
+        u.is_premium,
+        u.premium_until,
+        u.daily_cards_limit,
+        u.last_daily_card_date,
+        COALESCE(d.cards, 0),
+        COALESCE(d.messages, 0),
+        u.messages_total
+    FROM users u
+    LEFT JOIN user_daily_usage d ON d.user_id = u.user_id AND d.day = %s
+    WHERE u.user_id = %s
+'''
+
+# DatabaseManager.get_user_subscription: (user_id,)
+USER_SUBSCRIPTION_SQL = '''
+    SELECT subscription_type, end_date
+    FROM subscriptions
+    WHERE user_id = %s AND is_active = TRUE AND end_date > CURRENT_TIMESTAMP
+    ORDER BY end_date DESC
+    LIMIT 1
+'''
+
+# DatabaseManager.get_user_stats: (user_id,)
+USER_STATS_SQL = '''
+    SELECT
+        (SELECT COUNT(*) FROM user_cards WHERE user_id = u.user_id) as total_cards,
+        u.registered_date
+    FROM users u
+    WHERE u.user_id = %s
+'''
+
+# DatabaseManager.get_admin_users_page: {'after': user_id или None, 'limit': размер страницы}.
+# Пользователи без registered_date идут в конце (ключ -infinity), иначе сравнение
+# с NULL выбрасывает их из выдачи; выражение совпадает с индексом idx_users_registered_page
+ADMIN_USERS_PAGE_SQL = '''
+    SELECT u.user_id, u.username, u.first_name, u.registered_date,
+           COALESCE(s.card_count, 0) AS card_count,
+           s.last_drawn AS last_activity
+    FROM users u
+    LEFT JOIN mv_user_card_stats s ON s.user_id = u.user_id
+    WHERE %(after)s IS NULL
+    OR (COALESCE(u.registered_date, '-infinity'::timestamp), u.user_id) < (
+        SELECT COALESCE(registered_date, '-infinity'::timestamp), user_id
+        FROM users WHERE user_id = %(after)s
+    )
+    ORDER BY COALESCE(u.registered_date, '-infinity'::timestamp) DESC, u.user_id DESC
+    LIMIT %(limit)s
+'''
+
+# DatabaseManager.get_reminder_candidates_page: (week_ago, after_user_id, today, today, limit).
+# Не брали карты более 7 дней, не получали напоминание за последние 7 дней
+# и не блокировали бота за последние 30 дней
+REMINDER_CANDIDATES_SQL = '''
+    SELECT u.user_id, u.first_name, u.username, u.last_daily_card_date
+    FROM users u
+    WHERE (u.last_daily_card_date IS NULL OR u.last_daily_card_date < %s)
+    AND u.user_id > %s
+    AND NOT EXISTS (
+        SELECT 1 FROM user_reminders r
+        WHERE r.user_id = u.user_id
+        AND r.reminder_type = 'card_reminder'
+        AND r.reminder_date >= %s - INTERVAL '7 days'
+    )
+    AND NOT EXISTS (
+        SELECT 1 FROM user_action_logs l
+        WHERE l.user_id = u.user_id
+        AND l.action = 'bot_blocked'
+        AND l.created_at >= %s - INTERVAL '30 days'
+    )
+    ORDER BY u.user_id
+    LIMIT %s
+'''
+
+# DatabaseManager.cleanup_expired_video_links
+DELETE_EXPIRED_VIDEO_LINKS_SQL = 'DELETE FROM video_links WHERE expires_at < NOW()'
+
+# PayPalPayment.check_paypal_static_payments
+PAYPAL_STATIC_PAYMENTS_SQL = '''
+    SELECT p.user_id, p.subscription_type, p.payment_date, p.status
+    FROM payments p
+    WHERE p.payment_method = 'paypal'
+    AND p.status = 'success'
+    AND p.payment_date >= NOW() - INTERVAL '10 minutes'
+    AND NOT EXISTS (
+        SELECT 1 FROM subscriptions s
+        WHERE s.user_id = p.user_id
+        AND s.is_active = true
+        AND s.end_date > NOW()
+    )
+'''
+
+# bot.find_user_by_payment_id: (payment_id, payment_id)
+USER_BY_PAYMENT_ID_SQL = '''
+    SELECT user_id FROM payments
+    WHERE yoomoney_payment_id = %s
+    OR payment_id = %s
+    LIMIT 1
+'''
+
+# bot.find_user_by_email: (email,) - индекс idx_users_email_lower
+USER_BY_EMAIL_SQL = 'SELECT user_id FROM users WHERE LOWER(email) = LOWER(%s) LIMIT 1'
+
+# bot.find_user_by_email, поиск по историческим платежам: (email,)
+PAYMENT_USER_BY_EMAIL_SQL = '''
+    SELECT user_id FROM payments
+    WHERE LOWER(customer_email) = LOWER(%s)
+    ORDER BY created_at DESC
+    LIMIT 1
+'''
+
+# bot.find_user_by_phone: (phone,) - индекс idx_users_phone
+USER_BY_PHONE_SQL = 'SELECT user_id FROM users WHERE phone = %s LIMIT 1'
+
+# bot.find_recent_subscription_users: (time_before,)
+RECENT_SUBSCRIPTION_USERS_SQL = '''
+    SELECT DISTINCT user_id, MAX(created_at) as last_action
+    FROM user_action_logs
+    WHERE action IN ('subscription_clicked', 'subscription_selected', 'payment_attempt')
+    AND created_at >= %s
+    GROUP BY user_id
+    ORDER BY last_action DESC
+    LIMIT 5
+'''
@@ -0,0 +1,301 @@
+# http_client.py - общий HTTP клиент для ЮKassa, PayPal и Telegram API
+
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_SIZE, HTTP_RETRIES
+
+# Имена провайдеров для автоматов и метрик
+PROVIDERS = {
+    "api.yookassa.ru": "yookassa",
+    "api-m.paypal.com": "paypal",
+    "api-m.sandbox.paypal.com": "paypal",
+    "api.telegram.org": "telegram",
+}
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Запрос не отправлен: автомат провайдера разомкнут"""
+
+
+class CircuitBreaker:
+    """Автомат: после failure_threshold ошибок подряд запросы к провайдеру
+    не отправляются reset_timeout секунд, затем пропускается один пробный запрос
+    (остальные отклоняются, пока он не завершится)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "open" or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                # Из half-open сразу обратно в open на следующий период
+                self.opened_at = time.monotonic()
+
+
+class LatencyHistogram:
+    """Гистограмма времени ответа (секунды, накопительные корзины)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, error: bool = False):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.count += 1
+            self.total += seconds
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {f"le_{bound}": count for bound, count in zip(self.buckets, self.counts)}
+            buckets["le_inf"] = self.counts[-1]
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "avg": self.total / self.count if self.count else 0.0,
+                "buckets": buckets,
+            }
+
+
+class _ProviderStats:
+    """Автоматы и гистограммы по провайдерам (общие для синхронного и async клиентов)"""
+
+    def __init__(self):
+        self._breakers = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def provider_for(url: str) -> str:
+        host = urlsplit(url).hostname or ""
+        return PROVIDERS.get(host, host)
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker()
+            return self._breakers[provider]
+
+    def histogram(self, provider: str) -> LatencyHistogram:
+        with self._lock:
+            if provider not in self._histograms:
+                self._histograms[provider] = LatencyHistogram()
+            return self._histograms[provider]
+
+    def before(self, provider: str):
+        breaker = self.breaker(provider)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {provider}")
+        return breaker
+
+    def after(self, provider: str, breaker: CircuitBreaker, started: float, status_code: int = None):
+        failed = status_code is None or status_code >= 500
+        self.histogram(provider).observe(time.monotonic() - started, error=failed)
+        if failed:
+            breaker.record_failure()
+            if breaker.state == "open":
+                logging.warning(f"⚠️ Circuit opened for {provider}")
+        else:
+            breaker.record_success()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            providers = set(self._breakers) | set(self._histograms)
+        return {
+            provider: dict(self.histogram(provider).snapshot(), circuit=self.breaker(provider).state)
+            for provider in sorted(providers)
+        }
+
+
+stats = _ProviderStats()
+
+
+class HttpClient:
+    """Синхронный клиент на requests.Session.
+
+    - keep-alive пулы соединений по хостам (без нового TCP+TLS на каждый запрос)
+    - таймауты (connect, read) по умолчанию
+    - повторы с backoff для идемпотентных запросов; POST повторяется,
+      только если передан idempotent=True (например, с Idempotence-Key)
+    - автомат и гистограмма задержек по провайдеру
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT, retries: int = HTTP_RETRIES, backoff_factor: float = 0.5):
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,  # отбор идемпотентных запросов - в request()
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._retry_session = self._make_session(pool_size, retry)
+        self._session = self._make_session(pool_size, Retry(total=0, raise_on_status=False))
+
+    @staticmethod
+    def _make_session(pool_size, retry):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(PROVIDERS), pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def request(self, method: str, url: str, provider: str = None, idempotent: bool = None,
+                timeout=None, **kwargs) -> requests.Response:
+        method = method.upper()
+        provider = provider or stats.provider_for(url)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        breaker = stats.before(provider)
+        session = self._retry_session if idempotent else self._session
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            stats.after(provider, breaker, started)
+            raise
+        stats.after(provider, breaker, started, response.status_code)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self._retry_session.close()
+        self._session.close()
+
+
+class AsyncHttpClient:
+    """Асинхронный клиент на httpx для кода бота (event loop PTB).
+
+    Те же таймауты, автоматы и метрики, что у HttpClient. Повторы - один цикл
+    в request(): идемпотентные запросы повторяются при ошибках и статусах
+    RETRY_STATUSES, остальные - только если соединение не установлено.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT, retries: int = HTTP_RETRIES, backoff_factor: float = 0.5):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._client = None
+
+    def _get_client(self):
+        # Создается в работающем event loop при первом запросе
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, provider: str = None, idempotent: bool = None, **kwargs):
+        import asyncio
+        import httpx
+
+        method = method.upper()
+        provider = provider or stats.provider_for(url)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self.retries + 1
+
+        for attempt in range(attempts):
+            breaker = stats.before(provider)
+            started = time.monotonic()
+            try:
+                response = await self._get_client().request(method, url, **kwargs)
+            except Exception as e:
+                stats.after(provider, breaker, started)
+                # Соединение не установлено - запрос не отправлен, повтор безопасен и для POST
+                not_sent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt + 1 >= attempts or not (idempotent or not_sent):
+                    raise
+            else:
+                stats.after(provider, breaker, started, response.status_code)
+                if not idempotent or response.status_code not in RETRY_STATUSES or attempt + 1 >= attempts:
+                    return response
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def get_stats() -> dict:
+    """Метрики внешних запросов по провайдерам"""
+    return stats.get_stats()
+
+
+# Глобальные экземпляры
+http_client = HttpClient()
+async_http_client = AsyncHttpClient()
@@ -0,0 +1,336 @@
+-- Схема, которая раньше создавалась в init_database и по ходу работы бота.
+-- Все операторы идемпотентны: миграция применяется и к новой базе,
+-- и к базе, где эти таблицы уже созданы старой версией.
+
+-- Пользователи (daily_cards_limit по умолчанию = DAILY_CARD_LIMIT_FREE)
+CREATE TABLE IF NOT EXISTS users (
+    user_id BIGINT PRIMARY KEY,
+    username TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    registered_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    daily_cards_limit INTEGER DEFAULT 1,
+    last_daily_card_date DATE,
+    is_premium BOOLEAN DEFAULT FALSE
+);
+
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS email TEXT,
+    ADD COLUMN IF NOT EXISTS phone TEXT,
+    ADD COLUMN IF NOT EXISTS is_premium BOOLEAN DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS premium_until TIMESTAMP;
+
+-- Карты
+CREATE TABLE IF NOT EXISTS cards (
+    card_id INTEGER PRIMARY KEY,
+    card_name TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    description_text TEXT NOT NULL
+);
+
+-- История выданных карт
+CREATE TABLE IF NOT EXISTS user_cards (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    card_id INTEGER REFERENCES cards(card_id),
+    drawn_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_date ON user_cards(user_id, drawn_date);
+
+-- Подписки
+CREATE TABLE IF NOT EXISTS subscriptions (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    subscription_type TEXT NOT NULL,
+    start_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    end_date TIMESTAMP NOT NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    payment_id TEXT
+);
+
+-- Платежи
+CREATE TABLE IF NOT EXISTS payments (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    amount DECIMAL NOT NULL,
+    currency TEXT DEFAULT 'RUB',
+    subscription_type TEXT,
+    product_type TEXT DEFAULT 'subscription',
+    payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status TEXT DEFAULT 'pending',
+    payment_method TEXT DEFAULT 'yookassa',
+    yoomoney_payment_id TEXT,
+    payment_id TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE payments
+    ADD COLUMN IF NOT EXISTS payment_method TEXT DEFAULT 'yookassa',
+    ADD COLUMN IF NOT EXISTS product_type TEXT DEFAULT 'subscription',
+    ADD COLUMN IF NOT EXISTS created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS payment_id TEXT,
+    ADD COLUMN IF NOT EXISTS customer_email TEXT,
+    ADD COLUMN IF NOT EXISTS customer_phone TEXT,
+    ADD COLUMN IF NOT EXISTS custom_id TEXT;
+
+ALTER TABLE payments ALTER COLUMN subscription_type DROP NOT NULL;
+
+-- Логи действий пользователей
+CREATE TABLE IF NOT EXISTS user_action_logs (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    action TEXT NOT NULL,
+    action_data TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Выбор подписки (поиск пользователя по платежу без metadata)
+CREATE TABLE IF NOT EXISTS user_actions (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT,
+    action_type TEXT,
+    action_data JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Послания дня и история посланий
+CREATE TABLE IF NOT EXISTS daily_messages (
+    message_id INTEGER PRIMARY KEY,
+    image_url TEXT NOT NULL,
+    message_text TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS user_messages (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    message_id INTEGER REFERENCES daily_messages(message_id),
+    drawn_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS deck_purchases (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    purchase_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    payment_id TEXT,
+    status TEXT DEFAULT 'completed',
+    amount DECIMAL DEFAULT 999.00
+);
+
+-- Медитации: история просмотров и общий доступ по base_hash
+CREATE TABLE IF NOT EXISTS user_meditations (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    watched_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS meditation_access (
+    base_hash TEXT PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    access_started_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Видео ссылки
+CREATE TABLE IF NOT EXISTS video_links (
+    link_hash TEXT PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    video_url TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    has_subscription BOOLEAN DEFAULT FALSE,
+    access_started_at TIMESTAMP,
+    expires_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE video_links ALTER COLUMN expires_at DROP NOT NULL;
+
+ALTER TABLE video_links
+    ADD COLUMN IF NOT EXISTS video_url TEXT,
+    ADD COLUMN IF NOT EXISTS platform TEXT,
+    ADD COLUMN IF NOT EXISTS has_subscription BOOLEAN DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS access_started_at TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS base_hash TEXT;
+
+-- Старая колонка yandex_link: делаем nullable и переносим ссылки в video_url
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'video_links' AND column_name = 'yandex_link') THEN
+        ALTER TABLE video_links ALTER COLUMN yandex_link DROP NOT NULL;
+        UPDATE video_links
+        SET video_url = yandex_link
+        WHERE video_url IS NULL AND yandex_link IS NOT NULL;
+    END IF;
+END $$;
+
+-- Отправленные напоминания
+CREATE TABLE IF NOT EXISTS user_reminders (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    reminder_date DATE NOT NULL,
+    reminder_type TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(user_id, reminder_date, reminder_type)
+);
+
+-- Прогресс массовых рассылок (для продолжения после падения)
+CREATE TABLE IF NOT EXISTS broadcast_runs (
+    id SERIAL PRIMARY KEY,
+    run_key TEXT UNIQUE NOT NULL,
+    status TEXT DEFAULT 'running',
+    last_user_id BIGINT DEFAULT 0,
+    sent_count INTEGER DEFAULT 0,
+    blocked_count INTEGER DEFAULT 0,
+    failed_count INTEGER DEFAULT 0,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Платежи по ссылкам
+CREATE TABLE IF NOT EXISTS payment_tracking (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(user_id),
+    subscription_type TEXT,
+    amount DECIMAL,
+    payment_link TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    payment_id TEXT,
+    status TEXT DEFAULT 'pending'
+);
+
+CREATE TABLE IF NOT EXISTS pending_payments (
+    id SERIAL PRIMARY KEY,
+    payment_key TEXT UNIQUE,
+    user_id BIGINT,
+    subscription_type TEXT,
+    amount DECIMAL,
+    payment_method TEXT DEFAULT 'yookassa',
+    status TEXT DEFAULT 'pending',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+ALTER TABLE pending_payments
+    ADD COLUMN IF NOT EXISTS payment_method TEXT DEFAULT 'yookassa',
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+
+-- Платежи без найденного пользователя (ручная обработка)
+CREATE TABLE IF NOT EXISTS unknown_payments (
+    id SERIAL PRIMARY KEY,
+    payment_id TEXT NOT NULL,
+    amount DECIMAL,
+    customer_email TEXT,
+    customer_phone TEXT,
+    payment_data JSONB,
+    payment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status TEXT DEFAULT 'pending',
+    processed BOOLEAN DEFAULT FALSE,
+    processed_by BIGINT,
+    processed_at TIMESTAMP
+);
+
+ALTER TABLE unknown_payments
+    ADD COLUMN IF NOT EXISTS processed_by BIGINT,
+    ADD COLUMN IF NOT EXISTS processed_at TIMESTAMP;
+
+-- Очередь платежных событий от вебхуков (см. payment_events.py)
+CREATE TABLE IF NOT EXISTS payment_events (
+    id BIGSERIAL PRIMARY KEY,
+    provider TEXT NOT NULL,
+    event_type TEXT,
+    idempotency_key TEXT UNIQUE NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    attempts INTEGER DEFAULT 0,
+    last_error TEXT,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    processed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_payment_events_pending
+    ON payment_events(next_attempt_at)
+    WHERE status = 'pending';
+
+-- Индекс сопоставления платежей с пользователями (ожидаемые платежи)
+CREATE TABLE IF NOT EXISTS payment_correlations (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    provider TEXT NOT NULL,
+    provider_payment_id TEXT,
+    internal_payment_id TEXT,
+    email_norm TEXT,
+    phone_norm TEXT,
+    expected_amount DECIMAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    matched_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_payment_corr_provider_id
+    ON payment_correlations(provider_payment_id)
+    WHERE provider_payment_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_payment_corr_internal_id
+    ON payment_correlations(internal_payment_id)
+    WHERE internal_payment_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_payment_corr_email
+    ON payment_correlations(email_norm, created_at DESC)
+    WHERE email_norm IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_payment_corr_phone
+    ON payment_correlations(phone_norm, created_at DESC)
+    WHERE phone_norm IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_payment_corr_amount
+    ON payment_correlations(provider, expected_amount, created_at DESC)
+    WHERE matched_at IS NULL;
+
+-- file_id картинок карт в Telegram (см. card_media.py)
+CREATE TABLE IF NOT EXISTS card_media (
+    image_url TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    file_unique_id TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Служебные значения приложения (хэш синхронизированной колоды и т.п.)
+CREATE TABLE IF NOT EXISTS app_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Общий для всех процессов кэш OAuth токенов (PayPal)
+CREATE TABLE IF NOT EXISTS oauth_tokens (
+    provider TEXT PRIMARY KEY,
+    access_token TEXT NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Статистика для администратора (обновляется задачей admin_stats_refresh)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_card_stats AS
+SELECT user_id, COUNT(*) AS card_count, MAX(drawn_date) AS last_drawn
+FROM user_cards
+GROUP BY user_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_user_card_stats_user ON mv_user_card_stats(user_id);
+CREATE INDEX IF NOT EXISTS idx_mv_user_card_stats_count ON mv_user_card_stats(card_count DESC);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_admin_stats AS
+SELECT 1 AS id,
+    (SELECT COUNT(*) FROM users) AS total_users,
+    (SELECT COUNT(*) FROM user_cards) AS total_cards_issued,
+    (SELECT COUNT(*) FROM cards) AS total_cards_in_deck,
+    (SELECT COUNT(DISTINCT user_id) FROM user_cards
+     WHERE drawn_date >= CURRENT_DATE - INTERVAL '7 days') AS active_users,
+    (SELECT COUNT(*) FROM users
+     WHERE registered_date >= CURRENT_DATE - INTERVAL '7 days') AS new_users,
+    NOW() AS refreshed_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_admin_stats_id ON mv_admin_stats(id);
+
+-- Постраничный список пользователей (/users) по ключу (registered_date, user_id)
+CREATE INDEX IF NOT EXISTS idx_users_registered ON users(registered_date DESC, user_id DESC);
@@ -0,0 +1,111 @@
+-- Счетчики использования по дням: проверка лимитов - чтение одной строки по ключу
+CREATE TABLE IF NOT EXISTS user_daily_usage (
+    user_id BIGINT REFERENCES users(user_id),
+    day DATE NOT NULL,
+    cards INTEGER NOT NULL DEFAULT 0,
+    messages INTEGER NOT NULL DEFAULT 0,
+    meditations INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
+
+-- Всего посланий за все время (лимит бесплатного тарифа)
+ALTER TABLE users ADD COLUMN IF NOT EXISTS messages_total INTEGER NOT NULL DEFAULT 0;
+
+-- Заполняем счетчики по существующей истории
+INSERT INTO user_daily_usage (user_id, day, cards, messages, meditations)
+SELECT user_id, day, SUM(cards), SUM(messages), SUM(meditations)
+FROM (
+    SELECT user_id, drawn_date::date AS day, 1 AS cards, 0 AS messages, 0 AS meditations
+    FROM user_cards
+    UNION ALL
+    SELECT user_id, drawn_date::date, 0, 1, 0 FROM user_messages
+    UNION ALL
+    SELECT user_id, watched_date::date, 0, 0, 1 FROM user_meditations
+) history
+WHERE user_id IS NOT NULL AND day IS NOT NULL
+GROUP BY user_id, day
+ON CONFLICT (user_id, day) DO NOTHING;
+
+UPDATE users u
+SET messages_total = m.total
+FROM (
+    SELECT user_id, COUNT(*) AS total FROM user_messages GROUP BY user_id
+) m
+WHERE m.user_id = u.user_id;
+
+-- Выдача карты дня одной транзакцией: проверка подписки и лимита,
+-- обновление last_daily_card_date, запись в историю и в счетчик дня
+CREATE OR REPLACE FUNCTION draw_daily_card(
+    p_user_id BIGINT,
+    p_card_id INTEGER,
+    p_free_limit INTEGER,
+    p_today DATE,
+    p_now TIMESTAMP
+)
+RETURNS TABLE (allowed BOOLEAN, cards_today INTEGER, cards_limit INTEGER)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_last_date DATE;
+    v_limit INTEGER;
+    v_is_premium BOOLEAN;
+    v_premium_until TIMESTAMP;
+    v_count INTEGER;
+BEGIN
+    -- Блокируем строку пользователя: двойное нажатие ждёт первую выдачу
+    SELECT u.last_daily_card_date, u.daily_cards_limit, u.is_premium, u.premium_until
+    INTO v_last_date, v_limit, v_is_premium, v_premium_until
+    FROM users u
+    WHERE u.user_id = p_user_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    -- Истекшая подписка - переводим на бесплатный тариф
+    IF v_is_premium AND v_premium_until IS NOT NULL AND v_premium_until < p_now THEN
+        UPDATE users
+        SET is_premium = FALSE, daily_cards_limit = p_free_limit, premium_until = NULL
+        WHERE user_id = p_user_id;
+
+        UPDATE subscriptions
+        SET is_active = FALSE
+        WHERE user_id = p_user_id AND is_active = TRUE;
+
+        v_is_premium := FALSE;
+        v_premium_until := NULL;
+        v_limit := p_free_limit;
+    END IF;
+
+    IF COALESCE(v_is_premium, FALSE) AND v_premium_until IS NOT NULL
+       AND v_premium_until::date >= p_today AND COALESCE(v_limit, 1) > 1 THEN
+        cards_limit := v_limit;
+    ELSE
+        cards_limit := 1;
+    END IF;
+
+    IF v_last_date IS NULL OR v_last_date < p_today THEN
+        v_count := 0;
+    ELSIF cards_limit > 1 THEN
+        SELECT COALESCE(MAX(d.cards), 0) INTO v_count
+        FROM user_daily_usage d
+        WHERE d.user_id = p_user_id AND d.day = p_today;
+    ELSE
+        -- Бесплатная карта на сегодня уже получена
+        v_count := cards_limit;
+    END IF;
+
+    allowed := v_count < cards_limit;
+    cards_today := v_count;
+
+    IF allowed THEN
+        UPDATE users SET last_daily_card_date = p_today WHERE user_id = p_user_id;
+        INSERT INTO user_cards (user_id, card_id) VALUES (p_user_id, p_card_id);
+        INSERT INTO user_daily_usage AS d (user_id, day, cards) VALUES (p_user_id, p_today, 1)
+        ON CONFLICT (user_id, day) DO UPDATE SET cards = d.cards + 1;
+        cards_today := v_count + 1;
+    END IF;
+
+    RETURN NEXT;
+END;
+$$;
@@ -0,0 +1,43 @@
+-- migrate: no-transaction
+-- Индексы под горячие запросы (планы проверяются query_benchmark.py).
+-- CONCURRENTLY не блокирует запись в таблицы на время построения индекса.
+-- Индекс, оставшийся INVALID после неудачной попытки, schema_migrations
+-- удаляет перед повторным построением.
+
+-- check_paypal_static_payments: payment_method = 'paypal' AND status = 'success' AND payment_date >= ...
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_method_status_date
+    ON payments(payment_method, status, payment_date);
+
+-- find_user_by_payment_id, update_payment_status_in_db
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_yoomoney_payment_id
+    ON payments(yoomoney_payment_id)
+    WHERE yoomoney_payment_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_payment_id
+    ON payments(payment_id)
+    WHERE payment_id IS NOT NULL;
+
+-- find_user_by_email: последний платеж с этим email
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_customer_email
+    ON payments(LOWER(customer_email), created_at DESC)
+    WHERE customer_email IS NOT NULL;
+
+-- find_recent_subscription_users, исключение заблокировавших бота в iter_reminder_candidates
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_action_logs_action_created
+    ON user_action_logs(action, created_at);
+
+-- cleanup_expired_video_links
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_links_expires_at
+    ON video_links(expires_at)
+    WHERE expires_at IS NOT NULL;
+
+-- get_user_subscription и проверки действующей подписки
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subscriptions_user_active_end
+    ON subscriptions(user_id, is_active, end_date);
+
+-- Поиск пользователя по контактам из платежа
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower
+    ON users(LOWER(email))
+    WHERE email IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_phone
+    ON users(phone)
+    WHERE phone IS NOT NULL;
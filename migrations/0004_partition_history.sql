@@ -0,0 +1,140 @@
+-- Помесячное секционирование таблиц истории.
+-- Запросы за сегодня / 7 / 30 дней читают только свежие секции, старые
+-- секции отсоединяются или удаляются целиком (maintain_history_partitions).
+
+-- Отсоединенные старые секции (HISTORY_RETENTION_ACTION = "detach")
+CREATE SCHEMA IF NOT EXISTS history_archive;
+
+-- Секция таблицы p_table за месяц p_month: <таблица>_pYYYYMM
+CREATE OR REPLACE FUNCTION create_monthly_partition(p_table TEXT, p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::date;
+    v_name TEXT := format('%s_p%s', p_table, to_char(v_start, 'YYYYMM'));
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, p_table, v_start, (v_start + INTERVAL '1 month')::date
+    );
+    RETURN v_name;
+END;
+$$;
+
+-- Представления статистики зависят от user_cards - пересоздаются ниже
+DROP MATERIALIZED VIEW IF EXISTS mv_admin_stats;
+DROP MATERIALIZED VIEW IF EXISTS mv_user_card_stats;
+
+DO $$
+DECLARE
+    t RECORD;
+    v_old TEXT;
+    v_seq TEXT;
+    v_min DATE;
+    v_max DATE;
+    v_month DATE;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('user_cards', 'drawn_date'),
+        ('user_messages', 'drawn_date'),
+        ('user_action_logs', 'created_at'),
+        ('user_reminders', 'reminder_date'),
+        ('user_meditations', 'watched_date')
+    ) AS v(tbl, col)
+    LOOP
+        -- Уже секционирована
+        IF EXISTS (
+            SELECT 1 FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = t.tbl
+        ) THEN
+            CONTINUE;
+        END IF;
+
+        v_old := t.tbl || '_unpartitioned';
+        v_seq := pg_get_serial_sequence(t.tbl, 'id');
+
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', t.tbl, v_old);
+        EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS) PARTITION BY RANGE (%I)',
+                       t.tbl, v_old, t.col);
+        -- Строки без даты (если есть) попадают в секцию по умолчанию
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', t.tbl || '_default', t.tbl);
+
+        -- Секции на весь период существующих данных и на 3 месяца вперед
+        EXECUTE format('SELECT MIN(%I)::date, MAX(%I)::date FROM %I', t.col, t.col, v_old)
+            INTO v_min, v_max;
+        v_month := date_trunc('month', LEAST(COALESCE(v_min, CURRENT_DATE), CURRENT_DATE))::date;
+        WHILE v_month <= date_trunc('month', GREATEST(COALESCE(v_max, CURRENT_DATE), CURRENT_DATE))
+                         + INTERVAL '3 months' LOOP
+            PERFORM create_monthly_partition(t.tbl, v_month);
+            v_month := (v_month + INTERVAL '1 month')::date;
+        END LOOP;
+
+        EXECUTE format('UPDATE %I SET %I = %L WHERE %I IS NULL', v_old, t.col, '1970-01-01', t.col);
+        EXECUTE format('INSERT INTO %I SELECT * FROM %I', t.tbl, v_old);
+
+        -- Последовательность id переходит к новой таблице, старая удаляется
+        IF v_seq IS NOT NULL THEN
+            EXECUTE format('ALTER SEQUENCE %s OWNED BY %I.id', v_seq, t.tbl);
+        END IF;
+        EXECUTE format('DROP TABLE %I', v_old);
+
+        -- Первичный ключ секционированной таблицы должен включать ключ секционирования
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET NOT NULL', t.tbl, t.col);
+        EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, %I)', t.tbl, t.col);
+    END LOOP;
+END $$;
+
+-- Ограничения и индексы (создаются на родительской таблице и наследуются секциями)
+ALTER TABLE user_cards DROP CONSTRAINT IF EXISTS user_cards_user_id_fkey;
+ALTER TABLE user_cards ADD CONSTRAINT user_cards_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(user_id);
+ALTER TABLE user_cards DROP CONSTRAINT IF EXISTS user_cards_card_id_fkey;
+ALTER TABLE user_cards ADD CONSTRAINT user_cards_card_id_fkey
+    FOREIGN KEY (card_id) REFERENCES cards(card_id);
+CREATE INDEX IF NOT EXISTS idx_user_date ON user_cards(user_id, drawn_date);
+
+ALTER TABLE user_messages DROP CONSTRAINT IF EXISTS user_messages_user_id_fkey;
+ALTER TABLE user_messages ADD CONSTRAINT user_messages_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(user_id);
+ALTER TABLE user_messages DROP CONSTRAINT IF EXISTS user_messages_message_id_fkey;
+ALTER TABLE user_messages ADD CONSTRAINT user_messages_message_id_fkey
+    FOREIGN KEY (message_id) REFERENCES daily_messages(message_id);
+CREATE INDEX IF NOT EXISTS idx_user_messages_user_date ON user_messages(user_id, drawn_date);
+
+-- Логи без внешнего ключа: запись действия не должна падать из-за пользователя
+CREATE INDEX IF NOT EXISTS idx_user_action_logs_action_created ON user_action_logs(action, created_at);
+
+ALTER TABLE user_reminders DROP CONSTRAINT IF EXISTS user_reminders_user_id_fkey;
+ALTER TABLE user_reminders ADD CONSTRAINT user_reminders_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(user_id);
+ALTER TABLE user_reminders DROP CONSTRAINT IF EXISTS user_reminders_user_id_reminder_date_reminder_type_key;
+ALTER TABLE user_reminders ADD CONSTRAINT user_reminders_user_id_reminder_date_reminder_type_key
+    UNIQUE (user_id, reminder_date, reminder_type);
+
+ALTER TABLE user_meditations DROP CONSTRAINT IF EXISTS user_meditations_user_id_fkey;
+ALTER TABLE user_meditations ADD CONSTRAINT user_meditations_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_meditations_user ON user_meditations(user_id);
+
+-- Статистика для администратора (как в 0001_baseline)
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_user_card_stats AS
+SELECT user_id, COUNT(*) AS card_count, MAX(drawn_date) AS last_drawn
+FROM user_cards
+GROUP BY user_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_user_card_stats_user ON mv_user_card_stats(user_id);
+CREATE INDEX IF NOT EXISTS idx_mv_user_card_stats_count ON mv_user_card_stats(card_count DESC);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_admin_stats AS
+SELECT 1 AS id,
+    (SELECT COUNT(*) FROM users) AS total_users,
+    (SELECT COUNT(*) FROM user_cards) AS total_cards_issued,
+    (SELECT COUNT(*) FROM cards) AS total_cards_in_deck,
+    (SELECT COUNT(DISTINCT user_id) FROM user_cards
+     WHERE drawn_date >= CURRENT_DATE - INTERVAL '7 days') AS active_users,
+    (SELECT COUNT(*) FROM users
+     WHERE registered_date >= CURRENT_DATE - INTERVAL '7 days') AS new_users,
+    NOW() AS refreshed_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_admin_stats_id ON mv_admin_stats(id);
@@ -0,0 +1,56 @@
+-- Создание секции, когда строки ее месяца уже лежат в секции по умолчанию.
+-- Иначе CREATE TABLE ... PARTITION OF падает с ошибкой
+-- "updated partition constraint for default partition would be violated".
+-- Секция по умолчанию отсоединяется, создается новая секция, строки ее
+-- диапазона переносятся в нее, и секция по умолчанию присоединяется обратно.
+
+CREATE OR REPLACE FUNCTION create_monthly_partition(p_table TEXT, p_month DATE)
+RETURNS TEXT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_start DATE := date_trunc('month', p_month)::date;
+    v_end DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+    v_name TEXT := format('%s_p%s', p_table, to_char(v_start, 'YYYYMM'));
+    v_default TEXT := p_table || '_default';
+    v_column TEXT;
+    v_has_rows BOOLEAN := FALSE;
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN v_name;
+    END IF;
+
+    -- Ключ секционирования (drawn_date, created_at, ...)
+    SELECT a.attname INTO v_column
+    FROM pg_partitioned_table pt
+    JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = p_table::regclass;
+
+    IF to_regclass(v_default) IS NOT NULL THEN
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE %I >= %L AND %I < %L)',
+                       v_default, v_column, v_start, v_column, v_end)
+            INTO v_has_rows;
+    END IF;
+
+    IF NOT v_has_rows THEN
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            v_name, p_table, v_start, v_end
+        );
+        RETURN v_name;
+    END IF;
+
+    EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', p_table, v_default);
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, p_table, v_start, v_end
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        v_default, v_column, v_start, v_column, v_end, p_table
+    );
+    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', p_table, v_default);
+
+    RETURN v_name;
+END;
+$$;
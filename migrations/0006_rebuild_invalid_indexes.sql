@@ -0,0 +1,35 @@
+-- migrate: no-transaction
+-- Повторное построение индексов из 0003_hot_query_indexes. Если первая попытка
+-- CREATE INDEX CONCURRENTLY прервалась, индекс остался INVALID, а повтор с
+-- IF NOT EXISTS его пропустил - миграция записана примененной, но индекс не
+-- используется. schema_migrations удаляет такие индексы перед каждым
+-- CREATE INDEX CONCURRENTLY IF NOT EXISTS, поэтому здесь они строятся заново.
+-- user_action_logs не нужен: после 0004_partition_history его индексы новые.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_method_status_date
+    ON payments(payment_method, status, payment_date);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_yoomoney_payment_id
+    ON payments(yoomoney_payment_id)
+    WHERE yoomoney_payment_id IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_payment_id
+    ON payments(payment_id)
+    WHERE payment_id IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payments_customer_email
+    ON payments(LOWER(customer_email), created_at DESC)
+    WHERE customer_email IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_video_links_expires_at
+    ON video_links(expires_at)
+    WHERE expires_at IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subscriptions_user_active_end
+    ON subscriptions(user_id, is_active, end_date);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower
+    ON users(LOWER(email))
+    WHERE email IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_phone
+    ON users(phone)
+    WHERE phone IS NOT NULL;
@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Постраничный список пользователей (/users) сортируется по
+-- COALESCE(registered_date, '-infinity'), чтобы пользователи без даты
+-- регистрации не пропадали и не повторялись между страницами.
+-- Индекс по выражению заменяет idx_users_registered из 0001_baseline.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_registered_page
+    ON users((COALESCE(registered_date, '-infinity'::timestamp)) DESC, user_id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_registered;
@@ -0,0 +1,10 @@
+-- Платежи провайдеров, по которым уже выдана подписка или колода.
+-- Запись делается в той же транзакции, что и активация, поэтому повторная
+-- обработка события из payment_events (повтор после ошибки, requeue_stale)
+-- не продлевает подписку второй раз.
+CREATE TABLE IF NOT EXISTS processed_payments (
+    payment_key TEXT PRIMARY KEY,
+    user_id BIGINT NOT NULL,
+    product_type TEXT NOT NULL,
+    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,206 @@
+# payment_events.py - очередь платежных событий (вебхуки -> таблица -> один обработчик)
+
+import json
+import logging
+import threading
+
+from database import db
+
+
+class PaymentEventQueue:
+    """Надежная очередь платежных событий в таблице payment_events.
+
+    Вебхук только сохраняет событие (повтор с тем же idempotency_key игнорируется)
+    и будит обработчик. Единственный поток-обработчик забирает события через
+    FOR UPDATE SKIP LOCKED и передает их в handler(provider, event_type, payload),
+    который возвращает True при успехе. Неудачные события повторяются с задержкой,
+    после max_attempts помечаются failed.
+    """
+
+    def __init__(self, db, max_attempts=5, batch_size=10, poll_interval=5.0, retry_delay=30):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.handler = None
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'enqueued': 0, 'duplicates': 0, 'processed': 0, 'retried': 0, 'failed': 0}
+
+    def set_handler(self, handler):
+        self.handler = handler
+
+    def enqueue(self, provider: str, event_type: str, idempotency_key: str, payload: dict) -> bool:
+        """Сохраняет событие; возвращает False, если такое событие уже было"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                INSERT INTO payment_events (provider, event_type, idempotency_key, payload)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (idempotency_key) DO NOTHING
+            ''', (provider, event_type, idempotency_key, json.dumps(payload)))
+
+            inserted = cursor.rowcount > 0
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        if inserted:
+            self._stats['enqueued'] += 1
+            self._wakeup.set()
+            logging.info(f"📥 Payment event queued: {provider} {event_type} ({idempotency_key})")
+        else:
+            self._stats['duplicates'] += 1
+            logging.info(f"ℹ️ Duplicate payment event ignored: {idempotency_key}")
+        return inserted
+
+    def _claim_batch(self):
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                UPDATE payment_events
+                SET status = 'processing', attempts = attempts + 1, updated_at = NOW()
+                WHERE id IN (
+                    SELECT id FROM payment_events
+                    WHERE status = 'pending' AND next_attempt_at <= NOW()
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, provider, event_type, payload, attempts
+            ''', (self.batch_size,))
+
+            events = cursor.fetchall()
+            conn.commit()
+            return sorted(events)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _finish(self, event_id: int, attempts: int, success: bool, error: str = None):
+        if success:
+            status, delay = 'done', 0
+        elif attempts >= self.max_attempts:
+            status, delay = 'failed', 0
+        else:
+            status, delay = 'pending', self.retry_delay * attempts
+
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                UPDATE payment_events
+                SET status = %s,
+                    last_error = %s,
+                    next_attempt_at = NOW() + %s * INTERVAL '1 second',
+                    processed_at = CASE WHEN %s = 'done' THEN NOW() ELSE processed_at END,
+                    updated_at = NOW()
+                WHERE id = %s
+            ''', (status, error, delay, status, event_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+        if status == 'done':
+            self._stats['processed'] += 1
+        elif status == 'failed':
+            self._stats['failed'] += 1
+            logging.error(f"❌ Payment event {event_id} failed after {attempts} attempts: {error}")
+        else:
+            self._stats['retried'] += 1
+            logging.warning(f"⚠️ Payment event {event_id} will be retried in {delay}s: {error}")
+
+    def process_pending(self) -> int:
+        """Обрабатывает все готовые к обработке события; возвращает их количество"""
+        processed = 0
+        while True:
+            events = self._claim_batch()
+            if not events:
+                return processed
+
+            for event_id, provider, event_type, payload, attempts in events:
+                error = None
+                try:
+                    success = bool(self.handler(provider, event_type, json.loads(payload)))
+                    if not success:
+                        error = "handler returned failure"
+                except Exception as e:
+                    success = False
+                    error = str(e)
+                self._finish(event_id, attempts, success, error)
+                processed += 1
+
+    def requeue_stale(self, minutes: int = 10) -> int:
+        """Возвращает в очередь события, зависшие в processing (например, после падения)"""
+        conn = self.db.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute('''
+                UPDATE payment_events
+                SET status = 'pending', updated_at = NOW()
+                WHERE status = 'processing'
+                AND updated_at < NOW() - %s * INTERVAL '1 minute'
+            ''', (minutes,))
+            count = cursor.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        if count:
+            logging.warning(f"⚠️ Requeued {count} stale payment events")
+            self._wakeup.set()
+        return count
+
+    def _run(self):
+        logging.info("✅ Payment event worker started")
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                self.process_pending()
+            except Exception as e:
+                logging.error(f"❌ Error in payment event worker: {e}")
+            # Просыпаемся сразу после нового события или периодически (отложенные повторы)
+            self._wakeup.wait(self.poll_interval)
+        logging.info("🛑 Payment event worker stopped")
+
+    def start(self):
+        """Запускает поток-обработчик"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="payment-events", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: float = 10):
+        """Останавливает обработчик, дожидаясь текущего события"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def get_stats(self):
+        stats = dict(self._stats)
+        stats['worker_alive'] = bool(self._thread and self._thread.is_alive())
+        return stats
+
+
+# Глобальный экземпляр
+payment_queue = PaymentEventQueue(db)
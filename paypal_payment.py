@@ -1,28 +1,75 @@
 # paypal_payment.py
 import logging
 import uuid
-import requests
+from http_client import http_client
 import time
+import threading
 from datetime import datetime, timedelta
-from threading import Thread
 from database import db
+from hot_queries import PAYPAL_STATIC_PAYMENTS_SQL
 from config import SUBSCRIPTION_DURATIONS, PAYPAL_CLIENT_ID, PAYPAL_CLIENT_SECRET, PAYPAL_PRICES
 
+# Токен обновляется заранее, за столько секунд до истечения
+TOKEN_REFRESH_MARGIN = 600
+
 class PayPalPayment:
     def __init__(self):
         self.base_url = "https://api-m.paypal.com"  # Для продакшена
         # Для тестов используйте: "https://api-m.sandbox.paypal.com"
         self.access_token = None
-        self.token_expires = None
+        self.token_expires = None  # time.monotonic(), когда токен истекает
+        self._token_lock = threading.Lock()
         self.pending_payments = {}
         
+    def _token_is_fresh(self, margin: float = TOKEN_REFRESH_MARGIN) -> bool:
+        return bool(self.access_token and self.token_expires and time.monotonic() < self.token_expires - margin)
+
+    def _set_token(self, access_token, expires_in):
+        self.access_token = access_token
+        self.token_expires = time.monotonic() + expires_in if access_token else None
+
     def get_access_token(self):
-        """Получает access token для PayPal API"""
-        try:
-            # Если токен еще действителен, используем его
-            if self.access_token and self.token_expires and datetime.now() < self.token_expires:
+        """Получает access token для PayPal API.
+
+        Токен хранится в таблице oauth_tokens, общей для всех процессов, и
+        обновляется под advisory lock - одновременно идет только один запрос
+        к /v1/oauth2/token. В процессе токен кэшируется в памяти.
+        """
+        if self._token_is_fresh():
+            return self.access_token
+        
+        with self._token_lock:
+            if self._token_is_fresh():
                 return self.access_token
-                
+            
+            try:
+                access_token, expires_in = db.get_oauth_token('paypal')
+                if not access_token or expires_in <= TOKEN_REFRESH_MARGIN:
+                    access_token, expires_in = db.refresh_oauth_token(
+                        'paypal', self._request_access_token, min_valid_seconds=TOKEN_REFRESH_MARGIN
+                    )
+            except Exception as e:
+                # База недоступна - получаем токен напрямую, только для этого процесса
+                logging.error(f"❌ Error using shared PayPal token cache: {e}")
+                access_token, expires_in = self._request_access_token()
+            
+            if access_token:
+                self._set_token(access_token, expires_in)
+                return access_token
+            
+            # Не удалось обновить - используем старый токен, пока он не истек
+            if self._token_is_fresh(margin=0):
+                return self.access_token
+            return None
+
+    def refresh_access_token(self):
+        """Заранее обновляет токен (фоновая задача), чтобы запросы не ждали PayPal"""
+        if PAYPAL_CLIENT_ID and PAYPAL_CLIENT_SECRET:
+            self.get_access_token()
+
+    def _request_access_token(self):
+        """Запрашивает новый токен у PayPal; возвращает (access_token, expires_in)"""
+        try:
             auth = (PAYPAL_CLIENT_ID, PAYPAL_CLIENT_SECRET)
             headers = {
                 "Content-Type": "application/x-www-form-urlencoded"
@@ -31,28 +78,26 @@ class PayPalPayment:
                 "grant_type": "client_credentials"
             }
             
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}/v1/oauth2/token",
                 headers=headers,
                 data=data,
                 auth=auth,
-                timeout=30
+                idempotent=True
             )
             
             if response.status_code == 200:
                 token_data = response.json()
-                self.access_token = token_data['access_token']
-                # Токен действителен 8 часов, устанавливаем время истечения на 7 часов
-                self.token_expires = datetime.now() + timedelta(hours=7)
-                logging.info("✅ PayPal access token получен")
-                return self.access_token
+                expires_in = int(token_data.get('expires_in', 32400))
+                logging.info(f"✅ PayPal access token получен, действует {expires_in} с")
+                return token_data['access_token'], expires_in
             else:
                 logging.error(f"❌ PayPal auth error: {response.status_code} - {response.text}")
-                return None
+                return None, None
                 
         except Exception as e:
             logging.error(f"❌ Error getting PayPal access token: {e}")
-            return None
+            return None, None
     
     def create_payment(self, amount: float, description: str, user_id: int, subscription_type: str):
         """Создает платеж в ЮKassa"""
@@ -92,12 +137,12 @@ class PayPalPayment:
             
             logging.info(f"🔧 Creating YooKassa payment: amount={amount}, user_id={user_id}")
             
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}/payments",
                 json=payload,
                 headers=headers,
                 auth=self.auth,
-                timeout=10
+                idempotent=True
             )
             
             if response.status_code == 200:
@@ -112,9 +157,7 @@ class PayPalPayment:
                     'created_at': datetime.now(),
                     'amount': amount
                 }
-                
-                # Запускаем мониторинг
-                self.start_payment_monitoring(payment_id)
+                # Статус проверяется сверкой платежей (reconcile_payments в bot.py)
                 
                 return payment_data['confirmation']['confirmation_url'], payment_id
             else:
@@ -143,10 +186,9 @@ class PayPalPayment:
                 "Authorization": f"Bearer {access_token}"
             }
             
-            response = requests.get(
+            response = http_client.get(
                 f"{self.base_url}/v2/checkout/orders/{order_id}",
-                headers=headers,
-                timeout=30
+                headers=headers
             )
             
             if response.status_code == 200:
@@ -182,11 +224,10 @@ class PayPalPayment:
                 "Authorization": f"Bearer {access_token}"
             }
             
-            response = requests.post(
+            response = http_client.post(
                 f"{self.base_url}/v2/checkout/orders/{order_id}/capture",
                 headers=headers,
-                json={},
-                timeout=30
+                json={}
             )
             
             if response.status_code in [200, 201]:
@@ -200,7 +241,7 @@ class PayPalPayment:
             logging.error(f"❌ Error capturing PayPal payment: {e}")
             return False
     
-    def activate_subscription(self, payment_id: str):
+    def activate_subscription(self, payment_id: str, payment_key: str = None):
         """Активирует подписку после успешной оплаты"""
         if payment_id not in self.pending_payments:
             return False
@@ -213,7 +254,8 @@ class PayPalPayment:
         success = db.create_subscription(
             user_id, 
             subscription_type, 
-            SUBSCRIPTION_DURATIONS[subscription_type]
+            SUBSCRIPTION_DURATIONS[subscription_type],
+            payment_key=payment_key
         )
         
         if success:
@@ -278,40 +320,6 @@ class PayPalPayment:
             if payment_id in self.pending_payments:
                 del self.pending_payments[payment_id]
 
-    def start_payment_monitoring(self, payment_id: str, max_checks: int = 60):
-        """Запускает мониторинг платежа в отдельном потоке"""
-        def monitor():
-            checks = 0
-            while checks < max_checks:
-                try:
-                    status = self.check_payment_status(payment_id)
-                    
-                    if status is True:
-                        # Платеж успешен
-                        if self.activate_subscription(payment_id):
-                            logging.info(f"✅ PayPal payment confirmed and subscription activated: {payment_id}")
-                        break
-                    elif status is False:
-                        # Платеж не прошел
-                        logging.info(f"❌ PayPal payment failed: {payment_id}")
-                        break
-                    # Если status is None - платеж еще в процессе
-                    
-                except Exception as e:
-                    logging.error(f"❌ Error in PayPal payment monitoring: {e}")
-                
-                time.sleep(30)  # Проверяем каждые 30 секунд
-                checks += 1
-            
-            # Если платеж не подтвердился, очищаем
-            if payment_id in self.pending_payments:
-                logging.warning(f"⚠️ PayPal payment monitoring timeout: {payment_id}")
-                del self.pending_payments[payment_id]
-        
-        thread = Thread(target=monitor)
-        thread.daemon = True
-        thread.start()
-
     def check_all_pending_payments(self):
         """Автоматически проверяет все ожидающие платежи"""
         completed_payments = []
@@ -362,31 +370,8 @@ class PayPalPayment:
             conn = db.get_connection()
             cursor = conn.cursor()
             
-            # Сначала обновляем структуру таблицы если нужно
-            cursor.execute('''
-                DO $$ 
-                BEGIN
-                    IF NOT EXISTS (SELECT 1 FROM information_schema.columns 
-                                WHERE table_name='payments' AND column_name='payment_method') THEN
-                        ALTER TABLE payments ADD COLUMN payment_method TEXT DEFAULT 'yookassa';
-                    END IF;
-                END $$;
-            ''')
-            
             # Ищем платежи в базе данных по таблице payments
-            cursor.execute('''
-                SELECT p.user_id, p.subscription_type, p.payment_date, p.status 
-                FROM payments p 
-                WHERE p.payment_method = 'paypal' 
-                AND p.status = 'success'
-                AND p.payment_date >= NOW() - INTERVAL '10 minutes'
-                AND NOT EXISTS (
-                    SELECT 1 FROM subscriptions s 
-                    WHERE s.user_id = p.user_id 
-                    AND s.is_active = true 
-                    AND s.end_date > NOW()
-                )
-            ''')
+            cursor.execute(PAYPAL_STATIC_PAYMENTS_SQL)
             
             new_payments = cursor.fetchall()
             conn.close()
@@ -484,28 +469,6 @@ class PayPalPayment:
         except Exception as e:
             logging.error(f"❌ Error sending PayPal success notification: {e}")
 
-    def start_paypal_monitoring(self):
-        """Запускает автоматический мониторинг PayPal платежей"""
-        def monitor():
-            while True:
-                try:
-                    # Проверяем статические платежи каждые 30 секунд
-                    activated_count = self.check_paypal_static_payments()
-                    if activated_count > 0:
-                        logging.info(f"✅ PayPal monitor: activated {activated_count} subscriptions")
-                    
-                    # Проверяем pending платежи через API
-                    self.check_all_pending_payments()
-                    
-                except Exception as e:
-                    logging.error(f"❌ Error in PayPal monitoring: {e}")
-                
-                time.sleep(30)  # Проверяем каждые 30 секунд
-        
-        thread = Thread(target=monitor)
-        thread.daemon = True
-        thread.start()
-
     def check_paypal_deck_payments(self):
         """Проверяет PayPal платежи за колоду по базе данных"""
         try:
@@ -551,7 +514,7 @@ class PayPalPayment:
             logging.error(f"❌ Error checking PayPal deck payments: {e}")
             return 0
 
-    def activate_paypal_deck_purchase(self, user_id: int):
+    def activate_paypal_deck_purchase(self, user_id: int, payment_key: str = None):
         """Активирует покупку колоды для PayPal платежа"""
         try:
             # Проверяем, не покупал ли пользователь уже колоду
@@ -560,7 +523,7 @@ class PayPalPayment:
                 return True
                 
             # Записываем покупку в базу
-            success = db.record_deck_purchase(user_id, f"paypal_{user_id}")
+            success = db.record_deck_purchase(user_id, f"paypal_{user_id}", payment_key=payment_key)
             
             if success:
                 logging.info(f"✅ PayPal deck purchase activated for user {user_id}")
@@ -634,6 +597,7 @@ class PayPalPayment:
             
             conn.commit()
             logging.info(f"✅ PayPal payment saved to database for user {user_id}, custom_id: {custom_id}")
+            db.save_payment_correlation(user_id, 'paypal', amount=amount, internal_payment_id=payment_id)
             return True
             
         except Exception as e:
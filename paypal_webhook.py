@@ -0,0 +1,130 @@
+# paypal_webhook.py - локальная проверка подписи вебхуков PayPal
+
+import base64
+import logging
+import zlib
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from config import PAYPAL_WEBHOOK_ID, PAYPAL_CERT_CACHE_TTL
+from http_client import http_client
+from ttl_cache import TTLCache
+
+try:
+    from cryptography import x509
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+except ImportError:  # без cryptography остается только проверка через API PayPal
+    x509 = None
+
+# Сертификаты подписи скачиваются только с доменов PayPal
+ALLOWED_CERT_HOSTS = ("api.paypal.com", "api.sandbox.paypal.com", "api-m.paypal.com", "api-m.sandbox.paypal.com")
+CERT_PATH_PREFIX = "/v1/notifications/certs/"
+CERT_COMMON_NAME_SUFFIX = ".paypal.com"
+
+HASH_ALGORITHMS = {
+    "SHA256withRSA": "SHA256",
+    "SHA1withRSA": "SHA1",
+    "SHA512withRSA": "SHA512",
+}
+
+
+class PayPalWebhookVerifier:
+    """Проверка PAYPAL-TRANSMISSION-SIG без обращения к API PayPal.
+
+    Подписывается строка "<transmission_id>|<transmission_time>|<webhook_id>|<crc32 тела>"
+    ключом из сертификата по PAYPAL-CERT-URL. Сертификат кэшируется на cert_ttl секунд.
+
+    verify() возвращает True/False, если подпись удалось проверить локально,
+    и None, если локальная проверка невозможна (нет cryptography, сертификат
+    не скачался) - тогда вызывающий код проверяет вебхук через API.
+    """
+
+    def __init__(self, webhook_id: str, cert_ttl: float = 86400):
+        self.webhook_id = webhook_id
+        self._certs = TTLCache(ttl=cert_ttl, max_size=20)
+
+    @property
+    def available(self) -> bool:
+        return x509 is not None and bool(self.webhook_id)
+
+    @staticmethod
+    def is_allowed_cert_url(cert_url: str) -> bool:
+        parts = urlsplit(cert_url or "")
+        return (
+            parts.scheme == "https"
+            and parts.hostname in ALLOWED_CERT_HOSTS
+            and parts.path.startswith(CERT_PATH_PREFIX)
+        )
+
+    def _get_certificate(self, cert_url: str):
+        cert = self._certs.get(cert_url)
+        if cert is not None:
+            return cert
+
+        response = http_client.get(cert_url, provider="paypal")
+        response.raise_for_status()
+        cert = x509.load_pem_x509_certificate(response.content)
+
+        common_names = cert.subject.get_attributes_for_oid(x509.NameOID.COMMON_NAME)
+        if not common_names or not common_names[0].value.endswith(CERT_COMMON_NAME_SUFFIX):
+            raise ValueError(f"unexpected certificate subject: {cert.subject.rfc4514_string()}")
+
+        # Кэшируем не дольше срока действия сертификата
+        expires_in = (cert.not_valid_after_utc - datetime.now(timezone.utc)).total_seconds()
+        self._certs.set(cert_url, cert, ttl=min(self._certs.ttl, expires_in))
+        logging.info(f"✅ PayPal signing certificate cached: {cert_url}")
+        return cert
+
+    def verify(self, headers, body: bytes):
+        if not self.available:
+            return None
+
+        auth_algo = headers.get('PAYPAL-AUTH-ALGO')
+        cert_url = headers.get('PAYPAL-CERT-URL')
+        transmission_id = headers.get('PAYPAL-TRANSMISSION-ID')
+        transmission_sig = headers.get('PAYPAL-TRANSMISSION-SIG')
+        transmission_time = headers.get('PAYPAL-TRANSMISSION-TIME')
+
+        if not all([auth_algo, cert_url, transmission_id, transmission_sig, transmission_time]):
+            logging.error("❌ Missing PayPal webhook verification headers")
+            return False
+
+        if not self.is_allowed_cert_url(cert_url):
+            logging.error(f"❌ PayPal cert URL is not allowed: {cert_url}")
+            return False
+
+        hash_name = HASH_ALGORITHMS.get(auth_algo)
+        if hash_name is None:
+            logging.warning(f"⚠️ Unsupported PayPal auth algorithm: {auth_algo}")
+            return None
+
+        try:
+            cert = self._get_certificate(cert_url)
+        except Exception as e:
+            logging.warning(f"⚠️ Could not load PayPal signing certificate: {e}")
+            return None
+
+        now = datetime.now(timezone.utc)
+        if not (cert.not_valid_before_utc <= now <= cert.not_valid_after_utc):
+            logging.error("❌ PayPal signing certificate is not valid now")
+            self._certs.invalidate(cert_url)
+            return False
+
+        message = f"{transmission_id}|{transmission_time}|{self.webhook_id}|{zlib.crc32(body) & 0xffffffff}"
+        try:
+            cert.public_key().verify(
+                base64.b64decode(transmission_sig),
+                message.encode('utf-8'),
+                padding.PKCS1v15(),
+                getattr(hashes, hash_name)()
+            )
+            return True
+        except (InvalidSignature, ValueError) as e:
+            logging.error(f"❌ PayPal webhook signature mismatch: {e or 'invalid signature'}")
+            return False
+
+
+# Глобальный экземпляр
+paypal_verifier = PayPalWebhookVerifier(PAYPAL_WEBHOOK_ID, cert_ttl=PAYPAL_CERT_CACHE_TTL)
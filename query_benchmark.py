@@ -0,0 +1,296 @@
+# query_benchmark.py - EXPLAIN ANALYZE горячих запросов на тестовой базе с реалистичным объемом данных
+#
+# Запуск (только на отдельной базе - скрипт пишет в нее тестовые данные):
+#   BENCH_DATABASE_URL=postgresql://localhost/metaphor_bench python query_benchmark.py --seed
+#   python query_benchmark.py --output bench.json              # сохранить результаты
+#   python query_benchmark.py --baseline bench.json            # сравнить с сохраненными
+#
+# Регрессией считается новый Seq Scan по таблице с тестовыми данными или
+# время выполнения больше чем в --threshold раз от сохраненного.
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+from datetime import date, datetime, timedelta
+
+import psycopg2
+
+import hot_queries
+from schema_migrations import apply_migrations
+
+SEED_USERS = 100_000
+SEED_USER_CARDS = 1_000_000
+FIRST_USER_ID = 1_000_000
+
+# Таблицы с тестовыми данными: полный просмотр любой из них - подозрительный план
+SEEDED_TABLES = (
+    "users", "user_cards", "user_messages", "user_daily_usage", "payments",
+    "subscriptions", "user_action_logs", "video_links", "user_reminders",
+)
+
+SAMPLE_USER_ID = FIRST_USER_ID + SEED_USERS // 2
+
+# Секционированные таблицы истории (migrations/0004_partition_history.sql)
+HISTORY_TABLES = ("user_cards", "user_messages", "user_action_logs", "user_reminders", "user_meditations")
+
+# (DatabaseManager метод или функция бота, SQL из hot_queries.py, параметры)
+HOT_QUERIES = [
+    ("DatabaseManager._load_entitlement", hot_queries.ENTITLEMENT_SQL,
+     lambda: (date.today(), SAMPLE_USER_ID)),
+    ("DatabaseManager.get_user_subscription", hot_queries.USER_SUBSCRIPTION_SQL,
+     lambda: (SAMPLE_USER_ID,)),
+    ("DatabaseManager.get_user_stats", hot_queries.USER_STATS_SQL,
+     lambda: (SAMPLE_USER_ID,)),
+    ("DatabaseManager.get_admin_users_page", hot_queries.ADMIN_USERS_PAGE_SQL,
+     lambda: {'after': SAMPLE_USER_ID, 'limit': 20}),
+    # Кандидаты читаются страницами по user_id - план первой страницы
+    ("DatabaseManager.get_reminder_candidates_page", hot_queries.REMINDER_CANDIDATES_SQL,
+     lambda: (date.today() - timedelta(days=7), 0, date.today(), date.today(), 500)),
+    # DELETE выполняется в откатываемой транзакции (см. explain)
+    ("DatabaseManager.cleanup_expired_video_links", hot_queries.DELETE_EXPIRED_VIDEO_LINKS_SQL,
+     lambda: ()),
+    ("PayPalPayment.check_paypal_static_payments", hot_queries.PAYPAL_STATIC_PAYMENTS_SQL,
+     lambda: ()),
+    ("bot.find_user_by_payment_id", hot_queries.USER_BY_PAYMENT_ID_SQL,
+     lambda: ("yk-50000", "yk-50000")),
+    ("bot.find_user_by_email (users)", hot_queries.USER_BY_EMAIL_SQL,
+     lambda: (f"User{SAMPLE_USER_ID}@Example.com",)),
+    ("bot.find_user_by_email (payments)", hot_queries.PAYMENT_USER_BY_EMAIL_SQL,
+     lambda: (f"user{SAMPLE_USER_ID}@example.com",)),
+    ("bot.find_user_by_phone", hot_queries.USER_BY_PHONE_SQL,
+     lambda: (f"+7900{SAMPLE_USER_ID:07d}",)),
+    ("bot.find_recent_subscription_users", hot_queries.RECENT_SUBSCRIPTION_USERS_SQL,
+     lambda: (datetime.now() - timedelta(minutes=10),)),
+]
+
+
+class _BenchDatabase:
+    """Минимальный аналог DatabaseManager для apply_migrations"""
+
+    def __init__(self, database_url):
+        self.database_url = database_url
+
+    def get_connection(self):
+        return psycopg2.connect(self.database_url)
+
+
+def seed(conn, users: int = SEED_USERS, user_cards: int = SEED_USER_CARDS):
+    """Заполняет базу тестовыми данными (одними INSERT ... SELECT generate_series)"""
+    cursor = conn.cursor()
+    last_user_id = FIRST_USER_ID + users - 1
+
+    logging.info(f"🔄 Seeding {users} users and {user_cards} user_cards...")
+    # Помесячные секции таблиц истории на два года назад (данные ниже - за последний год)
+    cursor.execute('''
+        SELECT create_monthly_partition(t, m::date)
+        FROM unnest(%s) t,
+             generate_series(date_trunc('month', NOW()) - INTERVAL '24 months',
+                             date_trunc('month', NOW()), INTERVAL '1 month') m
+    ''', (list(HISTORY_TABLES),))
+    cursor.execute('''
+        INSERT INTO cards (card_id, card_name, image_url, description_text)
+        SELECT i, 'Карта ' || i, 'https://example.com/card' || i || '.jpg', 'Описание ' || i
+        FROM generate_series(1, 176) i
+        ON CONFLICT (card_id) DO NOTHING
+    ''')
+    cursor.execute('''
+        INSERT INTO daily_messages (message_id, image_url, message_text)
+        SELECT i, 'https://example.com/message' || i || '.jpg', 'Послание ' || i
+        FROM generate_series(1, 50) i
+        ON CONFLICT (message_id) DO NOTHING
+    ''')
+    cursor.execute('''
+        INSERT INTO users (user_id, username, first_name, email, phone, registered_date,
+                           last_daily_card_date, is_premium, premium_until, daily_cards_limit)
+        SELECT i, 'user' || i, 'Пользователь',
+               'user' || i || '@example.com',
+               '+7900' || LPAD(i::text, 7, '0'),
+               NOW() - (random() * INTERVAL '730 days'),
+               CURRENT_DATE - (random() * 60)::int,
+               i %% 10 = 0,
+               CASE WHEN i %% 10 = 0 THEN NOW() + INTERVAL '30 days' END,
+               CASE WHEN i %% 10 = 0 THEN 5 ELSE 1 END
+        FROM generate_series(%s, %s) i
+        ON CONFLICT (user_id) DO NOTHING
+    ''', (FIRST_USER_ID, last_user_id))
+    cursor.execute('''
+        INSERT INTO user_cards (user_id, card_id, drawn_date)
+        SELECT %s + (random() * (%s - 1))::bigint, 1 + (random() * 175)::int,
+               NOW() - (random() * INTERVAL '365 days')
+        FROM generate_series(1, %s)
+    ''', (FIRST_USER_ID, users, user_cards))
+    cursor.execute('''
+        INSERT INTO user_messages (user_id, message_id, drawn_date)
+        SELECT %s + (random() * (%s - 1))::bigint, 1 + (random() * 49)::int,
+               NOW() - (random() * INTERVAL '365 days')
+        FROM generate_series(1, %s)
+    ''', (FIRST_USER_ID, users, user_cards // 5))
+    cursor.execute('''
+        INSERT INTO user_daily_usage (user_id, day, cards)
+        SELECT user_id, drawn_date::date, COUNT(*)
+        FROM user_cards
+        GROUP BY user_id, drawn_date::date
+        ON CONFLICT (user_id, day) DO UPDATE SET cards = EXCLUDED.cards
+    ''')
+    cursor.execute('''
+        INSERT INTO subscriptions (user_id, subscription_type, start_date, end_date, is_active)
+        SELECT i, 'month', NOW() - INTERVAL '10 days', NOW() + INTERVAL '20 days', TRUE
+        FROM generate_series(%s, %s) i
+        WHERE i %% 10 = 0
+    ''', (FIRST_USER_ID, last_user_id))
+    cursor.execute('''
+        INSERT INTO payments (user_id, amount, subscription_type, status, payment_method,
+                              yoomoney_payment_id, payment_id, customer_email, payment_date, created_at)
+        SELECT %s + (random() * (%s - 1))::bigint, 99, 'month',
+               (ARRAY['success', 'pending', 'canceled'])[1 + (i %% 3)],
+               (ARRAY['yookassa', 'paypal'])[1 + (i %% 2)],
+               'yk-' || i, 'internal-' || i,
+               'user' || (%s + i %% %s) || '@example.com',
+               NOW() - (random() * INTERVAL '365 days'),
+               NOW() - (random() * INTERVAL '365 days')
+        FROM generate_series(1, %s) i
+    ''', (FIRST_USER_ID, users, FIRST_USER_ID, users, users))
+    cursor.execute('''
+        INSERT INTO user_action_logs (user_id, action, action_data, created_at)
+        SELECT %s + (random() * (%s - 1))::bigint,
+               (ARRAY['subscription_clicked', 'card_drawn', 'bot_blocked', 'menu_opened'])[1 + (i %% 4)],
+               '{}', NOW() - (random() * INTERVAL '180 days')
+        FROM generate_series(1, %s) i
+    ''', (FIRST_USER_ID, users, user_cards // 2))
+    cursor.execute('''
+        INSERT INTO video_links (link_hash, user_id, video_url, platform, expires_at)
+        SELECT 'bench-' || i, %s + (random() * (%s - 1))::bigint, 'https://example.com/v', 'youtube',
+               NOW() + (random() * INTERVAL '2 days') - INTERVAL '1 day'
+        FROM generate_series(1, %s) i
+        ON CONFLICT (link_hash) DO NOTHING
+    ''', (FIRST_USER_ID, users, users // 2))
+    cursor.execute('''
+        INSERT INTO user_reminders (user_id, reminder_date, reminder_type)
+        SELECT %s + (random() * (%s - 1))::bigint, CURRENT_DATE - (random() * 90)::int, 'card_reminder'
+        FROM generate_series(1, %s)
+        ON CONFLICT DO NOTHING
+    ''', (FIRST_USER_ID, users, users * 2))
+    conn.commit()
+
+    cursor.execute('REFRESH MATERIALIZED VIEW mv_user_card_stats')
+    cursor.execute('REFRESH MATERIALIZED VIEW mv_admin_stats')
+    conn.commit()
+
+    # Статистика планировщика по свежим данным
+    conn.set_session(autocommit=True)
+    cursor.execute('ANALYZE')
+    conn.set_session(autocommit=False)
+    logging.info("✅ Benchmark data seeded")
+
+
+def _walk_plan(node, node_types, seq_scans):
+    node_types.add(node["Node Type"])
+    if node["Node Type"] == "Seq Scan":
+        seq_scans.add(node.get("Relation Name"))
+    for child in node.get("Plans", []):
+        _walk_plan(child, node_types, seq_scans)
+
+
+def explain(conn, sql: str, params, runs: int = 5) -> dict:
+    """EXPLAIN ANALYZE запроса runs раз (в откатываемой транзакции); медиана времени и узлы плана"""
+    cursor = conn.cursor()
+    timings = []
+    plan = None
+    try:
+        for _ in range(runs):
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0][0]
+            timings.append(plan["Execution Time"])
+    finally:
+        conn.rollback()
+
+    node_types, seq_scans = set(), set()
+    _walk_plan(plan["Plan"], node_types, seq_scans)
+    return {
+        "execution_ms": round(statistics.median(timings), 3),
+        "planning_ms": round(plan["Planning Time"], 3),
+        "node_types": sorted(node_types),
+        "seq_scans": sorted(name for name in seq_scans if name in SEEDED_TABLES),
+        "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read_blocks": plan["Plan"].get("Shared Read Blocks", 0),
+    }
+
+
+def run_benchmark(conn, runs: int = 5) -> dict:
+    results = {}
+    for name, sql, params in HOT_QUERIES:
+        results[name] = explain(conn, sql, params(), runs)
+        result = results[name]
+        seq = f", Seq Scan: {', '.join(result['seq_scans'])}" if result["seq_scans"] else ""
+        logging.info(f"📊 {name}: {result['execution_ms']} ms{seq}")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 2.0, min_ms: float = 1.0) -> list:
+    """Регрессии относительно сохраненного прогона: [(запрос, описание)]"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        new_seq_scans = set(result["seq_scans"]) - set(before["seq_scans"])
+        if new_seq_scans:
+            regressions.append((name, f"new Seq Scan on {', '.join(sorted(new_seq_scans))}"))
+        if (result["execution_ms"] > before["execution_ms"] * threshold
+                and result["execution_ms"] - before["execution_ms"] > min_ms):
+            regressions.append((name, f"{before['execution_ms']} ms -> {result['execution_ms']} ms"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE горячих запросов бота")
+    parser.add_argument("--seed", action="store_true", help="заполнить базу тестовыми данными")
+    parser.add_argument("--runs", type=int, default=5, help="повторов каждого запроса")
+    parser.add_argument("--output", help="сохранить результаты в JSON")
+    parser.add_argument("--baseline", help="сравнить с результатами из JSON")
+    parser.add_argument("--threshold", type=float, default=2.0, help="допустимое замедление (раз)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    if not database_url:
+        logging.error("❌ BENCH_DATABASE_URL is not set")
+        return 2
+    if database_url == os.environ.get("DATABASE_URL"):
+        logging.error("❌ BENCH_DATABASE_URL must not point to the production database")
+        return 2
+
+    apply_migrations(_BenchDatabase(database_url))
+
+    conn = psycopg2.connect(database_url)
+    try:
+        if args.seed:
+            seed(conn)
+        results = run_benchmark(conn, args.runs)
+    finally:
+        conn.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, sort_keys=True)
+        logging.info(f"✅ Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, description in regressions:
+            logging.warning(f"⚠️ Plan regression in {name}: {description}")
+        if regressions:
+            return 1
+        logging.info("✅ No plan regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# scheduler.py - фоновые задачи бота на JobQueue
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime
+
+
+class BackgroundScheduler:
+    """Периодические задачи внутри приложения PTB (JobQueue).
+
+    - jitter: случайная задержка перед запуском, чтобы задачи не стартовали одновременно
+    - задача не запускается повторно, пока не завершился предыдущий запуск
+    - синхронные функции выполняются в пуле потоков и не блокируют event loop,
+      асинхронные получают context задачи
+    - метрики по каждой задаче (get_stats)
+    """
+
+    def __init__(self, shutdown_event=None):
+        self.shutdown_event = shutdown_event
+        self._jobs = {}       # name -> метрики задачи
+        self._active = set()  # asyncio.Task выполняющихся задач
+
+    def _register(self, name, schedule):
+        self._jobs[name] = {
+            'schedule': schedule,
+            'running': False,
+            'runs': 0,
+            'failures': 0,
+            'skipped': 0,
+            'last_started': None,
+            'last_duration': None,
+            'max_duration': 0.0,
+            'total_duration': 0.0,
+            'last_error': None,
+        }
+
+    def _make_callback(self, name, func, jitter):
+        async def callback(context):
+            if self.shutdown_event is not None and self.shutdown_event.is_set():
+                return
+
+            stats = self._jobs[name]
+            if stats['running']:
+                stats['skipped'] += 1
+                logging.warning(f"⚠️ Job {name} is still running, skipping this run")
+                return
+
+            stats['running'] = True
+            task = asyncio.current_task()
+            self._active.add(task)
+            try:
+                if jitter:
+                    await asyncio.sleep(random.uniform(0, jitter))
+
+                started = time.monotonic()
+                stats['last_started'] = datetime.now().isoformat(timespec='seconds')
+                try:
+                    if asyncio.iscoroutinefunction(func):
+                        await func(context)
+                    else:
+                        await asyncio.to_thread(func)
+                    stats['runs'] += 1
+                except Exception as e:
+                    stats['failures'] += 1
+                    stats['last_error'] = str(e)
+                    logging.error(f"❌ Job {name} failed: {e}")
+                finally:
+                    duration = time.monotonic() - started
+                    stats['last_duration'] = duration
+                    stats['total_duration'] += duration
+                    stats['max_duration'] = max(stats['max_duration'], duration)
+            finally:
+                stats['running'] = False
+                self._active.discard(task)
+
+        return callback
+
+    def run_repeating(self, job_queue, name, func, interval, first=None, jitter=0):
+        """Запускает задачу каждые interval секунд"""
+        self._register(name, f"every {interval}s")
+        job_queue.run_repeating(
+            self._make_callback(name, func, jitter),
+            interval=interval,
+            first=interval if first is None else first,
+            name=name
+        )
+        logging.info(f"✅ Job {name} scheduled every {interval}s")
+
+    def run_daily(self, job_queue, name, func, times, jitter=0):
+        """Запускает задачу каждый день в указанное время (datetime.time с tzinfo)"""
+        self._register(name, "daily at " + ", ".join(t.strftime('%H:%M') for t in times))
+        callback = self._make_callback(name, func, jitter)
+        for run_time in times:
+            job_queue.run_daily(callback, time=run_time, name=name)
+        logging.info(f"✅ Job {name} scheduled {self._jobs[name]['schedule']}")
+
+    def run_once(self, job_queue, name, func, when, jitter=0):
+        """Запускает задачу один раз через when секунд"""
+        self._register(name, f"once after {when}s")
+        job_queue.run_once(self._make_callback(name, func, jitter), when=when, name=name)
+        logging.info(f"✅ Job {name} scheduled once after {when}s")
+
+    async def wait_for_running(self, timeout=30):
+        """Ждет завершения выполняющихся задач (при остановке бота)"""
+        tasks = [task for task in self._active if task is not asyncio.current_task()]
+        if not tasks:
+            return
+        logging.info(f"⏳ Waiting for {len(tasks)} running jobs to finish...")
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logging.warning(f"⚠️ {len(pending)} jobs did not finish in {timeout}s")
+
+    def get_stats(self):
+        """Возвращает метрики задач"""
+        stats = {}
+        for name, job in self._jobs.items():
+            job = dict(job)
+            runs = job['runs'] + job['failures']
+            job['avg_duration'] = job['total_duration'] / runs if runs else 0.0
+            stats[name] = job
+        return stats
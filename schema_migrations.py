@@ -0,0 +1,157 @@
+# schema_migrations.py - версионные миграции схемы базы данных (migrations/*.sql)
+
+import logging
+import os
+import re
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE_RE = re.compile(r"^(\d+)_([\w-]+)\.sql$")
+
+# Миграция с этой строкой выполняется вне транзакции (например, CREATE INDEX CONCURRENTLY)
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+CONCURRENT_INDEX_RE = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+ADVISORY_LOCK_KEY = "schema_migrations"
+
+
+def list_migrations(directory: str = MIGRATIONS_DIR):
+    """Файлы миграций по возрастанию версии: [(версия, имя, путь)]"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort()
+
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def _get_current_version(cursor):
+    cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return 0
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cursor.fetchone()[0]
+
+
+def apply_migrations(db, directory: str = MIGRATIONS_DIR):
+    """Применяет новые миграции; каждая - один раз и по порядку.
+
+    Если схема уже актуальна, это пара SELECT без блокировок и DDL. Иначе миграции
+    выполняются под advisory lock, поэтому при одновременном запуске
+    нескольких процессов их применит только первый.
+    Возвращает список примененных версий.
+    """
+    migrations = list_migrations(directory)
+    latest = migrations[-1][0] if migrations else 0
+
+    conn = db.get_connection()
+    cursor = conn.cursor()
+
+    try:
+        current = _get_current_version(cursor)
+        conn.commit()
+        if current >= latest:
+            logging.info(f"✅ Database schema is up to date (version {current})")
+            return []
+
+        cursor.execute("SELECT pg_advisory_lock(hashtext(%s))", (ADVISORY_LOCK_KEY,))
+        try:
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute("SELECT version FROM schema_version")
+            applied = {row[0] for row in cursor.fetchall()}
+            conn.commit()
+
+            applied_now = []
+            for version, name, path in migrations:
+                if version in applied:
+                    continue
+                _apply_migration(conn, cursor, version, name, path)
+                applied_now.append(version)
+
+            return applied_now
+        finally:
+            conn.rollback()
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", (ADVISORY_LOCK_KEY,))
+            conn.commit()
+
+    except Exception as e:
+        logging.error(f"❌ Error applying migrations: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def _apply_migration(conn, cursor, version: int, name: str, path: str):
+    with open(path, encoding="utf-8") as f:
+        sql = f.read()
+
+    logging.info(f"🔄 Applying migration {version:04d}_{name}...")
+    if NO_TRANSACTION_MARKER in sql:
+        conn.set_session(autocommit=True)
+        try:
+            for statement in _split_statements(sql):
+                _drop_invalid_index(cursor, statement)
+                cursor.execute(statement)
+        finally:
+            conn.set_session(autocommit=False)
+    else:
+        cursor.execute(sql)
+
+    cursor.execute(
+        "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+        (version, name)
+    )
+    conn.commit()
+    logging.info(f"✅ Migration {version:04d}_{name} applied")
+
+
+def _drop_invalid_index(cursor, statement: str):
+    """Удаляет индекс, оставшийся INVALID после неудачного CREATE INDEX CONCURRENTLY.
+    Иначе IF NOT EXISTS пропустит его, и индекс так и не будет построен"""
+    match = CONCURRENT_INDEX_RE.search(statement)
+    if not match:
+        return
+    index_name = match.group(1)
+    cursor.execute('''
+        SELECT NOT i.indisvalid 
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = %s AND pg_table_is_visible(c.oid)
+    ''', (index_name,))
+    result = cursor.fetchone()
+    if result and result[0]:
+        logging.warning(f"⚠️ Dropping invalid index {index_name} before rebuilding it")
+        cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+
+
+def _split_statements(sql: str):
+    """Делит миграцию без транзакции на операторы (по ';' в конце строки;
+    функции с $$ в таких миграциях не поддерживаются)"""
+    statements, current = [], []
+    for line in sql.splitlines():
+        if line.strip().startswith("--") and not current:
+            continue
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+    tail = "\n".join(current).strip()
+    if tail:
+        statements.append(tail)
+    return statements
@@ -2,7 +2,6 @@
 
 import hashlib
 import secrets
-import requests
 import os
 from datetime import datetime, timedelta
 import logging
@@ -23,7 +22,7 @@ class SecureVideoSystem:
     def generate_secure_link(self, user_id: int, platform: str = "youtube") -> str:
         """Генерирует защищенную ссылку"""
         try:
-            # Определяем тип доступа
+            # Определяем тип доступа (по таблице subscriptions, а не по кэшу прав)
             subscription = self.db.get_user_subscription(user_id)
             has_subscription = False
             
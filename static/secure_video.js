@@ -0,0 +1,166 @@
+// Скрываем элементы YouTube
+function hideYouTubeElements() {
+    const style = document.createElement('style');
+    style.textContent = `
+        .ytp-chrome-top,
+        .ytp-title-link,
+        .ytp-title-channel,
+        .ytp-share-button,
+        .ytp-copylink-button,
+        .ytp-show-cards-title,
+        .ytp-pause-overlay,
+        .ytp-youtube-button,     
+        .ytp-button.ytp-youtube-button {  
+            display: none !important;
+            opacity: 0 !important;
+            visibility: hidden !important;
+        }
+        .ytp-watermark {
+            display: none !important;
+            opacity: 0 !important;
+            visibility: hidden !important;
+        }
+
+        .ytp-chrome-top {
+            height: 0 !important;
+            min-height: 0 !important;
+            padding: 0 !important;
+        }
+    `;
+    document.head.appendChild(style);
+}
+
+// Усиленное скрытие элементов RUTUBE
+function hideRutubeElements() {
+    // Добавляем стили для полного скрытия
+    const style = document.createElement('style');
+    style.textContent = `
+        /* Скрываем ВСЕ возможные элементы RUTUBE */
+        [class*="control"],
+        [class*="panel"],
+        [class*="button"],
+        [class*="logo"],
+        [class*="watermark"],
+        [class*="header"],
+        [class*="footer"],
+        [class*="toolbar"],
+        [class*="menu"],
+        [id*="control"],
+        [id*="panel"],
+        [id*="button"],
+        [id*="logo"],
+        .video-controls,
+        .player-controls,
+        .controls-panel,
+        .top-panel,
+        .bottom-panel,
+        .rutube-player__controls,
+        .video-controls__panel,
+        .logo,
+        .rutube-logo,
+        .player-logo,
+        .watermark {
+            display: none !important;
+            opacity: 0 !important;
+            visibility: hidden !important;
+            pointer-events: none !important;
+        }
+
+        /* Скрываем overlay элементы */
+        .video-page__control-panel,
+        .video-controls,
+        .video-page__header,
+        .video-page__footer {
+            display: none !important;
+        }
+
+        /* Делаем iframe на весь экран */
+        body, html {
+            margin: 0 !important;
+            padding: 0 !important;
+            overflow: hidden !important;
+        }
+
+        .video-container, .video-wrapper {
+            border: none !important;
+            outline: none !important;
+        }
+    `;
+    document.head.appendChild(style);
+
+    // Агрессивное скрытие через JavaScript
+    function aggressivelyHideRutube() {
+        // Скрываем все элементы с определенными классами/ID
+        const selectors = [
+            '[class*="control"]', '[class*="panel"]', '[class*="button"]',
+            '[class*="logo"]', '[class*="watermark"]', '[class*="header"]',
+            '[class*="footer"]', '[class*="toolbar"]', '[class*="menu"]',
+            '[id*="control"]', '[id*="panel"]', '[id*="button"]', '[id*="logo"]',
+            '.video-controls', '.player-controls', '.controls-panel',
+            '.top-panel', '.bottom-panel', '.rutube-player__controls',
+            '.video-controls__panel', '.logo', '.rutube-logo', '.player-logo',
+            '.watermark', '.video-page__control-panel', '.video-page__header',
+            '.video-page__footer'
+        ];
+
+        selectors.forEach(selector => {
+            const elements = document.querySelectorAll(selector);
+            elements.forEach(el => {
+                if (el) {
+                    el.style.display = 'none';
+                    el.style.opacity = '0';
+                    el.style.visibility = 'hidden';
+                    el.style.pointerEvents = 'none';
+                    el.remove(); // Полностью удаляем элемент
+                }
+            });
+        });
+
+        // Скрываем элементы внутри iframe
+        const iframe = document.getElementById('video-player');
+        if (iframe && iframe.contentDocument) {
+            selectors.forEach(selector => {
+                const elements = iframe.contentDocument.querySelectorAll(selector);
+                elements.forEach(el => {
+                    if (el) {
+                        el.style.display = 'none';
+                        el.style.opacity = '0';
+                        el.style.visibility = 'hidden';
+                        el.style.pointerEvents = 'none';
+                    }
+                });
+            });
+        }
+    }
+
+    // Запускаем агрессивное скрытие несколько раз
+    aggressivelyHideRutube();
+    setTimeout(aggressivelyHideRutube, 1000);
+    setTimeout(aggressivelyHideRutube, 3000);
+    setInterval(aggressivelyHideRutube, 5000);
+}
+
+// Определяем платформу и применяем скрипт
+function initVideoPlayer() {
+    const iframe = document.getElementById('video-player');
+    if (!iframe) return;
+
+    const iframeSrc = iframe.src;
+
+    if (iframeSrc.includes('youtube')) {
+        setTimeout(hideYouTubeElements, 2000);
+        setInterval(hideYouTubeElements, 5000);
+    } else if (iframeSrc.includes('rutube')) {
+        setTimeout(hideRutubeElements, 1000);
+        setInterval(hideRutubeElements, 3000);
+    }
+}
+
+// Запускаем при загрузке
+document.getElementById('video-player').addEventListener('load', initVideoPlayer);
+setTimeout(initVideoPlayer, 1000);
+
+// Скрываем при любом взаимодействии
+document.addEventListener('click', initVideoPlayer);
+document.addEventListener('mousemove', initVideoPlayer);
+document.addEventListener('touchstart', initVideoPlayer);
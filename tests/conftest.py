@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+# Модули бота лежат в корне репозитория
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# config.py требует токен при импорте
+os.environ.setdefault("BOT_TOKEN", "test-token")
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+# Отдельная схема: тесты не трогают таблицы в public тестовой базы
+TEST_SCHEMA = "bot_test"
+# Справочные таблицы, которые не очищаются между тестами
+KEPT_TABLES = ("cards", "schema_version")
+
+
+@pytest.fixture(scope="session")
+def migrated_db():
+    """Глобальный database.db на пустой схеме bot_test со всеми миграциями"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+    import database
+
+    admin = psycopg2.connect(TEST_DATABASE_URL)
+    admin.autocommit = True
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE; CREATE SCHEMA {TEST_SCHEMA}")
+
+    db = database.db
+    db._create_connection = lambda: psycopg2.connect(
+        TEST_DATABASE_URL, options=f"-c search_path={TEST_SCHEMA}"
+    )
+    db._pool = None
+    db.init_database()
+    yield db
+
+    db.close_pool()
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE")
+    admin.close()
+
+
+@pytest.fixture
+def test_db(migrated_db):
+    """database.db с пустыми таблицами (кроме справочника карт) и сброшенными кэшами"""
+    conn = migrated_db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            SELECT c.relname FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+        ''', (TEST_SCHEMA,))
+        tables = [name for (name,) in cursor.fetchall() if name not in KEPT_TABLES]
+        cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    migrated_db.entitlements.clear()
+    migrated_db.video_links.clear()
+    migrated_db.video_link_watches.clear()
+    return migrated_db
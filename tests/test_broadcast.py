@@ -0,0 +1,75 @@
+# Рассылка напоминаний: повторы отправки в broadcast.Broadcaster без обращения к Telegram
+# и страницы кандидатов на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+pytest.importorskip("telegram")
+
+from telegram.error import NetworkError, TimedOut
+
+import broadcast as broadcast_module
+from broadcast import Broadcaster, FAILED, SENT
+
+
+class FakeBot:
+    """Бот, который выбрасывает ошибки из errors по очереди, а потом отправляет"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(broadcast_module.asyncio, "sleep", sleep)
+
+
+def send(bot, max_retries=3):
+    broadcaster = Broadcaster(bot, global_rate=1000, per_chat_interval=0, max_retries=max_retries)
+    return asyncio.run(broadcaster.send(1, "text"))
+
+
+def test_timed_out_is_not_retried():
+    bot = FakeBot([TimedOut()])
+
+    assert send(bot) == SENT
+    assert bot.calls == 1
+
+
+def test_network_error_is_retried():
+    bot = FakeBot([NetworkError("connection reset")])
+
+    assert send(bot) == SENT
+    assert bot.calls == 2
+
+
+def test_network_error_gives_up_after_max_retries():
+    bot = FakeBot([NetworkError("connection reset")] * 5)
+
+    assert send(bot, max_retries=2) == FAILED
+    assert bot.calls == 3
+
+
+def test_reminder_candidates_are_paged_by_user_id(test_db):
+    for user_id in (3001, 3002, 3003):
+        test_db.get_or_create_user(user_id, f"user{user_id}", "Анна", "")
+    today = date.today()
+    week_ago = today - timedelta(days=7)
+
+    first = test_db.get_reminder_candidates_page(week_ago, today, 0, 2)
+    second = test_db.get_reminder_candidates_page(week_ago, today, first[-1][0], 2)
+
+    assert [row[0] for row in first] == [3001, 3002]
+    assert [row[0] for row in second] == [3003]
+    assert test_db.get_reminder_candidates_page(week_ago, today, second[-1][0], 2) == []
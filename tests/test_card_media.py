@@ -0,0 +1,100 @@
+# Проверки кэша file_id картинок карт (card_media.py) без обращения к Telegram и базе
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("telegram")
+pytest.importorskip("psycopg2")
+
+from telegram.error import BadRequest
+
+import card_media as card_media_module
+from card_media import CardMediaCache
+
+URL_1 = "https://i.ibb.co/card1.jpg"
+URL_2 = "https://i.ibb.co/card2.jpg"
+
+
+class FakeDb:
+    def __init__(self, media):
+        self.media = media
+
+    def get_card_media(self):
+        return dict(self.media)
+
+
+class FakeAsyncDb:
+    def __init__(self):
+        self.saved = []
+
+    async def save_card_media(self, image_url, file_id, file_unique_id=None):
+        self.saved.append((image_url, file_id, file_unique_id))
+        return True
+
+
+def photo_message(file_id, file_unique_id):
+    return SimpleNamespace(photo=[SimpleNamespace(file_id=file_id, file_unique_id=file_unique_id)])
+
+
+class FakeMessage:
+    """Сообщение, которое отвергает альбом, пока в нем есть file_id из reject"""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.media_groups = []
+
+    async def reply_media_group(self, media, **kwargs):
+        sent_media = [item.media for item in media]
+        self.media_groups.append(sent_media)
+        if self.reject & set(sent_media):
+            raise BadRequest("Wrong file identifier/http url specified")
+        return [photo_message(f"new_{i}", f"unique_{i}") for i in range(len(media))]
+
+
+@pytest.fixture
+def fake_async_db(monkeypatch):
+    fake = FakeAsyncDb()
+    monkeypatch.setattr(card_media_module, "async_db", fake)
+    return fake
+
+
+def test_remember_skips_new_file_id_for_same_file(fake_async_db):
+    cache = CardMediaCache(FakeDb({URL_1: ("file_a", "unique_1")}))
+
+    asyncio.run(cache.remember(URL_1, photo_message("file_b", "unique_1")))
+
+    assert fake_async_db.saved == []
+    assert cache.get_photo(URL_1) == "file_a"
+
+
+def test_remember_saves_changed_file(fake_async_db):
+    cache = CardMediaCache(FakeDb({URL_1: ("file_a", "unique_1")}))
+
+    asyncio.run(cache.remember(URL_1, photo_message("file_b", "unique_2")))
+
+    assert fake_async_db.saved == [(URL_1, "file_b", "unique_2")]
+    assert cache.get_photo(URL_1) == "file_b"
+
+
+def test_reply_media_group_retries_with_urls_for_stale_file_id(fake_async_db):
+    cache = CardMediaCache(FakeDb({URL_1: ("stale_file", "old_unique")}))
+    message = FakeMessage(reject={"stale_file"})
+
+    sent = asyncio.run(cache.reply_media_group(message, [(URL_1, "Карта 1"), (URL_2, "Карта 2")]))
+
+    assert message.media_groups == [["stale_file", URL_2], [URL_1, URL_2]]
+    assert len(sent) == 2
+    assert cache.get_photo(URL_1) == "new_0"
+    assert cache.get_photo(URL_2) == "new_1"
+
+
+def test_reply_media_group_without_cached_file_ids_raises(fake_async_db):
+    cache = CardMediaCache(FakeDb({}))
+    message = FakeMessage(reject={URL_1})
+
+    with pytest.raises(BadRequest):
+        asyncio.run(cache.reply_media_group(message, [(URL_1, "Карта 1")]))
+
+    assert message.media_groups == [[URL_1]]
@@ -0,0 +1,32 @@
+# Счетчики user_daily_usage на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+import pytest
+
+USER_ID = 2001
+
+
+def meditation_usage(db, user_id):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COALESCE(SUM(meditations), 0) FROM user_daily_usage WHERE user_id = %s", (user_id,))
+        usage = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM user_meditations WHERE user_id = %s", (user_id,))
+        return usage, cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def free_user(test_db):
+    test_db.get_or_create_user(USER_ID, "user", "Анна", "")
+    return USER_ID
+
+
+def test_repeated_meditation_watch_counted_once(test_db, free_user):
+    assert test_db.record_meditation_watch(free_user)
+    assert test_db.record_meditation_watch(free_user)
+    assert test_db.record_meditation_watch(free_user)
+
+    # Как в заполнении миграции 0002: одна единица на запись user_meditations
+    assert meditation_usage(test_db, free_user) == (1, 1)
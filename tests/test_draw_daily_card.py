@@ -0,0 +1,78 @@
+# Выдача карты дня функцией draw_daily_card (migrations/0002_daily_usage.sql)
+# на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import DAILY_CARD_LIMIT_PREMIUM
+
+USER_ID = 5001
+
+
+def cards_drawn(db, user_id):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*) FROM user_cards WHERE user_id = %s", (user_id,))
+        history = cursor.fetchone()[0]
+        cursor.execute("SELECT COALESCE(SUM(cards), 0) FROM user_daily_usage WHERE user_id = %s", (user_id,))
+        return history, cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def card_db(test_db):
+    # Справочник карт нужен для внешнего ключа user_cards.card_id
+    test_db.sync_cards()
+    test_db.get_or_create_user(USER_ID, "user", "Анна", "")
+    return test_db
+
+
+def test_free_user_gets_one_card_per_day(card_db):
+    card, remaining, _ = card_db.draw_daily_card(USER_ID)
+    assert card is not None and remaining == 0
+
+    card, _, message = card_db.draw_daily_card(USER_ID)
+
+    assert card is None
+    assert message == "Вы уже брали карту сегодня"
+    assert cards_drawn(card_db, USER_ID) == (1, 1)
+
+
+def test_premium_user_limited_by_daily_cards_limit(card_db):
+    assert card_db.create_subscription(USER_ID, "month", 30)
+
+    results = [card_db.draw_daily_card(USER_ID) for _ in range(DAILY_CARD_LIMIT_PREMIUM + 1)]
+
+    assert all(card is not None for card, _, _ in results[:-1])
+    assert [remaining for _, remaining, _ in results[:-1]] == list(range(DAILY_CARD_LIMIT_PREMIUM - 1, -1, -1))
+    assert results[-1][0] is None
+    assert cards_drawn(card_db, USER_ID) == (DAILY_CARD_LIMIT_PREMIUM, DAILY_CARD_LIMIT_PREMIUM)
+
+
+def test_expired_premium_is_downgraded_on_draw(card_db):
+    assert card_db.create_subscription(USER_ID, "month", 30)
+    conn = card_db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE users SET premium_until = %s WHERE user_id = %s",
+                       (datetime.now() - timedelta(days=1), USER_ID))
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert card_db.draw_daily_card(USER_ID)[0] is not None
+    assert card_db.draw_daily_card(USER_ID)[0] is None
+    assert card_db.get_user_subscription(USER_ID) is None
+
+
+def test_concurrent_draws_give_one_free_card(card_db):
+    # Двойное нажатие: строка пользователя блокируется, вторая выдача ждет первую
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: card_db.draw_daily_card(USER_ID), range(4)))
+
+    assert sum(card is not None for card, _, _ in results) == 1
+    assert cards_drawn(card_db, USER_ID) == (1, 1)
@@ -0,0 +1,95 @@
+# Проверки помесячных секций истории на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+import os
+from datetime import date
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "migrations", "0005_partition_default_rows.sql"
+)
+TABLE = "test_history"
+
+
+def month_start(offset):
+    today = date.today()
+    index = today.year * 12 + today.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@pytest.fixture
+def conn():
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    cursor = conn.cursor()
+    with open(MIGRATION, encoding="utf-8") as f:
+        cursor.execute(f.read())
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE} CASCADE")
+    cursor.execute(f'''
+        CREATE TABLE {TABLE} (
+            id SERIAL,
+            user_id BIGINT,
+            drawn_date DATE NOT NULL,
+            PRIMARY KEY (id, drawn_date)
+        ) PARTITION BY RANGE (drawn_date)
+    ''')
+    cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    conn.commit()
+    yield conn
+    conn.rollback()
+    cursor.execute(f"DROP TABLE IF EXISTS {TABLE} CASCADE")
+    conn.commit()
+    conn.close()
+
+
+def partition_of(cursor, row_id):
+    cursor.execute(f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = %s", (row_id,))
+    return cursor.fetchone()[0]
+
+
+def test_create_partition_moves_rows_from_default(conn):
+    cursor = conn.cursor()
+    month = month_start(1)
+    cursor.execute(f'''
+        INSERT INTO {TABLE} (user_id, drawn_date) VALUES (1, %s), (2, %s) RETURNING id
+    ''', (month, month_start(6)))
+    moved_id, other_id = [row[0] for row in cursor.fetchall()]
+    conn.commit()
+
+    cursor.execute("SELECT create_monthly_partition(%s, %s)", (TABLE, month))
+    conn.commit()
+
+    assert partition_of(cursor, moved_id) == f"{TABLE}_p{month:%Y%m}"
+    assert partition_of(cursor, other_id) == f"{TABLE}_default"
+    cursor.execute('''
+        SELECT pg_get_expr(c.relpartbound, c.oid) FROM pg_class c WHERE c.relname = %s
+    ''', (f"{TABLE}_default",))
+    assert cursor.fetchone()[0] == "DEFAULT"
+
+
+def test_maintain_history_partitions_with_rows_in_default(conn, monkeypatch):
+    import database
+
+    cursor = conn.cursor()
+    cursor.execute(f"INSERT INTO {TABLE} (user_id, drawn_date) VALUES (1, %s) RETURNING id", (month_start(2),))
+    row_id = cursor.fetchone()[0]
+    conn.commit()
+
+    # Ошибка по одной таблице не должна мешать секциям остальных
+    monkeypatch.setattr(database, "HISTORY_TABLES", ("missing_history", TABLE))
+    manager = database.DatabaseManager()
+    manager.get_connection = lambda: psycopg2.connect(TEST_DATABASE_URL)
+
+    created, removed = manager.maintain_history_partitions(months_ahead=3)
+
+    assert (created, removed) == (4, 0)
+    assert partition_of(cursor, row_id) == f"{TABLE}_p{month_start(2):%Y%m}"
+
+    # Повторный запуск ничего не создает и не падает
+    assert manager.maintain_history_partitions(months_ahead=3) == (0, 0)
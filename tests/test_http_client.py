@@ -0,0 +1,108 @@
+# Автоматы провайдеров в http_client.py без сетевых запросов
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+
+import http_client as http_client_module
+from http_client import CircuitBreaker, CircuitOpenError, HttpClient, _ProviderStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(http_client_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_opens_after_threshold_failures_in_a_row(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    # Пока пробный запрос не завершился, остальные отклоняются
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_for_next_period(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_client_errors_do_not_open_circuit(clock):
+    stats = _ProviderStats()
+    for _ in range(10):
+        breaker = stats.before("yookassa")
+        stats.after("yookassa", breaker, clock.now, status_code=404)
+
+    assert stats.get_stats()["yookassa"]["circuit"] == "closed"
+
+
+def test_request_is_not_sent_while_circuit_is_open(clock, monkeypatch):
+    monkeypatch.setattr(http_client_module, "stats", _ProviderStats())
+    client = HttpClient(retries=0)
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(url)
+        return SimpleNamespace(status_code=503)
+
+    monkeypatch.setattr(client._session, "request", request)
+    monkeypatch.setattr(client._retry_session, "request", request)
+
+    for _ in range(5):
+        client.get("https://api.yookassa.ru/v3/payments/1")
+    with pytest.raises(CircuitOpenError):
+        client.get("https://api.yookassa.ru/v3/payments/1")
+
+    assert len(sent) == 5
+    assert http_client_module.get_stats()["yookassa"]["circuit"] == "open"
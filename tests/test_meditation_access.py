@@ -0,0 +1,44 @@
+# Доступ к медитации определяется таблицей subscriptions, а не кэшем прав
+# (users.is_premium) - на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+from datetime import datetime, timedelta
+
+import pytest
+
+USER_ID = 4001
+
+
+def add_subscription(db, user_id, end_date):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute('''
+            INSERT INTO subscriptions (user_id, subscription_type, start_date, end_date, is_active)
+            VALUES (%s, 'month', CURRENT_TIMESTAMP, %s, TRUE)
+        ''', (user_id, end_date))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def watched_user(test_db):
+    test_db.get_or_create_user(USER_ID, "user", "Анна", "")
+    assert test_db.record_meditation_watch(USER_ID)
+    return USER_ID
+
+
+def test_free_watch_is_used_once(test_db, watched_user):
+    allowed, _ = test_db.can_watch_meditation(watched_user)
+
+    assert not allowed
+
+
+def test_subscription_row_opens_access_without_premium_flag(test_db, watched_user):
+    # Подписка есть только в subscriptions: users.is_premium не выставлен
+    add_subscription(test_db, watched_user, datetime.now() + timedelta(days=30))
+    assert not test_db.has_active_subscription(watched_user)
+
+    allowed, _ = test_db.can_watch_meditation(watched_user)
+
+    assert allowed
@@ -0,0 +1,129 @@
+# Общий токен PayPal: обновление под блокировкой (DatabaseManager.refresh_oauth_token
+# на настоящем PostgreSQL, TEST_DATABASE_URL) и кэш в процессе (PayPalPayment.get_access_token)
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("psycopg2")
+
+import paypal_payment as paypal_payment_module
+from paypal_payment import PayPalPayment, TOKEN_REFRESH_MARGIN
+
+
+class TokenServer:
+    """Аналог /v1/oauth2/token: выдает token-1, token-2, ... и считает запросы"""
+
+    def __init__(self, expires_in=32400, delay=0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            token = f"token-{self.calls}"
+        time.sleep(self.delay)
+        return token, self.expires_in
+
+
+def test_concurrent_refresh_requests_token_once(test_db):
+    server = TokenServer(delay=0.2)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: test_db.refresh_oauth_token("paypal", server, 600), range(4)))
+
+    assert server.calls == 1
+    assert {token for token, _ in results} == {"token-1"}
+    assert test_db.get_oauth_token("paypal")[0] == "token-1"
+
+
+def test_valid_shared_token_is_reused(test_db):
+    server = TokenServer()
+    test_db.refresh_oauth_token("paypal", server, 600)
+
+    token, expires_in = test_db.refresh_oauth_token("paypal", server, 600)
+
+    assert token == "token-1" and expires_in > 600
+    assert server.calls == 1
+
+
+def test_token_expiring_within_margin_is_refreshed(test_db):
+    server = TokenServer(expires_in=300)
+    test_db.refresh_oauth_token("paypal", server, 600)
+
+    token, _ = test_db.refresh_oauth_token("paypal", server, 600)
+
+    assert token == "token-2"
+    assert server.calls == 2
+
+
+def test_failed_refresh_keeps_stored_token(test_db):
+    test_db.refresh_oauth_token("paypal", TokenServer(expires_in=300), 0)
+
+    assert test_db.refresh_oauth_token("paypal", lambda: (None, None), 600) == (None, None)
+    assert test_db.get_oauth_token("paypal")[0] == "token-1"
+
+
+class FakeDb:
+    """Общий кэш токенов без базы: считает обращения"""
+
+    def __init__(self, server, broken=False):
+        self.server = server
+        self.broken = broken
+        self.refreshes = 0
+
+    def get_oauth_token(self, provider):
+        if self.broken:
+            raise RuntimeError("database is down")
+        return None, None
+
+    def refresh_oauth_token(self, provider, fetch_token, min_valid_seconds=0):
+        self.refreshes += 1
+        return self.server()
+
+
+@pytest.fixture
+def payment(monkeypatch):
+    def use_db(fake_db):
+        monkeypatch.setattr(paypal_payment_module, "db", fake_db)
+        payment = PayPalPayment()
+        monkeypatch.setattr(payment, "_request_access_token", fake_db.server)
+        return payment
+
+    return use_db
+
+
+def test_threads_of_one_process_refresh_once(payment):
+    fake_db = FakeDb(TokenServer(delay=0.2))
+    paypal = payment(fake_db)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        tokens = list(pool.map(lambda _: paypal.get_access_token(), range(4)))
+
+    assert tokens == ["token-1"] * 4
+    assert fake_db.refreshes == 1
+    # Следующие вызовы берут токен из памяти
+    assert paypal.get_access_token() == "token-1"
+    assert fake_db.refreshes == 1
+
+
+def test_token_is_renewed_before_it_expires(payment):
+    fake_db = FakeDb(TokenServer(expires_in=TOKEN_REFRESH_MARGIN - 1))
+    paypal = payment(fake_db)
+
+    assert paypal.get_access_token() == "token-1"
+    assert paypal.get_access_token() == "token-2"
+
+
+def test_token_is_requested_directly_without_database(payment):
+    fake_db = FakeDb(TokenServer(), broken=True)
+    paypal = payment(fake_db)
+
+    assert paypal.get_access_token() == "token-1"
+    assert fake_db.refreshes == 0
+    assert fake_db.server.calls == 1
@@ -0,0 +1,66 @@
+# Поиск пользователя платежа по payment_correlations (DatabaseManager.find_payment_user)
+# на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+import pytest
+
+BY_PAYMENT_ID, BY_INTERNAL_ID, BY_EMAIL, BY_PHONE, BY_AMOUNT = 6001, 6002, 6003, 6004, 6005
+
+
+@pytest.fixture
+def correlations(test_db):
+    # У каждого пользователя свой признак, которым его можно найти
+    for user_id in (BY_PAYMENT_ID, BY_INTERNAL_ID, BY_EMAIL, BY_PHONE, BY_AMOUNT):
+        test_db.get_or_create_user(user_id, f"user{user_id}", "Анна", "")
+    test_db.save_payment_correlation(BY_PAYMENT_ID, "yookassa", provider_payment_id="pay-1")
+    test_db.save_payment_correlation(BY_INTERNAL_ID, "yookassa", internal_payment_id="order-1")
+    test_db.save_payment_correlation(BY_EMAIL, "yookassa", email="anna@example.com")
+    test_db.save_payment_correlation(BY_PHONE, "yookassa", phone="+7 (900) 123-45-67")
+    test_db.save_payment_correlation(BY_AMOUNT, "yookassa", amount=99)
+    return test_db
+
+
+def find(db, **kwargs):
+    return db.find_payment_user("yookassa", **kwargs)
+
+
+def test_priority_order(correlations):
+    everything = dict(provider_payment_id="pay-1", internal_payment_id="order-1",
+                      email="anna@example.com", phone="79001234567", amount=99)
+
+    assert find(correlations, **everything) == BY_PAYMENT_ID
+    everything.pop("provider_payment_id")
+    assert find(correlations, **everything) == BY_INTERNAL_ID
+    everything.pop("internal_payment_id")
+    assert find(correlations, **everything) == BY_EMAIL
+    everything.pop("email")
+    assert find(correlations, **everything) == BY_PHONE
+    everything.pop("phone")
+    assert find(correlations, **everything) == BY_AMOUNT
+
+
+def test_email_and_phone_are_normalized(correlations):
+    assert find(correlations, email="  Anna@Example.COM ") == BY_EMAIL
+    assert find(correlations, phone="8 900 123 45 67") == BY_PHONE
+
+
+def test_amount_matches_once(correlations):
+    assert find(correlations, amount=99) == BY_AMOUNT
+    # Сумма - слабый признак: вторая оплата на ту же сумму не найдет того же пользователя
+    assert find(correlations, amount=99) is None
+
+
+def test_amount_of_other_provider_is_ignored(correlations):
+    assert correlations.find_payment_user("paypal", amount=99) is None
+
+
+def test_amount_outside_window_is_ignored(correlations):
+    conn = correlations.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("UPDATE payment_correlations SET created_at = NOW() - INTERVAL '2 hours'")
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert find(correlations, amount=99) is None
+    assert find(correlations, provider_payment_id="pay-1") == BY_PAYMENT_ID
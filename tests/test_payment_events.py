@@ -0,0 +1,186 @@
+# Платежные события: очередь payment_events (захват, повторы, зависшие события) и
+# однократная активация при повторной доставке (processed_payments, bot.dispatch_payment_event)
+# - на настоящем PostgreSQL (TEST_DATABASE_URL)
+
+import pytest
+
+pytest.importorskip("telegram")
+pytest.importorskip("flask")
+pytest.importorskip("psycopg2")
+
+# bot.py импортирует handlers, а handlers - bot: первым импортируется handlers
+import handlers  # noqa: F401
+import bot
+from payment_events import PaymentEventQueue
+
+USER_ID = 1001
+PAYMENT_ID = "pay-1"
+
+
+def yookassa_payload(payment_id=PAYMENT_ID, amount="99.00"):
+    return {
+        "event": "payment.succeeded",
+        "object": {
+            "id": payment_id,
+            "status": "succeeded",
+            "amount": {"value": amount, "currency": "RUB"},
+            "metadata": {},
+        },
+    }
+
+
+@pytest.fixture
+def paying_user(test_db):
+    test_db.get_or_create_user(USER_ID, "user", "Анна", "")
+    test_db.save_payment_correlation(USER_ID, "yookassa", amount=99, provider_payment_id=PAYMENT_ID)
+    return USER_ID
+
+
+@pytest.fixture
+def admin_notifications(monkeypatch):
+    sent = []
+    monkeypatch.setattr(bot, "send_admin_notification_successful", lambda *args: sent.append(args))
+    monkeypatch.setattr(bot, "send_admin_notification_failed", lambda *args: sent.append(args))
+    return sent
+
+
+def subscription_rows(db, user_id):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT COUNT(*), MAX(end_date) FROM subscriptions WHERE user_id = %s", (user_id,))
+        count, end_date = cursor.fetchone()
+        cursor.execute("SELECT premium_until FROM users WHERE user_id = %s", (user_id,))
+        return count, end_date, cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_create_subscription_once_per_payment_key(test_db, paying_user):
+    assert test_db.create_subscription(paying_user, "month", 30, payment_key="yookassa:pay-1")
+    first = subscription_rows(test_db, paying_user)
+
+    assert not test_db.create_subscription(paying_user, "month", 30, payment_key="yookassa:pay-1")
+
+    assert subscription_rows(test_db, paying_user) == first
+    assert first[0] == 1
+    assert test_db.is_payment_processed("yookassa:pay-1")
+
+
+def test_same_event_delivered_twice_activates_once(test_db, paying_user, admin_notifications):
+    # Второй запуск - как после requeue_stale: обработчик отработал, а _finish не успел
+    assert bot.dispatch_payment_event("yookassa", "payment.succeeded", yookassa_payload())
+    first = subscription_rows(test_db, paying_user)
+
+    assert bot.dispatch_payment_event("yookassa", "payment.succeeded", yookassa_payload())
+
+    assert first[0] == 1
+    assert subscription_rows(test_db, paying_user) == first
+    assert len(admin_notifications) == 1
+
+
+def test_retry_after_error_does_not_extend_subscription(test_db, paying_user, monkeypatch):
+    # Уведомление администратора падает после активации: обработчик вернет 500
+    calls = []
+
+    def failing_notification(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("telegram is down")
+
+    monkeypatch.setattr(bot, "send_admin_notification_successful", failing_notification)
+
+    queue = PaymentEventQueue(test_db, retry_delay=0)
+    queue.set_handler(bot.dispatch_payment_event)
+    assert queue.enqueue("yookassa", "payment.succeeded", "yookassa:evt-1", yookassa_payload())
+
+    assert queue.process_pending() == 2
+
+    count, _, _ = subscription_rows(test_db, paying_user)
+    assert count == 1
+    assert len(calls) == 1
+    stats = queue.get_stats()
+    assert stats["retried"] == 1 and stats["processed"] == 1
+
+
+def test_capture_and_order_events_share_payment_key():
+    capture = {"resource": {"id": "CAPTURE-1", "supplementary_data": {"related_ids": {"order_id": "ORDER-1"}}}}
+    order = {"resource": {"id": "ORDER-1"}}
+
+    assert bot.payment_event_key("paypal", capture) == "paypal:ORDER-1"
+    assert bot.payment_event_key("paypal_deck", order) == "paypal:ORDER-1"
+    assert bot.payment_event_key("yookassa", yookassa_payload()) == "yookassa:pay-1"
+
+
+def event_rows(db):
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT idempotency_key, status, attempts FROM payment_events ORDER BY id")
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def test_duplicate_event_is_enqueued_once(test_db):
+    queue = PaymentEventQueue(test_db)
+
+    assert queue.enqueue("yookassa", "payment.succeeded", "yookassa:evt-1", yookassa_payload())
+    assert not queue.enqueue("yookassa", "payment.succeeded", "yookassa:evt-1", yookassa_payload())
+
+    assert event_rows(test_db) == [("yookassa:evt-1", "pending", 0)]
+    assert queue.get_stats()["duplicates"] == 1
+
+
+def test_claim_skips_events_locked_by_another_worker(test_db):
+    queue = PaymentEventQueue(test_db)
+    for key in ("evt-1", "evt-2"):
+        queue.enqueue("yookassa", "payment.succeeded", key, yookassa_payload())
+
+    # Второй обработчик держит evt-1 в своей транзакции
+    conn = test_db.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM payment_events WHERE idempotency_key = 'evt-1' FOR UPDATE")
+        claimed = queue._claim_batch()
+    finally:
+        conn.rollback()
+        conn.close()
+
+    assert len(claimed) == 1
+    assert event_rows(test_db) == [("evt-1", "pending", 0), ("evt-2", "processing", 1)]
+
+
+def test_failed_event_waits_for_retry_delay(test_db):
+    queue = PaymentEventQueue(test_db, retry_delay=60)
+    queue.set_handler(lambda *args: False)
+    queue.enqueue("yookassa", "payment.succeeded", "evt-1", yookassa_payload())
+
+    assert queue.process_pending() == 1
+    # Повтор отложен: событие не забирается до next_attempt_at
+    assert queue.process_pending() == 0
+    assert event_rows(test_db) == [("evt-1", "pending", 1)]
+
+
+def test_event_fails_after_max_attempts(test_db):
+    queue = PaymentEventQueue(test_db, retry_delay=0, max_attempts=3)
+    queue.set_handler(lambda *args: 1 / 0)
+    queue.enqueue("yookassa", "payment.succeeded", "evt-1", yookassa_payload())
+
+    assert queue.process_pending() == 3
+
+    assert event_rows(test_db) == [("evt-1", "failed", 3)]
+    stats = queue.get_stats()
+    assert stats["retried"] == 2 and stats["failed"] == 1
+
+
+def test_requeue_stale_returns_stuck_events(test_db):
+    queue = PaymentEventQueue(test_db)
+    queue.enqueue("yookassa", "payment.succeeded", "evt-1", yookassa_payload())
+    assert len(queue._claim_batch()) == 1
+
+    # Обработчик упал, не вызвав _finish
+    assert queue.requeue_stale(minutes=10) == 0
+    assert queue.requeue_stale(minutes=0) == 1
+
+    assert event_rows(test_db) == [("evt-1", "pending", 1)]
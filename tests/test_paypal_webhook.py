@@ -0,0 +1,133 @@
+# Локальная проверка подписи вебхуков PayPal (paypal_webhook.py) на самоподписанном сертификате
+
+import base64
+import zlib
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("cryptography")
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+import paypal_webhook as paypal_webhook_module
+from paypal_webhook import PayPalWebhookVerifier
+
+WEBHOOK_ID = "WH-TEST"
+CERT_URL = "https://api.paypal.com/v1/notifications/certs/CERT-1"
+BODY = b'{"event_type": "PAYMENT.CAPTURE.COMPLETED"}'
+
+KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def make_cert(common_name="messageverificationcerts.paypal.com", valid_from=-1, valid_to=30):
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, common_name)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(KEY.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now + timedelta(days=valid_from))
+        .not_valid_after(now + timedelta(days=valid_to))
+        .sign(KEY, hashes.SHA256())
+    )
+    return cert.public_bytes(serialization.Encoding.PEM)
+
+
+def sign(message: str) -> str:
+    return base64.b64encode(KEY.sign(message.encode("utf-8"), padding.PKCS1v15(), hashes.SHA256())).decode()
+
+
+def headers(body=BODY, cert_url=CERT_URL, signature=None):
+    transmission_id, transmission_time = "tx-1", "2026-10-17T10:00:00Z"
+    # Формат подписываемой строки из документации PayPal: crc32 тела - беззнаковое десятичное
+    message = f"{transmission_id}|{transmission_time}|{WEBHOOK_ID}|{zlib.crc32(body) & 0xffffffff}"
+    return {
+        "PAYPAL-AUTH-ALGO": "SHA256withRSA",
+        "PAYPAL-CERT-URL": cert_url,
+        "PAYPAL-TRANSMISSION-ID": transmission_id,
+        "PAYPAL-TRANSMISSION-SIG": signature or sign(message),
+        "PAYPAL-TRANSMISSION-TIME": transmission_time,
+    }
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Сертификаты, которые "отдает" PayPal: url -> PEM; список скачанных url"""
+    downloads = SimpleNamespace(certs={CERT_URL: make_cert()}, urls=[])
+
+    def get(url, **kwargs):
+        downloads.urls.append(url)
+        return SimpleNamespace(content=downloads.certs[url], raise_for_status=lambda: None)
+
+    monkeypatch.setattr(paypal_webhook_module, "http_client", SimpleNamespace(get=get))
+    return downloads
+
+
+@pytest.fixture
+def verifier():
+    return PayPalWebhookVerifier(WEBHOOK_ID)
+
+
+def test_valid_signature(verifier, downloads):
+    assert verifier.verify(headers(), BODY) is True
+
+
+def test_signature_covers_body_crc32(verifier, downloads):
+    assert verifier.verify(headers(), BODY + b" ") is False
+
+
+def test_body_with_high_crc32_bit(verifier, downloads):
+    # zlib.crc32 этого тела больше 2**31: подписывается беззнаковое значение
+    body = b'{"id": "WH-3"}'
+    while zlib.crc32(body) < 2 ** 31:
+        body += b" "
+
+    assert verifier.verify(headers(body=body), body) is True
+
+
+def test_signature_for_other_webhook_id_is_rejected(downloads):
+    assert PayPalWebhookVerifier("WH-OTHER").verify(headers(), BODY) is False
+
+
+@pytest.mark.parametrize("cert_url", [
+    "https://evil.example.com/v1/notifications/certs/CERT-1",
+    "http://api.paypal.com/v1/notifications/certs/CERT-1",
+    "https://api.paypal.com/v1/other/CERT-1",
+    "https://api.paypal.com.evil.example.com/v1/notifications/certs/CERT-1",
+])
+def test_disallowed_cert_url_is_not_downloaded(verifier, downloads, cert_url):
+    assert verifier.verify(headers(cert_url=cert_url), BODY) is False
+    assert downloads.urls == []
+
+
+def test_certificate_of_other_subject_falls_back_to_api(verifier, downloads):
+    downloads.certs[CERT_URL] = make_cert(common_name="evil.example.com")
+
+    assert verifier.verify(headers(), BODY) is None
+
+
+def test_expired_certificate_is_rejected(verifier, downloads):
+    downloads.certs[CERT_URL] = make_cert(valid_from=-30, valid_to=-1)
+
+    assert verifier.verify(headers(), BODY) is False
+
+
+def test_certificate_is_downloaded_once(verifier, downloads):
+    assert verifier.verify(headers(), BODY) is True
+    assert verifier.verify(headers(), BODY) is True
+
+    assert downloads.urls == [CERT_URL]
+
+
+def test_missing_headers_are_rejected(verifier, downloads):
+    incomplete = headers()
+    del incomplete["PAYPAL-TRANSMISSION-SIG"]
+
+    assert verifier.verify(incomplete, BODY) is False
@@ -0,0 +1,144 @@
+# Версионные миграции (schema_migrations.py): порядок файлов, разбиение на операторы
+# и применение на настоящем PostgreSQL (TEST_DATABASE_URL) в отдельной схеме
+
+import os
+
+import pytest
+
+from schema_migrations import NO_TRANSACTION_MARKER, _split_statements, apply_migrations, list_migrations
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+SCHEMA = "migrations_test"
+
+
+def write_migrations(directory, **files):
+    for filename, sql in files.items():
+        (directory / f"{filename}.sql").write_text(sql, encoding="utf-8")
+    return str(directory)
+
+
+class SchemaDatabase:
+    """Минимальный аналог DatabaseManager: соединения с search_path на тестовую схему"""
+
+    def __init__(self, psycopg2):
+        self.psycopg2 = psycopg2
+
+    def get_connection(self):
+        return self.psycopg2.connect(TEST_DATABASE_URL, options=f"-c search_path={SCHEMA}")
+
+    def query(self, sql, params=None):
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall() if cursor.description else None
+            conn.commit()
+            return rows
+        finally:
+            conn.close()
+
+
+@pytest.fixture
+def schema_db():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    admin = psycopg2.connect(TEST_DATABASE_URL)
+    admin.autocommit = True
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    yield SchemaDatabase(psycopg2)
+    admin.cursor().execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    admin.close()
+
+
+def test_list_migrations_orders_by_version(tmp_path):
+    directory = write_migrations(tmp_path, **{"0010_later": "", "0002_first": "", "notes": ""})
+
+    assert [(version, name) for version, name, _ in list_migrations(directory)] == [(2, "first"), (10, "later")]
+
+
+def test_list_migrations_rejects_duplicate_versions(tmp_path):
+    directory = write_migrations(tmp_path, **{"0001_a": "", "0001_b": ""})
+
+    with pytest.raises(ValueError):
+        list_migrations(directory)
+
+
+def test_split_statements_skips_leading_comments():
+    sql = f"{NO_TRANSACTION_MARKER}\n-- комментарий\n\nCREATE INDEX a\n    ON t(x);\nDROP INDEX b;\n"
+
+    assert _split_statements(sql) == ["CREATE INDEX a\n    ON t(x);", "DROP INDEX b;"]
+
+
+def test_migrations_are_applied_once_and_in_order(schema_db, tmp_path):
+    directory = write_migrations(tmp_path, **{
+        "0001_items": "CREATE TABLE items (id INTEGER PRIMARY KEY);",
+        "0002_name": "ALTER TABLE items ADD COLUMN name TEXT;",
+    })
+
+    assert apply_migrations(schema_db, directory) == [1, 2]
+    assert apply_migrations(schema_db, directory) == []
+
+    write_migrations(tmp_path, **{"0003_seed": "INSERT INTO items (id, name) VALUES (1, 'a');"})
+    assert apply_migrations(schema_db, directory) == [3]
+
+    assert schema_db.query("SELECT version, name FROM schema_version ORDER BY version") == [
+        (1, "items"), (2, "name"), (3, "seed")
+    ]
+
+
+def test_failed_migration_is_rolled_back_and_retried(schema_db, tmp_path):
+    directory = write_migrations(tmp_path, **{
+        "0001_items": "CREATE TABLE items (id INTEGER PRIMARY KEY);",
+        "0002_broken": "ALTER TABLE items ADD COLUMN name TEXT; SELECT missing_column FROM items;",
+    })
+
+    with pytest.raises(Exception):
+        apply_migrations(schema_db, directory)
+
+    assert schema_db.query("SELECT version FROM schema_version") == [(1,)]
+    assert schema_db.query(
+        "SELECT COUNT(*) FROM information_schema.columns WHERE table_schema = %s AND table_name = 'items' AND column_name = 'name'",
+        (SCHEMA,)
+    ) == [(0,)]
+
+    write_migrations(tmp_path, **{"0002_broken": "ALTER TABLE items ADD COLUMN name TEXT;"})
+    assert apply_migrations(schema_db, directory) == [2]
+
+
+def test_no_transaction_migration_runs_concurrent_index(schema_db, tmp_path):
+    directory = write_migrations(tmp_path, **{
+        "0001_items": "CREATE TABLE items (id INTEGER, name TEXT);",
+        # В транзакции CREATE INDEX CONCURRENTLY завершился бы ошибкой
+        "0002_index": f"{NO_TRANSACTION_MARKER}\nCREATE INDEX CONCURRENTLY IF NOT EXISTS idx_items_name\n    ON items(name);\n",
+    })
+
+    assert apply_migrations(schema_db, directory) == [1, 2]
+    assert schema_db.query(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = %s AND tablename = 'items'", (SCHEMA,)
+    ) == [("idx_items_name",)]
+
+
+def test_invalid_index_is_rebuilt(schema_db, tmp_path):
+    # Прерванный CREATE UNIQUE INDEX CONCURRENTLY оставляет индекс INVALID
+    schema_db.query("CREATE TABLE items (id INTEGER); INSERT INTO items VALUES (1), (1)")
+    conn = schema_db.get_connection()
+    conn.autocommit = True
+    try:
+        with pytest.raises(Exception):
+            conn.cursor().execute("CREATE UNIQUE INDEX CONCURRENTLY idx_items_id ON items(id)")
+    finally:
+        conn.close()
+    schema_db.query("DELETE FROM items WHERE ctid = (SELECT MAX(ctid) FROM items)")
+
+    directory = write_migrations(tmp_path, **{
+        "0001_index": f"{NO_TRANSACTION_MARKER}\nCREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_items_id\n    ON items(id);\n",
+    })
+    assert apply_migrations(schema_db, directory) == [1]
+
+    assert schema_db.query('''
+        SELECT i.indisvalid FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'idx_items_id'
+    ''') == [(True,)]
@@ -0,0 +1,46 @@
+# ttl_cache.py - простой кэш в памяти с ограничением времени жизни записей
+
+import threading
+import time
+
+
+class TTLCache:
+    """Потокобезопасный кэш: запись живет ttl секунд, при переполнении
+    вытесняется запись, которая истекает раньше всех"""
+
+    def __init__(self, ttl: float, max_size: int = 1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(self, key, value, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_size:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,77 @@
+# webhook_server.py - один ASGI сервер для вебхука Telegram и маршрутов Flask
+
+import hmac
+import logging
+
+import uvicorn
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+from telegram import Update
+
+
+def create_asgi_app(application, flask_app, webhook_path: str, secret_token: str = "", wsgi_workers: int = 10):
+    """ASGI приложение: POST webhook_path - обновления Telegram, всё остальное - Flask"""
+
+    async def telegram_webhook(request: Request):
+        if secret_token:
+            received = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+            if not hmac.compare_digest(received, secret_token):
+                logging.warning("⚠️ Telegram webhook request with invalid secret token")
+                return Response(status_code=403)
+
+        try:
+            data = await request.json()
+        except ValueError:
+            return Response(status_code=400)
+
+        await application.update_queue.put(Update.de_json(data, application.bot))
+        return Response(status_code=200)
+
+    return Starlette(routes=[
+        Route(webhook_path, telegram_webhook, methods=["POST"]),
+        Mount("/", app=WSGIMiddleware(flask_app, workers=wsgi_workers)),
+    ])
+
+
+async def serve(application, flask_app, host: str, port: int, webhook_url: str, webhook_path: str,
+                secret_token: str = "", allowed_updates=None, wsgi_workers: int = 10,
+                limit_concurrency: int = None, timeout_keep_alive: int = 5):
+    """Регистрирует вебхук и обслуживает бота и Flask до сигнала остановки"""
+    config = uvicorn.Config(
+        create_asgi_app(application, flask_app, webhook_path, secret_token, wsgi_workers),
+        host=host,
+        port=port,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        limit_concurrency=limit_concurrency,
+        timeout_keep_alive=timeout_keep_alive,
+        # Время обработки запросов Flask пишет сам (log_request_timing)
+        access_log=False,
+        log_level="info",
+    )
+    server = uvicorn.Server(config)
+
+    async with application:
+        # run_polling вызывает post_init сам, здесь - вручную (как и post_stop ниже)
+        if application.post_init:
+            await application.post_init(application)
+
+        await application.bot.set_webhook(
+            url=webhook_url,
+            secret_token=secret_token or None,
+            allowed_updates=allowed_updates,
+            drop_pending_updates=True,
+        )
+        logging.info(f"✅ Telegram webhook set to {webhook_url}")
+
+        await application.start()
+        try:
+            await server.serve()
+        finally:
+            await application.stop()
+
+        if application.post_stop:
+            await application.post_stop(application)
@@ -1,9 +1,7 @@
 import logging
 import uuid
-import requests
-import time
+from http_client import http_client
 from datetime import datetime, timedelta
-from threading import Thread
 from database import db
 from config import SUBSCRIPTION_DURATIONS, YOOKASSA_SHOP_ID, YOOKASSA_SECRET_KEY
 
@@ -77,12 +75,13 @@ class YooKassaPayment:
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(
+            # Idempotence-Key позволяет безопасно повторить создание платежа
+            response = http_client.post(
                 f"{self.base_url}/payments",
                 json=payload,
                 headers=headers,
                 auth=self.auth,
-                timeout=30
+                idempotent=True
             )
             
             if response.status_code == 200:
@@ -100,6 +99,12 @@ class YooKassaPayment:
                 conn.commit()
                 conn.close()
                 
+                db.save_payment_correlation(
+                    user_id, 'yookassa', amount=amount,
+                    provider_payment_id=actual_yookassa_id, internal_payment_id=payment_id,
+                    email=user_email, phone=user_phone
+                )
+                
                 logging.info(f"✅ Payment created for user {user_id}, YooKassa ID: {actual_yookassa_id}")
                 
                 return payment_data['confirmation']['confirmation_url'], payment_id
@@ -142,11 +147,10 @@ class YooKassaPayment:
                         "Content-Type": "application/json"
                     }
                     
-                    response = requests.get(
+                    response = http_client.get(
                         f"{self.base_url}/payments/{yookassa_payment_id}",
                         headers=headers,
-                        auth=self.auth,
-                        timeout=30
+                        auth=self.auth
                     )
                     
                     if response.status_code == 200:
@@ -301,40 +305,6 @@ class YooKassaPayment:
         except Exception as e:
             logging.error(f"❌ Error saving payment to DB: {e}")
     
-    def start_payment_monitoring(self, payment_id: str, max_checks: int = 60):
-        """Запускает мониторинг платежа в отдельном потоке"""
-        def monitor():
-            checks = 0
-            while checks < max_checks:
-                try:
-                    status = self.check_payment_status(payment_id)
-                    
-                    if status is True:
-                        # Платеж успешен
-                        if self.activate_subscription(payment_id):
-                            logging.info(f"✅ Payment confirmed and subscription activated: {payment_id}")
-                        break
-                    elif status is False:
-                        # Платеж не прошел
-                        logging.info(f"❌ Payment failed: {payment_id}")
-                        break
-                    # Если status is None - платеж еще в процессе
-                    
-                except Exception as e:
-                    logging.error(f"❌ Error in payment monitoring: {e}")
-                
-                time.sleep(30)  # Проверяем каждые 30 секунд
-                checks += 1
-            
-            # Если платеж не подтвердился, очищаем
-            if payment_id in self.pending_payments:
-                logging.warning(f"⚠️ Payment monitoring timeout: {payment_id}")
-                del self.pending_payments[payment_id]
-        
-        thread = Thread(target=monitor)
-        thread.daemon = True
-        thread.start()
-
     def save_payment_to_db_before_webhook(self, user_id: int, amount: float, subscription_type: str, yookassa_id: str, payment_id: str):
         """Сохраняет платеж в базу ДО получения вебхука"""
         try:
@@ -358,6 +328,11 @@ class YooKassaPayment:
             conn.close()
             logging.info(f"✅ Payment saved to database BEFORE webhook for user {user_id}")
             
+            db.save_payment_correlation(
+                user_id, 'yookassa', amount=amount,
+                provider_payment_id=yookassa_id, internal_payment_id=payment_id
+            )
+            
         except Exception as e:
             logging.error(f"❌ Error saving payment before webhook: {e}")
 
@@ -394,12 +369,13 @@ class YooKassaPayment:
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(
+            # Idempotence-Key позволяет безопасно повторить создание платежа
+            response = http_client.post(
                 f"{self.base_url}/payments",
                 json=payload,
                 headers=headers,
                 auth=self.auth,
-                timeout=30
+                idempotent=True
             )
             
             if response.status_code == 200: